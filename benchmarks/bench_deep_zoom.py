@@ -0,0 +1,34 @@
+"""Time perturbation renders at increasing zoom depth.
+
+Run from the repository root:
+
+    python benchmarks/bench_deep_zoom.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.equations import DeepZoomMandelbrot
+
+# The Misiurewicz point c = i has detail at every scale
+CENTER = ('0', '1')
+
+
+def main(width=400, height=400, max_iter=3000, spans=('1e-5', '1e-10', '1e-30', '1e-50')):
+    print(f"Deep zoom at {CENTER[0]} + {CENTER[1]}i, {width}x{height}, max_iter={max_iter}")
+    print(f"{'span':>6} {'time (s)':>9} {'refs':>5} {'skipped':>8} {'digits':>7}")
+    for span in spans:
+        fractal = DeepZoomMandelbrot(center=CENTER, span=span, width=width, height=height,
+                                     max_iter=max_iter)
+        start = time.perf_counter()
+        fractal.evaluate(None)
+        elapsed = time.perf_counter() - start
+        stats = fractal.stats
+        print(f"{span:>6} {elapsed:>9.3f} {stats['references']:>5} "
+              f"{stats['skipped_iterations']:>8} {stats['precision']:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Compare the matplotlib figure path with direct colormap/Pillow export.
+
+Run from the repository root:
+
+    python benchmarks/bench_imaging.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.equations import JuliaSet, MandelbrotSet, export_images
+
+
+def save_with_matplotlib(images, directory):
+    """The path the examples used: figure, imshow and savefig at 300 dpi."""
+    for name, values in images.items():
+        plt.figure(figsize=(10, 10))
+        plt.imshow(values, cmap='magma')
+        plt.axis('off')
+        plt.savefig(os.path.join(directory, f'{name}.png'), dpi=300,
+                    bbox_inches='tight', pad_inches=0)
+        plt.close()
+
+
+def main(size=1000, count=4):
+    images = {}
+    for k in range(count):
+        fractal = (MandelbrotSet if k % 2 == 0 else JuliaSet)(size, size, max_iter=100)
+        images[f'fractal_{k}'] = fractal.evaluate(None)
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        save_with_matplotlib(images, directory)
+        figure_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        export_images(images, directory, colormap='magma')
+        direct_time = time.perf_counter() - start
+
+    print(f"{count} images of {size}x{size}")
+    print(f"{'path':>12} {'total (s)':>10} {'per image (ms)':>15}")
+    for name, seconds in (('matplotlib', figure_time), ('direct', direct_time)):
+        print(f"{name:>12} {seconds:>10.3f} {1000 * seconds / count:>15.1f}")
+    print(f"speedup: {figure_time / direct_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Compare plain and interior-accelerated Mandelbrot renders.
+
+Run from the repository root:
+
+    python benchmarks/bench_interior.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.equations import MandelbrotSet
+
+
+def time_render(fractal, repeat=3):
+    """Return the best wall-clock time of a few renders and the last result."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fractal.evaluate(None)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(width=600, height=600, iterations=(100, 1000, 5000)):
+    print(f"Mandelbrot {width}x{height}, default view")
+    print(f"{'max_iter':>8} {'plain (s)':>10} {'interior (s)':>13} {'speedup':>8} {'mismatches':>11}")
+    for max_iter in iterations:
+        plain_time, plain = time_render(MandelbrotSet(width, height, max_iter=max_iter))
+        fast_time, fast = time_render(MandelbrotSet(width, height, max_iter=max_iter, interior=True))
+        mismatches = int(np.count_nonzero(plain != fast))
+        print(f"{max_iter:>8} {plain_time:>10.3f} {fast_time:>13.3f} "
+              f"{plain_time / fast_time:>7.1f}x {mismatches:>11}")
+
+
+if __name__ == "__main__":
+    main()
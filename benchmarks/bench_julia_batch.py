@@ -0,0 +1,45 @@
+"""Compare looping over JuliaSet with batched evaluation of many ``c`` values.
+
+Run from the repository root:
+
+    python benchmarks/bench_julia_batch.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.equations import JuliaSet
+
+
+def sweeps():
+    """A 20x20 atlas over the Mandelbrot plane and a circular animation path."""
+    re, im = np.meshgrid(np.linspace(-2, 0.5, 20), np.linspace(-1.2, 1.2, 20))
+    yield 'atlas', (re + 1j * im).ravel(), 32
+    yield 'atlas', (re + 1j * im).ravel(), 64
+    yield 'animation', 0.7885 * np.exp(1j * np.linspace(0, 2 * np.pi, 64)), 256
+
+
+def main(max_iter=100):
+    # Warm up both paths so that JIT compilation is not timed
+    JuliaSet(8, 8, max_iter=max_iter).evaluate(None)
+    JuliaSet(8, 8, max_iter=max_iter).evaluate_batch([0j, 1j])
+    print(f"{'sweep':>10} {'images':>7} {'size':>5} {'loop (s)':>9} {'batch (s)':>10} {'speedup':>8}")
+    for name, c_values, size in sweeps():
+        start = time.perf_counter()
+        loop = [JuliaSet(size, size, c=c, max_iter=max_iter).evaluate(None) for c in c_values]
+        loop_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch = JuliaSet(size, size, max_iter=max_iter).evaluate_batch(c_values)
+        batch_time = time.perf_counter() - start
+        assert np.array_equal(np.array(loop), batch)
+        print(f"{name:>10} {len(c_values):>7} {size:>5} {loop_time:>9.3f} {batch_time:>10.3f} "
+              f"{loop_time / batch_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Compare a 600-frame zoom rendered frame by frame and with sample reuse.
+
+Run from the repository root:
+
+    python benchmarks/bench_zoom.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.equations import ZoomSequenceRenderer, escape_region, fractal_spec, interpolate_viewports
+
+# Keyframes of the zoom in src/mandelbrot/mandelbrot_zoom.py
+ZOOM_PATH = [
+    {'x_min': -2.0, 'x_max': 1.0, 'y_min': -1.5, 'y_max': 1.5},
+    {'x_min': -0.8, 'x_max': -0.4, 'y_min': 0.1, 'y_max': 0.5},
+    {'x_min': -0.75, 'x_max': -0.73, 'y_min': 0.11, 'y_max': 0.13},
+    {'x_min': -0.745, 'x_max': -0.743, 'y_min': 0.112, 'y_max': 0.114},
+    {'x_min': -0.7445, 'x_max': -0.7443, 'y_min': 0.1125, 'y_max': 0.1127},
+]
+
+
+def main(width=320, height=320, max_iter=200, frames_per_segment=150):
+    viewports = interpolate_viewports(ZOOM_PATH, frames_per_segment)
+    print(f"{len(viewports)} frames of {width}x{height}, max_iter={max_iter}")
+
+    start = time.perf_counter()
+    for x_min, x_max, y_min, y_max in viewports:
+        escape_region(fractal_spec('mandelbrot', (x_min, x_max), (y_min, y_max),
+                                   width, height, max_iter))
+    full_time = time.perf_counter() - start
+    print(f"full recompute: {full_time:8.2f} s")
+
+    renderer = ZoomSequenceRenderer(width, height, max_iter)
+    start = time.perf_counter()
+    for _ in renderer.frames(ZOOM_PATH, frames_per_segment):
+        pass
+    reuse_time = time.perf_counter() - start
+    fraction = renderer.computed_pixels / renderer.total_pixels
+    print(f"with reuse:     {reuse_time:8.2f} s  ({full_time / reuse_time:.1f}x faster, "
+          f"{fraction:.1%} of pixels iterated)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""Benchmark suite with JSON results and regression checks against a baseline.
+
+Run from the repository root:
+
+    python benchmarks/run_suite.py                  # print timings
+    python benchmarks/run_suite.py --output results.json
+    python benchmarks/run_suite.py --save-baseline  # record benchmarks/baseline.json
+    python benchmarks/run_suite.py --compare        # exit status 1 on regressions
+
+A benchmark regresses when its best time exceeds the baseline's by more than
+``--threshold`` (default 1.5, i.e. 50% slower) in two runs. Baselines are
+machine specific; record one on the machine that runs the comparison.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import time
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.equations import (
+    BarnsleyFern,
+    ButterflyCurve,
+    CURVE_EXPRESSIONS,
+    Canvas,
+    Circle,
+    CurveFamily,
+    DeepZoomMandelbrot,
+    DragonCurve,
+    ExpressionCurve,
+    HeartCurve,
+    HilbertCurve,
+    JuliaSet,
+    KochSnowflake,
+    LissajousCurve,
+    MandelbrotSet,
+    RoseCurve,
+    SierpinskiTriangle,
+    Spiral,
+    TrefoilKnot,
+    affine_matrices,
+    available_backends,
+    save_image,
+)
+
+BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+
+def _uncached(equation):
+    """Evaluate without ``POINT_CACHE``, which would turn repeats into lookups."""
+    return lambda: equation.evaluate(equation.t)
+
+
+def parametric_cases(num_points=100_000):
+    """Point generation of every parametric equation class."""
+    for cls in (Circle, Spiral, RoseCurve, HeartCurve, LissajousCurve, ButterflyCurve,
+                TrefoilKnot):
+        yield f'parametric/{cls.__name__}', _uncached(cls(num_points=num_points))
+    for name, (x, y, params) in CURVE_EXPRESSIONS.items():
+        yield (f'expression/{name}',
+               _uncached(ExpressionCurve(x, y, num_points=num_points, **params)))
+    rose = RoseCurve(n=5, d=8, num_points=2000)
+    angles = np.linspace(0, 2*np.pi, 256, endpoint=False)
+    ring = affine_matrices(0.5, angles, np.stack([np.cos(angles), np.sin(angles)], axis=1))
+    out = np.empty((256, 2000, 2))
+    yield 'transform/RoseCurve/batch=256', lambda: rose.transform_batch(ring, out=out)
+    lissajous = CurveFamily.grid(LissajousCurve, a=np.arange(1, 11), b=np.arange(1, 11),
+                                 delta=np.linspace(0, np.pi, 10))
+    yield 'family/LissajousCurve/1000x1000', lissajous.evaluate
+    roses = CurveFamily.grid(RoseCurve, n=np.arange(1, 33), d=np.arange(1, 33))
+    yield 'family/RoseCurve/1024x1000', roses.evaluate
+    butterfly = ButterflyCurve(amplitude=2.0, t_range=(0, 12*np.pi))
+    yield ('adaptive/ButterflyCurve/0.25px',
+           lambda: butterfly.adaptive_points(tolerance=0.25, pixels=(1800, 1800)))
+    dense = ButterflyCurve(amplitude=2.0, t_range=(0, 12*np.pi), num_points=num_points)
+    x, y = dense.generate_points()
+    yield ('raster/ButterflyCurve/over/1200px',
+           lambda: Canvas.fit(x, y, 1200, 1200).stroke(x, y, width=4, values=dense.t))
+    yield ('raster/ButterflyCurve/add/1200px',
+           lambda: Canvas.fit(x, y, 1200, 1200).stroke(x, y, values=dense.t, mode='add'))
+    heart = HeartCurve(num_points=2000)
+    yield ('raster/HeartCurve/fill/1200px',
+           lambda: Canvas.fit(*heart.generate_points(), 1200, 1200).fill(*heart.generate_points()))
+
+
+def fractal_curve_cases():
+    """The subdivision and L-system curves at showcase and deep levels."""
+    for iterations in (4, 5, 8):
+        yield (f'curve/KochSnowflake/iter={iterations}',
+               _uncached(KochSnowflake(iterations=iterations, size=2.0)))
+    for iterations in (5, 6, 9):
+        yield (f'curve/SierpinskiTriangle/iter={iterations}',
+               _uncached(SierpinskiTriangle(iterations=iterations, size=2.0)))
+    yield 'curve/DragonCurve/iter=16', _uncached(DragonCurve(iterations=16))
+    yield 'curve/HilbertCurve/iter=8', _uncached(HilbertCurve(iterations=8))
+    yield 'memo/RoseCurve/generate_points', RoseCurve(num_points=100_000).generate_points
+    fern = BarnsleyFern(seed=0)
+    yield 'ifs/BarnsleyFern/density/2M', lambda: fern.density(400, 600, n_points=2 * 10**6)
+
+
+def escape_time_cases(sizes=(200, 400, 800), iterations=(100, 1000)):
+    """Mandelbrot and Julia kernels per backend, size and ``max_iter``."""
+    for backend in available_backends():
+        for cls in (MandelbrotSet, JuliaSet):
+            for size in sizes:
+                for max_iter in iterations:
+                    fractal = cls(width=size, height=size, max_iter=max_iter, backend=backend)
+                    yield (f'kernel/{cls.__name__}/{backend}/{size}px/iter={max_iter}',
+                           lambda fractal=fractal: fractal.evaluate(None))
+    for name, options in (('interior', {'interior': True}),
+                          ('subdivide', {'mode': 'subdivide'})):
+        fractal = MandelbrotSet(width=400, height=400, max_iter=1000, backend='numpy', **options)
+        yield f'mode/MandelbrotSet/{name}/400px/iter=1000', lambda fractal=fractal: fractal.evaluate(None)
+    deep = DeepZoomMandelbrot(center=('0', '1'), span='1e-20', width=100, height=100,
+                              max_iter=1000)
+    yield 'kernel/DeepZoomMandelbrot/100px/span=1e-20', lambda: deep.evaluate(None)
+
+
+def _showcase_parametric():
+    fig, axes = plt.subplots(2, 2, figsize=(12, 12))
+    curves = (RoseCurve(n=5, d=8), ButterflyCurve(amplitude=2.0, t_range=(0, 12*np.pi),
+                                                  num_points=2000),
+              HeartCurve(), TrefoilKnot(radius=2.0))
+    for ax, curve in zip(axes.flat, curves):
+        ax.plot(*curve.generate_points())
+        ax.axis('off')
+    fig.savefig(io.BytesIO(), format='png', dpi=100)
+    plt.close(fig)
+
+
+def _showcase_fractals():
+    for fractal, colormap in ((MandelbrotSet(width=400, height=400), 'hot'),
+                              (JuliaSet(width=400, height=400), 'viridis')):
+        save_image(fractal.evaluate(None), io.BytesIO(), colormap=colormap, format='png')
+
+
+def showcase_cases():
+    """The rendering paths of ``examples/showcase.py``."""
+    yield 'showcase/parametric_figure', _showcase_parametric
+    yield 'showcase/fractal_images', _showcase_fractals
+
+
+def all_cases():
+    yield from parametric_cases()
+    yield from fractal_curve_cases()
+    yield from escape_time_cases()
+    yield from showcase_cases()
+
+
+def time_case(func, min_time=0.5, min_repeat=5, max_repeat=200):
+    """Best and median wall-clock time of repeated calls after one warm-up.
+
+    Calls repeat for at least ``min_time`` seconds, since the best of many
+    runs is far less sensitive to load on the machine than a single one.
+    """
+    func()
+    times = []
+    while len(times) < max_repeat and (len(times) < min_repeat or sum(times) < min_time):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {'best': min(times), 'median': float(np.median(times)), 'repeat': len(times)}
+
+
+def run(pattern=None, names=None):
+    """Run the benchmarks whose name contains ``pattern`` (or is in ``names``)."""
+    results = {}
+    for name, func in all_cases():
+        if (pattern and pattern not in name) or (names is not None and name not in names):
+            continue
+        results[name] = time_case(func)
+        print(f"{name:<55} {1000 * results[name]['best']:>10.2f} ms", flush=True)
+    return {
+        'machine': {'python': platform.python_version(), 'numpy': np.__version__,
+                    'platform': platform.platform(), 'cpus': os.cpu_count()},
+        'results': results,
+    }
+
+
+def compare(current, baseline, threshold):
+    """Names of benchmarks whose best time grew by more than ``threshold``."""
+    regressions = []
+    for name, result in current['results'].items():
+        reference = baseline['results'].get(name)
+        if reference is None:
+            continue
+        ratio = result['best'] / reference['best']
+        flag = 'REGRESSION' if ratio > threshold else ''
+        print(f"{name:<55} {ratio:>6.2f}x {flag}")
+        if ratio > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--filter', help="only run benchmarks whose name contains this")
+    parser.add_argument('--output', help="write the results to this JSON file")
+    parser.add_argument('--baseline', default=BASELINE, help="baseline JSON file")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="store the results as the baseline")
+    parser.add_argument('--compare', action='store_true',
+                        help="compare with the baseline and fail on regressions")
+    parser.add_argument('--threshold', type=float, default=1.5,
+                        help="slowdown ratio counted as a regression (default: 1.5)")
+    args = parser.parse_args(argv)
+    if args.compare and not args.save_baseline and not os.path.exists(args.baseline):
+        parser.error(f"no baseline at {args.baseline}; run with --save-baseline first")
+
+    results = run(args.filter)
+    for path in filter(None, (args.output, args.baseline if args.save_baseline else None)):
+        with open(path, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            # Measure suspects again so a burst of load does not fail the run
+            print("Re-running regressed benchmarks")
+            regressions = compare(run(names=regressions), baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) regressed past {args.threshold}x")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,5 @@
 import os
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.colors import LinearSegmentedColormap
-from matplotlib import collections as mcoll
 from src.equations.parametric import (
     ButterflyCurve,
     RoseCurve,
@@ -11,38 +8,47 @@ from src.equations.parametric import (
     HeartCurve,
     TrefoilKnot
 )
+from src.equations.adaptive import adaptive_sample
 from src.equations.fractals import (
     MandelbrotSet,
     JuliaSet
 )
+from src.equations.imaging import save_image
+from src.equations.raster import Canvas
+from src.equations.tiles import TileCache
 
 # Create images directory if it doesn't exist
 os.makedirs('images', exist_ok=True)
 
-def save_figure(name):
-    """Helper function to save figures in the images directory."""
-    plt.savefig(os.path.join('images', name), dpi=300, bbox_inches='tight', pad_inches=0)
-    plt.close()
+# Reuse fractal tiles rendered by earlier runs
+TILE_CACHE = TileCache(directory=os.path.join('images', '.tiles'))
+
+# Curves are drawn straight into pixel buffers about the size of the former
+# 10 inch figures at 300 dpi once cropped; line widths are given in points
+SIZE = 2400
+DPI = 300
+
+def new_canvas(x, y):
+    """Canvas showing the curve ``(x, y)`` at equal aspect ratio on white."""
+    return Canvas.fit(x, y, SIZE, SIZE, margin=0.02, background='#ffffff')
+
+def points(width):
+    """Line width in points as pixels of the canvas."""
+    return width * DPI / 72
+
+def save_canvas(canvas, name):
+    """Helper function to save canvases in the images directory."""
+    canvas.save(os.path.join('images', name))
 
 def create_butterfly():
     """Create a beautiful butterfly curve with gradient colors."""
     curve = ButterflyCurve(amplitude=2.0)
-    t = np.linspace(0, 12 * np.pi, 10000)
-    x, y = curve.evaluate(t)
-    
-    plt.figure(figsize=(10, 10))
-    points = np.array([x, y]).T.reshape(-1, 1, 2)
-    segments = np.concatenate([points[:-1], points[1:]], axis=1)
+    # Dense only in the tight lobes: a quarter pixel of the canvas
+    t, x, y = adaptive_sample(curve.evaluate, (0, 12 * np.pi), 0.25, pixels=(SIZE, SIZE))
     
-    norm = plt.Normalize(t.min(), t.max())
-    lc = mcoll.LineCollection(segments, cmap='viridis', norm=norm)
-    lc.set_array(t)
-    lc.set_linewidth(2)
-    
-    plt.gca().add_collection(lc)
-    plt.axis('equal')
-    plt.axis('off')
-    save_figure('butterfly.png')
+    canvas = new_canvas(x, y)
+    canvas.stroke(x, y, width=points(2), values=t, colormap='viridis')
+    save_canvas(canvas, 'butterfly.png')
 
 def create_rose():
     """Create a rose curve with pastel colors."""
@@ -50,12 +56,10 @@ def create_rose():
     t = np.linspace(0, 8 * np.pi, 1000)
     x, y = curve.evaluate(t)
     
-    plt.figure(figsize=(10, 10))
-    plt.plot(x, y, c='#FF6B6B', linewidth=3)
-    plt.fill(x, y, alpha=0.3, color='#FFE3E3')
-    plt.axis('equal')
-    plt.axis('off')
-    save_figure('rose.png')
+    canvas = new_canvas(x, y)
+    canvas.fill(x, y, color='#FFE3E3', opacity=0.3)
+    canvas.stroke(x, y, width=points(3), color='#FF6B6B')
+    save_canvas(canvas, 'rose.png')
 
 def create_lissajous():
     """Create a complex Lissajous figure with gradient colors."""
@@ -63,19 +67,9 @@ def create_lissajous():
     t = np.linspace(0, 2 * np.pi, 1000)
     x, y = curve.evaluate(t)
     
-    plt.figure(figsize=(10, 10))
-    points = np.array([x, y]).T.reshape(-1, 1, 2)
-    segments = np.concatenate([points[:-1], points[1:]], axis=1)
-    
-    norm = plt.Normalize(t.min(), t.max())
-    lc = mcoll.LineCollection(segments, cmap='plasma', norm=norm)
-    lc.set_array(t)
-    lc.set_linewidth(2)
-    
-    plt.gca().add_collection(lc)
-    plt.axis('equal')
-    plt.axis('off')
-    save_figure('lissajous.png')
+    canvas = new_canvas(x, y)
+    canvas.stroke(x, y, width=points(2), values=t, colormap='plasma')
+    save_canvas(canvas, 'lissajous.png')
 
 def create_spiral():
     """Create a golden spiral with warm colors."""
@@ -83,11 +77,9 @@ def create_spiral():
     t = np.linspace(0, 8 * np.pi, 1000)
     x, y = curve.evaluate(t)
     
-    plt.figure(figsize=(10, 10))
-    plt.plot(x, y, c='#FFA07A', linewidth=3)
-    plt.axis('equal')
-    plt.axis('off')
-    save_figure('spiral.png')
+    canvas = new_canvas(x, y)
+    canvas.stroke(x, y, width=points(3), color='#FFA07A')
+    save_canvas(canvas, 'spiral.png')
 
 def create_heart():
     """Create a heart curve with romantic colors."""
@@ -95,12 +87,10 @@ def create_heart():
     t = np.linspace(0, 2 * np.pi, 1000)
     x, y = curve.evaluate(t)
     
-    plt.figure(figsize=(10, 10))
-    plt.plot(x, y, c='#FF1493', linewidth=3)
-    plt.fill(x, y, alpha=0.3, color='#FFB6C1')
-    plt.axis('equal')
-    plt.axis('off')
-    save_figure('heart.png')
+    canvas = new_canvas(x, y)
+    canvas.fill(x, y, color='#FFB6C1', opacity=0.3)
+    canvas.stroke(x, y, width=points(3), color='#FF1493')
+    save_canvas(canvas, 'heart.png')
 
 def create_trefoil():
     """Create a trefoil knot with cool colors."""
@@ -108,44 +98,26 @@ def create_trefoil():
     t = np.linspace(0, 2 * np.pi, 1000)
     x, y = curve.evaluate(t)
     
-    plt.figure(figsize=(10, 10))
-    points = np.array([x, y]).T.reshape(-1, 1, 2)
-    segments = np.concatenate([points[:-1], points[1:]], axis=1)
-    
-    # Create a custom colormap from royal blue to light blue
-    colors = ['#4169E1', '#87CEEB']
-    n_bins = 100
-    cmap = LinearSegmentedColormap.from_list('custom_blues', colors, N=n_bins)
-    
-    norm = plt.Normalize(t.min(), t.max())
-    lc = mcoll.LineCollection(segments, cmap=cmap, norm=norm)
-    lc.set_array(t)
-    lc.set_linewidth(3)
-    
-    plt.gca().add_collection(lc)
-    plt.axis('equal')
-    plt.axis('off')
-    save_figure('trefoil.png')
+    # Gradient from royal blue to light blue
+    canvas = new_canvas(x, y)
+    canvas.stroke(x, y, width=points(3), values=t, colormap=['#4169E1', '#87CEEB'])
+    save_canvas(canvas, 'trefoil.png')
 
 def create_mandelbrot():
     """Create a beautiful Mandelbrot set with custom color scheme."""
-    fractal = MandelbrotSet(width=1000, height=1000, max_iter=100)
+    fractal = MandelbrotSet(width=1000, height=1000, max_iter=100, tile_cache=TILE_CACHE)
     result = fractal.evaluate(None)  # t parameter not used for fractals
     
-    plt.figure(figsize=(10, 10))
-    plt.imshow(result, cmap='magma', extent=[-2, 1, -1.5, 1.5])
-    plt.axis('off')
-    save_figure('mandelbrot.png')
+    # Written pixel for pixel, without a matplotlib figure
+    save_image(result, os.path.join('images', 'mandelbrot.png'), colormap='magma')
 
 def create_julia():
     """Create a Julia set with cool colors."""
-    fractal = JuliaSet(width=1000, height=1000, c=complex(-0.7, 0.27), max_iter=100)
+    fractal = JuliaSet(width=1000, height=1000, c=complex(-0.7, 0.27), max_iter=100,
+                       tile_cache=TILE_CACHE)
     result = fractal.evaluate(None)  # t parameter not used for fractals
     
-    plt.figure(figsize=(10, 10))
-    plt.imshow(result, cmap='viridis', extent=[-2, 2, -2, 2])
-    plt.axis('off')
-    save_figure('julia.png')
+    save_image(result, os.path.join('images', 'julia.png'), colormap='viridis')
 
 if __name__ == "__main__":
     # Create all the beautiful math art
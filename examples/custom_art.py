@@ -1,20 +1,16 @@
-import numpy as np
 import matplotlib.pyplot as plt
 from src.math_art import generate_parametric_art
 from src.mandelbrot import generate_mandelbrot
+from src.equations import ExpressionCurve
 
 def create_custom_art():
     # Example 1: Parametric Art
-    def custom_parametric(t):
-        # Custom parametric equations
-        x = np.sin(3*t) * np.cos(2*t)
-        y = np.sin(4*t) * np.cos(3*t)
-        return x, y
+    # Custom parametric equations, compiled once into a NumPy plan
+    custom_parametric = ExpressionCurve('sin(3*t) * cos(2*t)', 'sin(4*t) * cos(3*t)')
     
     # Generate parametric art
     fig, ax = plt.subplots(figsize=(10, 10))
-    t = np.linspace(0, 2*np.pi, 1000)
-    x, y = custom_parametric(t)
+    x, y = custom_parametric.generate_points()
     ax.plot(x, y, 'b-', linewidth=2)
     ax.set_title('Custom Parametric Art')
     ax.axis('equal')
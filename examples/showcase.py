@@ -11,9 +11,15 @@ from src.equations import (
     KochSnowflake,
     SierpinskiTriangle,
     MandelbrotSet,
-    JuliaSet
+    JuliaSet,
+    BarnsleyFern,
+    TileCache,
+    export_images
 )
 
+# Fractal tiles are shared between the showcases and kept across runs
+TILE_CACHE = TileCache(directory='.tile_cache')
+
 def create_parametric_showcase():
     """Create a showcase of parametric equations."""
     fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(12, 12))
@@ -28,8 +34,8 @@ def create_parametric_showcase():
     ax1.axis('off')
     
     # Butterfly Curve
-    butterfly = ButterflyCurve(amplitude=2.0, t_range=(0, 12*np.pi), num_points=2000)
-    x, y = butterfly.generate_points()
+    butterfly = ButterflyCurve(amplitude=2.0, t_range=(0, 12*np.pi))
+    x, y = butterfly.adaptive_points(tolerance=0.25, pixels=(1800, 1800))
     ax2.plot(x, y, color='blue')
     ax2.set_title('Butterfly Curve')
     ax2.axis('equal')
@@ -61,14 +67,15 @@ def create_fractal_showcase():
     fig.suptitle('Fractal Equations Showcase', fontsize=16)
     
     # Mandelbrot Set
-    mandelbrot = MandelbrotSet(width=400, height=400, max_iter=100)
+    mandelbrot = MandelbrotSet(width=400, height=400, max_iter=100, tile_cache=TILE_CACHE)
     fractal = mandelbrot.evaluate(None)
     ax1.imshow(fractal, cmap='hot')
     ax1.set_title('Mandelbrot Set')
     ax1.axis('off')
     
     # Julia Set
-    julia = JuliaSet(width=400, height=400, c=-0.7 + 0.27j, max_iter=100)
+    julia = JuliaSet(width=400, height=400, c=-0.7 + 0.27j, max_iter=100,
+                     tile_cache=TILE_CACHE)
     fractal = julia.evaluate(None)
     ax2.imshow(fractal, cmap='viridis')
     ax2.set_title('Julia Set')
@@ -108,22 +115,23 @@ def create_combined_showcase():
     ax1.axis('off')
     
     # Butterfly Curve
-    butterfly = ButterflyCurve(amplitude=2.0, t_range=(0, 12*np.pi), num_points=2000)
-    x, y = butterfly.generate_points()
+    butterfly = ButterflyCurve(amplitude=2.0, t_range=(0, 12*np.pi))
+    x, y = butterfly.adaptive_points(tolerance=0.25, pixels=(1800, 1800))
     ax2.plot(x, y, color='blue')
     ax2.set_title('Butterfly Curve')
     ax2.axis('equal')
     ax2.axis('off')
     
     # Mandelbrot Set
-    mandelbrot = MandelbrotSet(width=400, height=400, max_iter=100)
+    mandelbrot = MandelbrotSet(width=400, height=400, max_iter=100, tile_cache=TILE_CACHE)
     fractal = mandelbrot.evaluate(None)
     ax3.imshow(fractal, cmap='hot')
     ax3.set_title('Mandelbrot Set')
     ax3.axis('off')
     
     # Julia Set
-    julia = JuliaSet(width=400, height=400, c=-0.7 + 0.27j, max_iter=100)
+    julia = JuliaSet(width=400, height=400, c=-0.7 + 0.27j, max_iter=100,
+                     tile_cache=TILE_CACHE)
     fractal = julia.evaluate(None)
     ax4.imshow(fractal, cmap='viridis')
     ax4.set_title('Julia Set')
@@ -149,6 +157,16 @@ def create_combined_showcase():
     plt.savefig('showcase_combined.png', dpi=300, bbox_inches='tight')
     plt.close()
 
+def create_fractal_images():
+    """Export the showcase fractals as images at their native resolution."""
+    mandelbrot = MandelbrotSet(width=1000, height=1000, max_iter=100, tile_cache=TILE_CACHE)
+    julia = JuliaSet(width=1000, height=1000, c=-0.7 + 0.27j, max_iter=100,
+                     tile_cache=TILE_CACHE)
+    export_images({'showcase_mandelbrot': mandelbrot.evaluate(None)}, colormap='hot')
+    export_images({'showcase_julia': julia.evaluate(None)}, colormap='viridis')
+    fern = BarnsleyFern(seed=0).density(width=600, height=1000, n_points=10**7)
+    export_images({'showcase_fern': fern.image()}, colormap='viridis')
+
 if __name__ == '__main__':
     print("Generating showcase images...")
     create_parametric_showcase()
@@ -157,4 +175,6 @@ if __name__ == '__main__':
     print("Generated fractal showcase")
     create_combined_showcase()
     print("Generated combined showcase")
+    create_fractal_images()
+    print("Generated fractal images")
     print("All showcase images have been generated!") 
\ No newline at end of file
@@ -9,6 +9,9 @@ setup(
         "matplotlib>=3.4.0",
         "pillow>=8.0.0",
     ],
+    extras_require={
+        "jit": ["numba>=0.57"],
+    },
     description="A Python library for creating beautiful mathematical art through parametric equations and fractals",
     long_description=open("README.md").read(),
     long_description_content_type="text/markdown",
@@ -9,11 +9,65 @@ from .parametric import (
     TrefoilKnot
 )
 from .fractals import (
+    EscapeTimeFractal,
     MandelbrotSet,
     JuliaSet,
     KochSnowflake,
     SierpinskiTriangle
 )
+from .adaptive import adaptive_sample
+from .bands import (
+    band_height,
+    divtime_dtype,
+    escape_bands,
+    estimate_peak_memory,
+    render_bands
+)
+from .backends import available_backends, get_backend, register_backend
+from .batch import julia_batch, julia_batches
+from .escape_time import (
+    EscapeTimeState,
+    complex_grid,
+    escape_points,
+    escape_region,
+    escape_state,
+    escape_time,
+    fractal_spec,
+    mandelbrot_interior
+)
+from .expression import CURVE_EXPRESSIONS, ExpressionCurve, ExpressionPlan, compile_expressions
+from .families import CurveFamily
+from .ifs import (
+    BarnsleyFern,
+    DensityHistogram,
+    IteratedFunctionSystem,
+    SierpinskiIFS,
+    chaos_game,
+    density_histogram,
+    ifs_bounds
+)
+from .imaging import PALETTES, colorize, colormap_lut, export_images, save_image
+from .instrumentation import Recorder, active_recorder, instrument, phase
+from .lsystem import (
+    DragonCurve,
+    GosperCurve,
+    HilbertCurve,
+    LSystem,
+    expand_lsystem,
+    koch_subdivide,
+    sierpinski_mesh,
+    turtle_path
+)
+from .memo import POINT_CACHE, PointCache
+from .outofcore import build_pyramid, render_to_file
+from .parallel import render_parallel, render_spec, render_viewport
+from .progressive import progressive_region
+from .raster import Canvas
+from .perturbation import DeepZoomMandelbrot, perturbation_escape_time, reference_orbit
+from .subdivision import subdivide_region
+from .tiles import TileCache, snap_viewport, tile_key, tile_lattice
+from .transforms import affine_matrices, apply_transforms
+from .zoom import ZoomSequenceRenderer, interpolate_viewports
 
 __all__ = [
     'MathEquation',
@@ -24,8 +78,78 @@ __all__ = [
     'LissajousCurve',
     'ButterflyCurve',
     'TrefoilKnot',
+    'EscapeTimeFractal',
     'MandelbrotSet',
     'JuliaSet',
     'KochSnowflake',
-    'SierpinskiTriangle'
+    'SierpinskiTriangle',
+    'adaptive_sample',
+    'band_height',
+    'divtime_dtype',
+    'escape_bands',
+    'estimate_peak_memory',
+    'render_bands',
+    'julia_batch',
+    'julia_batches',
+    'available_backends',
+    'get_backend',
+    'register_backend',
+    'EscapeTimeState',
+    'complex_grid',
+    'escape_points',
+    'escape_region',
+    'escape_state',
+    'escape_time',
+    'fractal_spec',
+    'mandelbrot_interior',
+    'CURVE_EXPRESSIONS',
+    'ExpressionCurve',
+    'ExpressionPlan',
+    'compile_expressions',
+    'CurveFamily',
+    'BarnsleyFern',
+    'DensityHistogram',
+    'IteratedFunctionSystem',
+    'SierpinskiIFS',
+    'chaos_game',
+    'density_histogram',
+    'ifs_bounds',
+    'PALETTES',
+    'colorize',
+    'colormap_lut',
+    'export_images',
+    'save_image',
+    'Recorder',
+    'active_recorder',
+    'instrument',
+    'phase',
+    'DragonCurve',
+    'GosperCurve',
+    'HilbertCurve',
+    'LSystem',
+    'expand_lsystem',
+    'koch_subdivide',
+    'sierpinski_mesh',
+    'turtle_path',
+    'POINT_CACHE',
+    'PointCache',
+    'build_pyramid',
+    'render_to_file',
+    'render_parallel',
+    'render_spec',
+    'render_viewport',
+    'progressive_region',
+    'Canvas',
+    'DeepZoomMandelbrot',
+    'perturbation_escape_time',
+    'reference_orbit',
+    'subdivide_region',
+    'TileCache',
+    'snap_viewport',
+    'tile_key',
+    'tile_lattice',
+    'affine_matrices',
+    'apply_transforms',
+    'ZoomSequenceRenderer',
+    'interpolate_viewports'
 ] 
\ No newline at end of file
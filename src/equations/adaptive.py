@@ -0,0 +1,120 @@
+import numpy as np
+
+
+def _chord_distance(px, py, ax, ay, bx, by):
+    """Distance of points ``p`` from the segments ``a -> b``."""
+    vx, vy = bx - ax, by - ay
+    wx, wy = px - ax, py - ay
+    length2 = vx*vx + vy*vy
+    with np.errstate(invalid='ignore', divide='ignore'):
+        s = np.where(length2 > 0, (wx*vx + wy*vy) / length2, 0.0)
+    s = np.clip(s, 0, 1)
+    return np.hypot(wx - s*vx, wy - s*vy)
+
+
+def _evaluate(evaluate, t):
+    x, y = evaluate(t)
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    if x.shape != t.shape or y.shape != t.shape:
+        raise ValueError("Adaptive sampling needs one point per value of t")
+    return x, y
+
+
+def _ramp(counts):
+    """``0, 1, ..., n - 1`` for every ``n`` in ``counts``, concatenated."""
+    return np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+
+
+def _refine(evaluate, t, x, y, tolerance, max_points, max_pieces):
+    """Split intervals until every midpoint is within ``tolerance`` of its chord.
+
+    Returns ``(t, x, y)`` and the chordal error of every final interval.
+    """
+    errors = np.zeros(t.size - 1)
+    # Left ends of the intervals that still have to be tested
+    pending = np.arange(t.size - 1)
+    while pending.size:
+        ta, tb = t[pending], t[pending + 1]
+        xm, ym = _evaluate(evaluate, (ta + tb) / 2)
+        error = _chord_distance(xm, ym, x[pending], y[pending], x[pending + 1], y[pending + 1])
+        errors[pending] = error
+        # The chordal error of a smooth arc shrinks with the square of its
+        # length, so an interval is cut into about sqrt(error / tolerance)
+        # pieces; the cap keeps kinks, where that model fails, from
+        # being oversampled
+        with np.errstate(invalid='ignore'):
+            pieces = np.ceil(np.sqrt(error / tolerance)).astype(np.intp)
+        pieces = np.where(error > tolerance, np.clip(pieces, 2, max_pieces), 1)
+        pieces[np.cumsum(pieces - 1) > max_points - t.size] = 1
+        split = pieces > 1
+        if not split.any():
+            break
+        left, pieces = pending[split], pieces[split]
+        fraction = (_ramp(pieces - 1) + 1) / np.repeat(pieces, pieces - 1)
+        tn = np.repeat(ta[split], pieces - 1) + np.repeat(tb[split] - ta[split], pieces - 1) * fraction
+        xn, yn = _evaluate(evaluate, tn)
+        where = np.repeat(left + 1, pieces - 1)
+        t, x, y = np.insert(t, where, tn), np.insert(x, where, xn), np.insert(y, where, yn)
+        errors = np.insert(errors, where, 0.0)
+        # After insertion the old left end k has moved by the number of
+        # points inserted before it; all pieces of a split interval are
+        # tested again
+        shifted = left + np.cumsum(pieces - 1) - (pieces - 1)
+        pending = np.repeat(shifted, pieces) + _ramp(pieces)
+    return t, x, y, errors
+
+
+def adaptive_sample(evaluate, t_range, tolerance, pixels=None, initial=128, max_points=2**20,
+                    max_pieces=8):
+    """Sample a curve densely where it bends and sparsely where it is straight.
+
+    Sampling runs in three stages of vectorized passes, each evaluating all
+    new points of a pass with one call:
+
+    1. A pilot refines ``initial`` uniform intervals to a quarter of the
+       tolerance. Every pass evaluates the midpoints of the intervals
+       still under test and cuts those off their chord by more than the
+       tolerance into up to ``max_pieces`` pieces, as many as their error
+       suggests.
+    2. The pilot's chordal errors give the local density that spreads the
+       error evenly (it grows with the square root of the error), and
+       ``t`` is resampled at that density for the full tolerance.
+    3. The resampled intervals are refined like the pilot, so every final
+       midpoint is within ``tolerance`` of its chord.
+
+    The test only looks at midpoints, so features narrower than the
+    initial spacing can be missed; raise ``initial`` for such curves.
+
+    Parameters
+    ----------
+    evaluate : callable
+        Maps an array of ``t`` to ``(x, y)`` arrays of the same length.
+    t_range : tuple
+        ``(start, stop)`` of the parameter.
+    tolerance : float
+        Largest accepted chordal error, in output units.
+    pixels : tuple, optional
+        ``(width, height)`` of an image showing the whole curve at equal
+        aspect ratio; ``tolerance`` is then given in its pixels.
+    max_points : int
+        Refinement stops at this many samples (default: 2**20)
+
+    Returns
+    -------
+    tuple
+        ``(t, x, y)`` arrays, sorted by ``t``.
+    """
+    if tolerance <= 0:
+        raise ValueError("tolerance must be positive")
+    t = np.linspace(t_range[0], t_range[1], initial + 1)
+    x, y = _evaluate(evaluate, t)
+    if pixels is not None:
+        tolerance *= max(np.ptp(x) / pixels[0], np.ptp(y) / pixels[1]) or 1.0
+    t, x, y, errors = _refine(evaluate, t, x, y, tolerance / 4, max_points, max_pieces)
+
+    density = np.concatenate([[0], np.cumsum(np.sqrt(errors / tolerance))])
+    count = min(max(int(np.ceil(density[-1])), 1), max_points - 1)
+    t = np.interp(np.linspace(0, density[-1], count + 1), density, t)
+    t[0], t[-1] = t_range
+    x, y = _evaluate(evaluate, t)
+    return _refine(evaluate, t, x, y, tolerance, max_points, max_pieces)[:3]
@@ -0,0 +1,103 @@
+import warnings
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # Numba is optional
+    numba = None
+
+_BACKENDS = {}
+
+
+def register_backend(name, kernel, priority=0, available=True):
+    """Register an escape-time kernel under ``name``.
+
+    ``kernel`` must accept ``(z, c, max_iter, interior=None,
+    periodicity_tol=None)`` and return the same array as
+    ``escape_time.escape_time``. When no backend is requested, the available
+    one with the highest ``priority`` is used. Backends registered with
+    ``available=False`` are known but cannot run here (a missing optional
+    dependency); requesting them falls back to the default with a warning.
+    """
+    _BACKENDS[name] = {'kernel': kernel, 'priority': priority, 'available': available}
+
+
+def available_backends():
+    """Names of the backends that can run here, preferred first."""
+    names = [name for name, entry in _BACKENDS.items() if entry['available']]
+    return sorted(names, key=lambda name: -_BACKENDS[name]['priority'])
+
+
+def get_backend(name=None):
+    """Return the kernel registered as ``name``, or the preferred one."""
+    if name is not None:
+        if name not in _BACKENDS:
+            raise ValueError(f"Unknown backend {name!r}; choose from {sorted(_BACKENDS)}")
+        if _BACKENDS[name]['available']:
+            return _BACKENDS[name]['kernel']
+        warnings.warn(f"Backend {name!r} is not available, using {available_backends()[0]!r}",
+                      RuntimeWarning, stacklevel=2)
+    return _BACKENDS[available_backends()[0]]['kernel']
+
+
+def _escape_pixels(z, c, skip, max_iter, tol2, out):
+    """Per-pixel loop compiled by Numba (``tol2 < 0`` disables cycle checks)."""
+    for k in numba.prange(z.shape[0]):
+        out[k] = max_iter
+        if skip[k]:
+            continue
+        zk = z[k]
+        ck = c[k]
+        saved = zk
+        next_save = 1
+        for i in range(max_iter):
+            zk = zk * zk + ck
+            if zk.real * zk.real + zk.imag * zk.imag > 4.0:
+                out[k] = i
+                break
+            if tol2 >= 0.0:
+                d = zk - saved
+                if d.real * d.real + d.imag * d.imag < tol2:
+                    break
+                if i + 1 == next_save:
+                    saved = zk
+                    next_save *= 2
+
+
+_numba_kernel = None
+
+
+def numba_escape_time(z, c, max_iter, interior=None, periodicity_tol=None):
+    """Per-pixel escape-time kernel compiled with Numba.
+
+    Every pixel runs its own loop and stops as soon as it escapes (or is
+    found periodic), and the pixels are spread over threads with
+    ``prange``. Every product is rounded on its own, whereas NumPy's
+    complex square uses fused multiply-adds on CPUs that have them, so a
+    few boundary pixels can differ from the NumPy reference. The kernel is
+    therefore only used when requested with ``backend='numba'``.
+    """
+    global _numba_kernel
+    if _numba_kernel is None:
+        _numba_kernel = numba.njit(parallel=True, cache=True)(_escape_pixels)
+
+    z = np.asarray(z)
+    if z.dtype != np.complex64:
+        z = z.astype(complex, copy=False)
+    shape = z.shape
+    z = np.ascontiguousarray(z).reshape(-1)
+    c = np.ascontiguousarray(np.broadcast_to(np.asarray(c, dtype=z.dtype), shape)).reshape(-1)
+    if interior is None:
+        skip = np.zeros(z.size, dtype=bool)
+    else:
+        skip = np.ascontiguousarray(np.broadcast_to(interior, shape)).reshape(-1)
+    tol2 = -1.0 if periodicity_tol is None else float(periodicity_tol)**2
+
+    out = np.empty(z.size, dtype=int)
+    _numba_kernel(z, c, skip, max_iter, tol2, out)
+    return out.reshape(shape)
+
+
+# Opt-in: not bit-identical to the reference kernel (see numba_escape_time)
+register_backend('numba', numba_escape_time, priority=-10, available=numba is not None)
@@ -0,0 +1,77 @@
+import numpy as np
+
+from .backends import get_backend
+from .escape_time import escape_region, escape_time
+
+
+def divtime_dtype(max_iter):
+    """Smallest unsigned dtype that holds escape times up to ``max_iter``."""
+    if max_iter <= np.iinfo(np.uint16).max:
+        return np.dtype(np.uint16)
+    if max_iter <= np.iinfo(np.uint32).max:
+        return np.dtype(np.uint32)
+    return np.dtype(np.uint64)
+
+
+def estimate_peak_memory(spec, rows=None):
+    """Estimated peak bytes for rendering ``rows`` rows of a ``fractal_spec``.
+
+    Counts the compact output band plus the kernel's working arrays: about
+    eight complex values and 24 bytes of integers and masks per pixel for
+    the NumPy kernel (grid, orbit, compacted copies and temporaries), and
+    two complex values for the compiled per-pixel kernels. ``rows`` defaults to the
+    whole frame.
+    """
+    rows = spec['height'] if rows is None else rows
+    complex_bytes = np.dtype(spec['dtype']).itemsize
+    copies = 8 if get_backend(spec['backend']) is escape_time else 2
+    per_pixel = copies * complex_bytes + 24 + divtime_dtype(spec['max_iter']).itemsize
+    return rows * spec['width'] * per_pixel
+
+
+def band_height(spec, memory_budget):
+    """Largest number of rows whose render stays within ``memory_budget`` bytes.
+
+    Returns at least one row, even when a single row exceeds the budget.
+    """
+    per_row = estimate_peak_memory(spec, rows=1)
+    return int(min(spec['height'], max(1, memory_budget // per_row)))
+
+
+def escape_bands(spec, rows_per_band=None, memory_budget=None):
+    """Render a ``fractal_spec`` as a sequence of horizontal row bands.
+
+    Bands hold ``rows_per_band`` rows, or as many as ``memory_budget`` bytes
+    allow (see ``band_height``); without either the frame is one band. Only
+    one band is in memory at a time.
+
+    Yields
+    ------
+    tuple
+        ``(first_row, divtime)`` with escape times in ``divtime_dtype``.
+    """
+    if rows_per_band is None:
+        rows_per_band = (spec['height'] if memory_budget is None
+                         else band_height(spec, memory_budget))
+    dtype = divtime_dtype(spec['max_iter'])
+    for start in range(0, spec['height'], rows_per_band):
+        rows = slice(start, min(start + rows_per_band, spec['height']))
+        yield start, escape_region(spec, rows=rows).astype(dtype)
+
+
+def render_bands(spec, rows_per_band=None, memory_budget=None, out=None):
+    """Assemble ``escape_bands`` into ``out`` (default: a new compact array).
+
+    ``out`` can be any writable ``(height, width)`` array, for example a
+    ``numpy.memmap``; it is returned. When the output is allocated here, it
+    counts against ``memory_budget``.
+    """
+    if out is None:
+        out = np.empty((spec['height'], spec['width']), dtype=divtime_dtype(spec['max_iter']))
+        if memory_budget is not None:
+            memory_budget -= out.nbytes
+            if memory_budget <= 0:
+                raise ValueError("memory_budget does not even hold the output")
+    for start, band in escape_bands(spec, rows_per_band, memory_budget):
+        out[start:start + band.shape[0]] = band
+    return out
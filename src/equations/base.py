@@ -1,13 +1,53 @@
 import numpy as np
 from abc import ABC, abstractmethod
+from .adaptive import adaptive_sample
+from .instrumentation import phase
+from .memo import POINT_CACHE, freeze
+from .transforms import affine_matrices, apply_transforms
 
 class MathEquation(ABC):
-    """Base class for all mathematical equations."""
+    """Base class for all mathematical equations.
+    
+    ``t`` is built on first use, and ``generate_points`` results are kept
+    in the process-wide ``POINT_CACHE``, keyed on the class and its public
+    attributes. Assigning an attribute invalidates the key; arrays changed
+    in place are not noticed, so assign a new value instead. Cached arrays
+    are read-only.
+    """
+    
+    # Whether generate_points results may be shared through POINT_CACHE
+    cache_points = True
     
     def __init__(self, t_range=(0, 2*np.pi), num_points=1000):
         self.t_range = t_range
         self.num_points = num_points
-        self.t = np.linspace(t_range[0], t_range[1], num_points)
+    
+    def __setattr__(self, name, value):
+        if not name.startswith('_'):
+            self.__dict__.pop('_t', None)
+            self.__dict__.pop('_points_key', None)
+        super().__setattr__(name, value)
+    
+    @property
+    def t(self):
+        """Parameter samples, ``num_points`` values across ``t_range`` (read-only)."""
+        t = self.__dict__.get('_t')
+        if t is None:
+            t = np.linspace(self.t_range[0], self.t_range[1], self.num_points)
+            t.setflags(write=False)
+            self._t = t
+        return t
+    
+    def _cache_key(self):
+        """Key of the current parameters, or None if one cannot be keyed."""
+        if '_points_key' not in self.__dict__:
+            params = {name: value for name, value in vars(self).items()
+                      if not name.startswith('_')}
+            try:
+                self._points_key = (type(self), freeze(params))
+            except TypeError:
+                self._points_key = None
+        return self._points_key
     
     @abstractmethod
     def evaluate(self, t):
@@ -15,25 +55,56 @@ class MathEquation(ABC):
         pass
     
     def generate_points(self):
-        """Generate points for the entire parameter range."""
-        return self.evaluate(self.t)
+        """Generate points for the entire parameter range.
     
-    def transform(self, scale=1.0, rotation=0.0, translation=(0, 0)):
-        """Apply transformations to the equation."""
-        x, y = self.generate_points()
+        Results are memoized (see the class docstring) and returned
+        read-only; ``transform`` returns new arrays that can be modified.
+        """
+        key = self._cache_key() if self.cache_points else None
+        if key is not None:
+            points = POINT_CACHE.get(key)
+            if points is not None:
+                return points
+        with phase('evaluate', equation=type(self).__name__):
+            points = self.evaluate(self.t)
+        if key is not None:
+            points = POINT_CACHE.put(key, points)
+        return points
+    
+    def adaptive_points(self, tolerance=1e-3, pixels=None, initial=128, max_points=2**20):
+        """Points spaced by curvature instead of uniformly in ``t``.
         
-        # Apply rotation
-        if rotation != 0:
-            x_rot = x * np.cos(rotation) - y * np.sin(rotation)
-            y_rot = x * np.sin(rotation) + y * np.cos(rotation)
-            x, y = x_rot, y_rot
+        Intervals of ``t_range`` are refined until every chord is within
+        ``tolerance`` of the curve (see ``adaptive_sample``). With
+        ``pixels=(width, height)`` the tolerance is in pixels of an image
+        of that size showing the whole curve. The result is not memoized.
+        """
+        _, x, y = adaptive_sample(self.evaluate, self.t_range, tolerance, pixels, initial,
+                                  max_points)
+        return x, y
+    
+    def transform(self, scale=1.0, rotation=0.0, translation=(0, 0)):
+        """Apply transformations to the equation.
         
-        # Apply scaling
-        x *= scale
-        y *= scale
+        Rotates, then scales, then translates the generated points and
+        returns them as new arrays; the generated points are left untouched.
+        """
+        x, y = self.generate_points()
+        points = apply_transforms(affine_matrices(scale, rotation, translation), x, y)[0]
+        return points[:, 0], points[:, 1]
+    
+    def transform_batch(self, matrices, out=None):
+        """Apply a stack of ``K`` transforms to the generated points at once.
         
-        # Apply translation
-        x += translation[0]
-        y += translation[1]
+        ``matrices`` are ``(K, 3, 3)`` homogeneous or ``(K, 2, 3)`` affine
+        matrices, for example from ``affine_matrices``; the curve is
+        evaluated (or fetched from the cache) once and all matrices are
+        applied with one matrix multiply (see ``apply_transforms``).
         
-        return x, y 
\ No newline at end of file
+        Returns
+        -------
+        numpy.ndarray
+            Array of shape ``(K, N, 2)``, written into ``out`` if given.
+        """
+        x, y = self.generate_points()
+        return apply_transforms(matrices, x, y, out=out)
@@ -0,0 +1,51 @@
+import numpy as np
+
+from .backends import get_backend
+from .escape_time import complex_grid
+
+
+def _stacked_escape_time(spec, grid, c_values):
+    shape = (c_values.size,) + grid.shape
+    z = np.broadcast_to(grid, shape)
+    c = np.broadcast_to(c_values[:, np.newaxis, np.newaxis], shape)
+    periodicity_tol = spec['periodicity_tol'] if spec['interior'] else None
+    return get_backend(spec['backend'])(z, c, spec['max_iter'],
+                                        periodicity_tol=periodicity_tol)
+
+
+def julia_batch(spec, c_values, points_per_call=2**16):
+    """Escape times of the Julia sets of many ``c`` values on one viewport.
+
+    ``spec`` is a ``'julia'`` ``fractal_spec`` whose own ``c`` is ignored.
+    Images are stacked into ``(k, height, width)`` blocks of about
+    ``points_per_call`` points and each block is iterated by one kernel
+    call, which compacts away escaped points across all its images. Small
+    images are thus evaluated many at a time, while large ones still get
+    blocks that fit in the CPU caches.
+
+    Returns
+    -------
+    numpy.ndarray
+        Integer array of shape ``(len(c_values), height, width)``.
+    """
+    if spec['kind'] != 'julia':
+        raise ValueError("Batched evaluation needs a 'julia' spec")
+    c_values = np.asarray(c_values, dtype=spec['dtype']).reshape(-1)
+    grid = complex_grid(spec['x_range'], spec['y_range'], spec['width'], spec['height'],
+                        dtype=spec['dtype'])
+    out = np.empty((c_values.size,) + grid.shape, dtype=int)
+    step = max(1, points_per_call // grid.size)
+    for start in range(0, c_values.size, step):
+        out[start:start + step] = _stacked_escape_time(spec, grid, c_values[start:start + step])
+    return out
+
+
+def julia_batches(spec, c_values, chunk_size=16, points_per_call=2**16):
+    """Yield ``(first_index, images)`` for ``chunk_size`` values of ``c`` at a time.
+
+    Streams a long sweep (for example animation frames) through
+    ``julia_batch`` without holding every image in memory.
+    """
+    c_values = np.asarray(c_values).reshape(-1)
+    for start in range(0, c_values.size, chunk_size):
+        yield start, julia_batch(spec, c_values[start:start + chunk_size], points_per_call)
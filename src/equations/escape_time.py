@@ -0,0 +1,266 @@
+import numpy as np
+
+from .backends import get_backend, register_backend
+from .instrumentation import active_recorder, phase
+
+
+def complex_grid(x_range, y_range, width, height, rows=None, cols=None, dtype=None):
+    """Build the complex sample grid for a rectangular viewport.
+
+    Rows run along the imaginary axis and columns along the real axis, so the
+    result has shape ``(height, width)`` like the images we render. ``rows``
+    and ``cols`` (slices or index arrays) select a sub-grid with exactly the
+    same sample values as the corresponding part of the full grid.
+    ``dtype`` (e.g. ``np.complex64``) sets the precision of the result.
+    """
+    with phase('grid'):
+        x = np.linspace(x_range[0], x_range[1], width)
+        y = np.linspace(y_range[0], y_range[1], height)
+        if rows is not None:
+            y = y[rows]
+        if cols is not None:
+            x = x[cols]
+        # Broadcasting builds the complex grid without full-size X/Y meshgrids
+        grid = x[np.newaxis, :] + 1j * y[:, np.newaxis]
+        return grid if dtype is None else grid.astype(dtype, copy=False)
+
+
+def fractal_spec(kind, x_range, y_range, width, height, max_iter, c=0j,
+                 interior=False, periodicity_tol=1e-10, backend=None, dtype='complex128'):
+    """Describe an escape-time render as a plain, picklable dict.
+
+    ``kind`` is ``'mandelbrot'`` (the grid is ``c``, ``z`` starts at zero) or
+    ``'julia'`` (the grid is the starting ``z`` and ``c`` is fixed).
+    ``backend`` names the kernel to use (see ``backends.get_backend``) and
+    ``dtype`` the precision of the iteration, ``'complex128'`` or
+    ``'complex64'`` (half the memory, for views that are not zoomed deep).
+    """
+    if kind not in ('mandelbrot', 'julia'):
+        raise ValueError(f"Unknown fractal kind: {kind!r}")
+    if dtype not in ('complex128', 'complex64'):
+        raise ValueError(f"Unsupported dtype: {dtype!r}")
+    return {
+        'kind': kind,
+        'x_range': tuple(x_range),
+        'y_range': tuple(y_range),
+        'width': width,
+        'height': height,
+        'max_iter': max_iter,
+        'c': c,
+        'interior': interior,
+        'periodicity_tol': periodicity_tol,
+        'backend': backend,
+        'dtype': dtype,
+    }
+
+
+def _run_kernel(spec, grid):
+    """Run the spec's backend on an array of complex sample points."""
+    kernel = get_backend(spec.get('backend'))
+    periodicity_tol = spec['periodicity_tol'] if spec['interior'] else None
+    with phase('iterate'):
+        if spec['kind'] == 'mandelbrot':
+            interior = mandelbrot_interior(grid) if spec['interior'] else None
+            return kernel(np.zeros_like(grid), grid, spec['max_iter'],
+                          interior=interior, periodicity_tol=periodicity_tol)
+        return kernel(grid, spec['c'], spec['max_iter'], periodicity_tol=periodicity_tol)
+
+
+def escape_region(spec, rows=None, cols=None):
+    """Escape times for a ``fractal_spec``, or for the given rows/cols of it."""
+    return _run_kernel(spec, complex_grid(spec['x_range'], spec['y_range'], spec['width'],
+                                          spec['height'], rows, cols, spec['dtype']))
+
+
+def escape_points(spec, rows, cols):
+    """Escape times of the individual pixels ``(rows[k], cols[k])`` of a spec."""
+    with phase('grid'):
+        x = np.linspace(spec['x_range'][0], spec['x_range'][1], spec['width'])[cols]
+        y = np.linspace(spec['y_range'][0], spec['y_range'][1], spec['height'])[rows]
+        points = (x + 1j * y).astype(spec['dtype'], copy=False)
+    return _run_kernel(spec, points)
+
+
+def escape_state(spec):
+    """Fresh, not yet advanced ``EscapeTimeState`` for a ``fractal_spec``."""
+    grid = complex_grid(spec['x_range'], spec['y_range'], spec['width'], spec['height'],
+                        dtype=spec['dtype'])
+    periodicity_tol = spec['periodicity_tol'] if spec['interior'] else None
+    if spec['kind'] == 'mandelbrot':
+        interior = mandelbrot_interior(grid) if spec['interior'] else None
+        return EscapeTimeState(np.zeros_like(grid), grid, spec['max_iter'],
+                               interior=interior, periodicity_tol=periodicity_tol)
+    return EscapeTimeState(grid, spec['c'], spec['max_iter'],
+                           periodicity_tol=periodicity_tol)
+
+
+def mandelbrot_interior(c):
+    """Mask of the points inside the main cardioid or the period-2 bulb.
+
+    Both regions lie inside the Mandelbrot set, so their points can be marked
+    as never escaping without iterating them.
+    """
+    x = np.real(c)
+    y2 = np.imag(c)**2
+    q = (x - 0.25)**2 + y2
+    cardioid = q * (q + (x - 0.25)) <= 0.25 * y2
+    bulb = (x + 1)**2 + y2 <= 0.0625
+    return cardioid | bulb
+
+
+class EscapeTimeState:
+    """Escape-time iteration of ``z -> z**2 + c`` that can be resumed.
+
+    Only the points that have not escaped yet are iterated. They are kept in
+    compacted 1-D arrays (``z``, ``c`` and their flat ``index`` into the
+    output), and the arrays shrink every time some of the points escape, so
+    late iterations cost time proportional to the surviving points instead
+    of the full frame. Because the state survives between calls, a render can
+    be advanced a few iterations at a time (one per animation frame) or
+    continued with a larger iteration budget via ``deepen``.
+
+    Parameters
+    ----------
+    z : array_like
+        Starting values (zeros for the Mandelbrot set, the grid for Julia sets);
+        complex64 values are iterated in single precision.
+    c : complex or array_like
+        Constant added every iteration, either a scalar or an array with the
+        same shape as ``z``.
+    max_iter : int
+        Iteration budget; points that have not escaped keep this value.
+    interior : array_like of bool, optional
+        Points already known not to escape (see ``mandelbrot_interior``).
+        They are never iterated and keep ``max_iter``.
+    periodicity_tol : float, optional
+        Enables Brent-style cycle detection: the orbit is compared against a
+        saved value that is refreshed at every power-of-two iteration, and a
+        point whose orbit comes back within this distance is treated as
+        periodic and stops iterating with ``max_iter``. Disabled by default.
+
+    Attributes
+    ----------
+    divtime : numpy.ndarray
+        Integer array shaped like ``z`` holding the iteration at which each
+        point escaped, or ``max_iter`` for points that have not.
+    iteration : int
+        Number of iterations performed so far.
+    """
+
+    def __init__(self, z, c, max_iter, interior=None, periodicity_tol=None):
+        z = np.asarray(z)
+        if z.dtype != np.complex64:
+            z = z.astype(complex, copy=False)
+        self.max_iter = max_iter
+        self.iteration = 0
+        self.divtime = np.full(z.shape, max_iter, dtype=int)
+
+        self.z = z.reshape(-1)
+        # The caller's array is never written; z is updated in place only
+        # once it is a private copy (after the first step or a compaction)
+        self._z_owned = False
+        self.index = np.arange(self.z.size)
+        self._c_is_array = np.ndim(c) > 0
+        if self._c_is_array:
+            c = np.broadcast_to(np.asarray(c, dtype=z.dtype), z.shape).reshape(-1)
+        self.c = c
+
+        self.periodicity_tol = periodicity_tol
+        self._z_saved = None
+        if interior is not None:
+            self._compact(~np.broadcast_to(interior, z.shape).reshape(-1))
+        if periodicity_tol is not None:
+            self._z_saved = self.z.copy()
+            self._next_save = 1
+
+    @property
+    def active(self):
+        """Boolean mask of the points that are still being iterated."""
+        mask = np.zeros(self.divtime.shape, dtype=bool)
+        mask.reshape(-1)[self.index] = True
+        return mask
+
+    @property
+    def done(self):
+        """True once the budget is used up or no point is left to iterate."""
+        return self.iteration >= self.max_iter or self.index.size == 0
+
+    def _compact(self, keep):
+        self.z = self.z[keep]
+        self._z_owned = True
+        self.index = self.index[keep]
+        if self._c_is_array:
+            self.c = self.c[keep]
+        if self._z_saved is not None:
+            self._z_saved = self._z_saved[keep]
+
+    def advance(self, n=None):
+        """Run ``n`` more iterations (default: until ``max_iter``)."""
+        stop = self.max_iter if n is None else min(self.max_iter, self.iteration + n)
+        flat_divtime = self.divtime.reshape(-1)
+        check_cycles = self.periodicity_tol is not None
+        if check_cycles:
+            tol2 = self.periodicity_tol**2
+        recorder = active_recorder()
+
+        for i in range(self.iteration, stop):
+            if self.index.size == 0:
+                break
+            z = self.z
+            if self._z_owned:
+                np.square(z, out=z)
+                z += self.c
+            else:
+                z = self.z = z**2 + self.c
+                self._z_owned = True
+            # Same test as the full-frame loops so the counts match exactly
+            diverge = z*np.conj(z) > 2**2
+            if diverge.any():
+                flat_divtime[self.index[diverge]] = i
+                keep = ~diverge
+            else:
+                keep = None
+
+            if check_cycles:
+                d = z - self._z_saved
+                periodic = d.real**2 + d.imag**2 < tol2
+                if periodic.any():
+                    keep = ~periodic if keep is None else keep & ~periodic
+                if i + 1 == self._next_save:
+                    self._z_saved = z.copy()
+                    self._next_save *= 2
+
+            if keep is not None:
+                self._compact(keep)
+            if recorder is not None:
+                recorder.iteration(i, self.index.size)
+
+        self.iteration = max(self.iteration, stop)
+        return self
+
+    def deepen(self, max_iter):
+        """Raise the iteration budget; call ``advance`` to continue iterating."""
+        if max_iter < self.max_iter:
+            raise ValueError("max_iter can only be increased")
+        self.divtime[self.divtime == self.max_iter] = max_iter
+        self.max_iter = max_iter
+        return self
+
+
+def escape_time(z, c, max_iter, interior=None, periodicity_tol=None):
+    """Escape-time iteration of ``z -> z**2 + c`` with active-point compaction.
+
+    Runs an ``EscapeTimeState`` to completion; see it for the parameters.
+
+    Returns
+    -------
+    numpy.ndarray
+        Integer array shaped like ``z`` holding the iteration at which each
+        point escaped, or ``max_iter`` for points that never did.
+    """
+    return EscapeTimeState(z, c, max_iter, interior=interior,
+                           periodicity_tol=periodicity_tol).advance().divtime
+
+
+# The NumPy kernel is the reference every other backend is checked against
+register_backend('numpy', escape_time, priority=0)
@@ -0,0 +1,323 @@
+import ast
+import functools
+
+import numpy as np
+
+from .base import MathEquation
+
+FUNCTIONS = {
+    'sin': np.sin, 'cos': np.cos, 'tan': np.tan,
+    'arcsin': np.arcsin, 'arccos': np.arccos, 'arctan': np.arctan,
+    'sinh': np.sinh, 'cosh': np.cosh, 'tanh': np.tanh,
+    'exp': np.exp, 'log': np.log, 'log2': np.log2, 'log10': np.log10,
+    'sqrt': np.sqrt, 'abs': np.absolute, 'sign': np.sign,
+    'floor': np.floor, 'ceil': np.ceil,
+    'arctan2': np.arctan2, 'hypot': np.hypot, 'minimum': np.minimum, 'maximum': np.maximum,
+}
+CONSTANTS = {'pi': np.pi, 'e': np.e, 'tau': 2*np.pi}
+
+_UFUNCS = dict(FUNCTIONS, add=np.add, subtract=np.subtract, multiply=np.multiply,
+               divide=np.true_divide, power=np.power, mod=np.mod, negative=np.negative,
+               square=np.square, reciprocal=np.reciprocal)
+_COMMUTATIVE = {'add', 'multiply', 'hypot', 'minimum', 'maximum'}
+_BINARY = {ast.Add: 'add', ast.Sub: 'subtract', ast.Mult: 'multiply', ast.Div: 'divide',
+           ast.Mod: 'mod'}
+# Compiled functions kept per plan, one per distinct set of input shapes
+_MAX_LAYOUTS = 8
+# Integer powers up to this size become multiplications by repeated squaring
+_MAX_SQUARING = 16
+
+
+class _Builder:
+    """Turns expression trees into a hash-consed DAG of NumPy operations.
+
+    Every node is created once per distinct ``(operation, arguments)``, so
+    repeated subexpressions, in one expression or across several, share a
+    node. Operations on constants are folded when they are built.
+    """
+
+    def __init__(self, inputs):
+        self.inputs = inputs
+        self.nodes = [('input', name) for name in inputs]
+        self.index = {node: k for k, node in enumerate(self.nodes)}
+
+    def _add(self, node):
+        if node not in self.index:
+            self.index[node] = len(self.nodes)
+            self.nodes.append(node)
+        return self.index[node]
+
+    def const(self, value):
+        return self._add(('const', float(value)))
+
+    def op(self, name, *args):
+        if all(self.nodes[a][0] == 'const' for a in args):
+            return self.const(_UFUNCS[name](*(self.nodes[a][1] for a in args)))
+        if name in _COMMUTATIVE:
+            args = tuple(sorted(args))
+        return self._add(('op', name) + tuple(args))
+
+    def power(self, base, exponent):
+        node = self.nodes[exponent]
+        if node[0] != 'const':
+            return self.op('power', base, exponent)
+        k = node[1]
+        if k == 0.5:
+            return self.op('sqrt', base)
+        if k != int(k) or abs(k) > _MAX_SQUARING:
+            return self.op('power', base, exponent)
+        k = int(k)
+        if k == 0:
+            return self.const(1.0)
+        result, square, n = None, base, abs(k)
+        while n:
+            if n & 1:
+                result = square if result is None else self.op('multiply', result, square)
+            n >>= 1
+            if n:
+                square = self.op('square', square)
+        return result if k > 0 else self.op('reciprocal', result)
+
+    def visit(self, tree):
+        if isinstance(tree, ast.Expression):
+            return self.visit(tree.body)
+        if isinstance(tree, ast.Constant) and type(tree.value) in (int, float):
+            return self.const(tree.value)
+        if isinstance(tree, ast.Name):
+            if tree.id in self.inputs:
+                return self.index[('input', tree.id)]
+            if tree.id in CONSTANTS:
+                return self.const(CONSTANTS[tree.id])
+            raise ValueError(f"Unknown name {tree.id!r}")
+        if isinstance(tree, ast.UnaryOp) and isinstance(tree.op, (ast.USub, ast.UAdd)):
+            operand = self.visit(tree.operand)
+            return self.op('negative', operand) if isinstance(tree.op, ast.USub) else operand
+        if isinstance(tree, ast.BinOp):
+            left, right = self.visit(tree.left), self.visit(tree.right)
+            if isinstance(tree.op, ast.Pow):
+                return self.power(left, right)
+            if type(tree.op) in _BINARY:
+                return self.op(_BINARY[type(tree.op)], left, right)
+        if isinstance(tree, ast.Call) and isinstance(tree.func, ast.Name) and not tree.keywords:
+            if tree.func.id not in FUNCTIONS:
+                raise ValueError(f"Unknown function {tree.func.id!r}")
+            if len(tree.args) != FUNCTIONS[tree.func.id].nin:
+                raise ValueError(f"{tree.func.id}() takes {FUNCTIONS[tree.func.id].nin} "
+                                 "argument(s)")
+            return self.op(tree.func.id, *(self.visit(arg) for arg in tree.args))
+        raise ValueError(f"Unsupported syntax in expression: {type(tree).__name__}")
+
+
+class ExpressionPlan:
+    """NumPy evaluation plan of one or more expressions over named inputs.
+
+    The expressions are parsed with ``ast`` and only numbers, the inputs,
+    ``pi``/``e``/``tau``, arithmetic (``+ - * / % **``) and the functions
+    in ``FUNCTIONS`` are accepted; nothing is passed to ``eval``. Shared
+    subexpressions are computed once, constant subexpressions are folded
+    and small integer powers become multiplications.
+
+    Each operation writes into a buffer with ``out=``, and an intermediate
+    buffer is reused by later operations as soon as its value is no longer
+    needed, so an evaluation allocates far fewer arrays than the
+    expressions have operations. Buffers belong to a single call and the
+    plan holds no arrays between calls, so one plan can be shared by many
+    curves and run from several threads at once.
+
+    Parameters
+    ----------
+    expressions : sequence of str
+        Expressions to evaluate together.
+    inputs : sequence of str
+        Names of the variables the expressions may use.
+    """
+
+    def __init__(self, expressions, inputs=('t',)):
+        self.expressions = tuple(expressions)
+        self.inputs = tuple(inputs)
+        builder = _Builder(self.inputs)
+        outputs = []
+        for expression in self.expressions:
+            try:
+                tree = ast.parse(expression.strip(), mode='eval')
+            except SyntaxError as error:
+                raise ValueError(f"Invalid expression {expression!r}: {error.msg}") from None
+            outputs.append(builder.visit(tree))
+        self._outputs = tuple(outputs)
+        self.nodes = builder.nodes
+        self.instructions = [k for k, node in enumerate(self.nodes) if node[0] == 'op']
+        last_use = {}
+        for k in self.instructions:
+            for arg in self.nodes[k][2:]:
+                last_use[arg] = k
+        self._last_use = last_use
+        # Compiled evaluation functions by input shapes (code only, no arrays)
+        self._runs = {}
+
+    def __len__(self):
+        """Number of NumPy operations per evaluation."""
+        return len(self.instructions)
+
+    def _compile(self, shapes):
+        """Compile one evaluation for these input shapes into a function.
+
+        Every intermediate gets a scratch buffer, reusing buffers of the
+        same shape whose values are no longer needed; all buffers are
+        allocated by the call that uses them. The operations are emitted as straight-line
+        Python calling the ufuncs on numbered locals, so running the plan
+        costs no more interpreter time than the equivalent hand-written
+        NumPy code. Only node numbers and the names in ``_UFUNCS`` reach
+        the generated source; the user's text never does.
+        """
+        shape = {}
+        for k, node in enumerate(self.nodes):
+            if node[0] == 'input':
+                shape[k] = shapes[self.inputs.index(node[1])]
+            elif node[0] == 'const':
+                shape[k] = ()
+            else:
+                shape[k] = np.broadcast_shapes(*(shape[a] for a in node[2:]))
+        full = np.broadcast_shapes(*shapes)
+        namespace = dict(_UFUNCS, empty=np.empty, full=full,
+                         expand=lambda value: np.array(np.broadcast_to(
+                             np.asarray(value, dtype=float), full)))
+        names = {}
+        for k, node in enumerate(self.nodes):
+            names[k] = f'v{k}' if node[0] == 'input' else f'c{k}'
+            if node[0] == 'const':
+                namespace[names[k]] = node[1]
+
+        # Free buffers by shape, as the local holding them
+        free = {}
+        lines = [f"def run({', '.join(names[k] for k in range(len(self.inputs)))}):"]
+        for k in self.instructions:
+            for arg in set(self.nodes[k][2:]):
+                if (self._last_use.get(arg) == k and self.nodes[arg][0] == 'op'
+                        and arg not in self._outputs):
+                    free.setdefault(shape[arg], []).append(f'v{arg}')
+            if k not in self._outputs and free.get(shape[k]):
+                out = free[shape[k]].pop()
+            else:
+                out = f'empty({shape[k]!r})'
+            names[k] = f'v{k}'
+            args = ', '.join(names[a] for a in self.nodes[k][2:])
+            lines.append(f"    v{k} = {self.nodes[k][1]}({args}, out={out})")
+        # Outputs that are not fresh arrays of the full shape are copied
+        returned = [names[k] if self.nodes[k][0] == 'op' and k not in self._outputs[:j]
+                    and shape[k] == full else f'expand({names[k]})'
+                    for j, k in enumerate(self._outputs)]
+        lines.append(f"    return ({', '.join(returned)},)")
+        exec('\n'.join(lines), namespace)
+        return namespace['run']
+
+    def __call__(self, *values):
+        """Evaluate the expressions for input ``values``; returns a tuple of arrays.
+
+        ``values`` are arrays or scalars, one per input. Results have the
+        broadcast shape of all inputs and are new arrays.
+        """
+        shapes = tuple([getattr(value, 'shape', ()) for value in values])
+        run = self._runs.get(shapes)
+        if run is None:
+            if len(values) != len(self.inputs):
+                raise ValueError(f"Expected values for {', '.join(self.inputs)}")
+            run = self._compile(shapes)
+            if len(self._runs) >= _MAX_LAYOUTS:
+                self._runs.clear()
+            self._runs[shapes] = run
+        return run(*values)
+
+
+@functools.lru_cache(maxsize=128)
+def compile_expressions(expressions, inputs=('t',)):
+    """Cached ``ExpressionPlan`` for a tuple of expressions and input names."""
+    return ExpressionPlan(expressions, inputs)
+
+
+class ExpressionCurve(MathEquation):
+    """Curve whose coordinates are given as expression strings.
+
+    ``x`` and ``y`` are expressions of ``t`` and of the named parameters,
+    compiled once into an ``ExpressionPlan`` (see there for the accepted
+    syntax) that is shared by every curve with the same expressions.
+    Parameters become attributes, so they can be changed later, swept
+    with ``CurveFamily`` and take part in ``generate_points`` caching.
+
+    Parameters
+    ----------
+    x, y : str
+        Expressions for the coordinates, e.g. ``'sin(a*t + delta)'``.
+    t_range : tuple
+        Range of parameter t (default: (0, 2π))
+    num_points : int
+        Number of points to generate (default: 1000)
+    **params : float or array_like
+        Values of the parameters used by the expressions.
+
+    Examples
+    --------
+    >>> curve = ExpressionCurve('sin(3*t)*cos(2*t)', 'sin(4*t)*cos(3*t)')
+    >>> rose = ExpressionCurve('cos(n/d*t)*cos(t)', 'cos(n/d*t)*sin(t)', n=5, d=8)
+    """
+
+    def __init__(self, x, y, t_range=(0, 2*np.pi), num_points=1000, **params):
+        super().__init__(t_range=t_range, num_points=num_points)
+        for name in params:
+            if name in ('x', 'y', 'parameters', 't') or hasattr(type(self), name):
+                raise ValueError(f"{name!r} cannot be used as a parameter name")
+        self.x = x
+        self.y = y
+        self.parameters = tuple(sorted(params))
+        for name, value in params.items():
+            setattr(self, name, value)
+        self.plan()
+
+    def __setattr__(self, name, value):
+        if name in ('x', 'y', 'parameters'):
+            self.__dict__.pop('_plan', None)
+        super().__setattr__(name, value)
+
+    def plan(self):
+        """The compiled ``ExpressionPlan`` of ``(x, y)``."""
+        plan = self.__dict__.get('_plan')
+        if plan is None:
+            plan = self._plan = compile_expressions((self.x, self.y), ('t',) + self.parameters)
+        return plan
+
+    def evaluate(self, t):
+        return self.plan()(t, *[getattr(self, name) for name in self.parameters])
+
+    @classmethod
+    def define(cls, name, x, y, **defaults):
+        """Create a curve class with fixed expressions and default parameters.
+
+        The class takes the parameters (and ``t_range``/``num_points``) as
+        keyword arguments, like the hand-written curves::
+
+            Rose = ExpressionCurve.define('Rose', 'cos(n/d*t)*cos(t)',
+                                          'cos(n/d*t)*sin(t)', n=5, d=8)
+            Rose(n=7).generate_points()
+        """
+        def __init__(self, t_range=(0, 2*np.pi), num_points=1000, **params):
+            unknown = set(params) - set(defaults)
+            if unknown:
+                raise TypeError(f"{name} got unexpected parameters {sorted(unknown)}")
+            cls.__init__(self, x, y, t_range, num_points, **dict(defaults, **params))
+
+        return type(name, (cls,), {'__init__': __init__,
+                                   '__doc__': f"Expression curve x = {x}, y = {y}."})
+
+
+# The parametric curves of ``parametric.py`` written as expressions
+CURVE_EXPRESSIONS = {
+    'Circle': ('radius*cos(t)', 'radius*sin(t)', {'radius': 1.0}),
+    'Spiral': ('growth_rate*t*cos(t)', 'growth_rate*t*sin(t)', {'growth_rate': 1.0}),
+    'RoseCurve': ('cos(n/d*t)*cos(t)', 'cos(n/d*t)*sin(t)', {'n': 5, 'd': 8}),
+    'HeartCurve': ('16*sin(t)**3', '13*cos(t) - 5*cos(2*t) - 2*cos(3*t) - cos(4*t)', {}),
+    'LissajousCurve': ('sin(a*t + delta)', 'sin(b*t)', {'a': 3, 'b': 2, 'delta': np.pi/2}),
+    'ButterflyCurve': ('amplitude*sin(t)*(exp(cos(t)) - 2*cos(4*t) - sin(t/12)**5)',
+                       'amplitude*cos(t)*(exp(cos(t)) - 2*cos(4*t) - sin(t/12)**5)',
+                       {'amplitude': 1.0}),
+    'TrefoilKnot': ('radius*(sin(t) + 2*sin(2*t))', 'radius*(cos(t) - 2*cos(2*t))',
+                    {'radius': 1.0}),
+}
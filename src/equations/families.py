@@ -0,0 +1,144 @@
+import numpy as np
+
+
+class CurveFamily:
+    """Many variants of one curve class, evaluated together.
+
+    Parameters given as arrays are broadcast against each other (as in
+    NumPy) and every element of the broadcast ``shape`` is one variant;
+    scalar parameters are shared. The class's ``evaluate`` receives the
+    parameter arrays in their broadcast layout plus a trailing axis for
+    ``t``, so classes whose formulas are written with NumPy operations,
+    like all the parametric curves, produce many variants per call. Terms
+    that only depend on some parameters are computed once per distinct
+    value: for a grid of ``LissajousCurve(a, b, delta)``,
+    ``sin(b*t)`` is evaluated ``len(b)`` times, not once per variant.
+
+    Parameters
+    ----------
+    cls : type
+        A ``MathEquation`` subclass whose ``evaluate`` broadcasts.
+    t_range : tuple
+        Range of parameter t (default: (0, 2π))
+    num_points : int
+        Number of points per variant (default: 1000)
+    memory_budget : int
+        Approximate bytes of temporaries per block of variants
+        (default: 64 MiB)
+    **params : scalar or array_like
+        Constructor arguments of ``cls``.
+
+    Examples
+    --------
+    >>> roses = CurveFamily(RoseCurve, n=np.arange(1, 8)[:, None], d=np.arange(1, 9))
+    >>> x, y = roses.evaluate()      # shape (56, 1000); roses.shape == (7, 8)
+    """
+
+    def __init__(self, cls, t_range=(0, 2*np.pi), num_points=1000,
+                 memory_budget=64 * 2**20, **params):
+        self.cls = cls
+        self.t_range = t_range
+        self.num_points = num_points
+        self.memory_budget = memory_budget
+        # Non-numeric arguments (such as the expressions of an
+        # ExpressionCurve) are passed to every variant unchanged
+        self.fixed = {name: value for name, value in params.items()
+                      if np.asarray(value).dtype.kind not in 'biuf'}
+        arrays = {name: np.asarray(value) for name, value in params.items()
+                  if name not in self.fixed}
+        self.shape = np.broadcast_shapes((1,), *(value.shape for value in arrays.values()))
+        ndim = len(self.shape)
+        self.params = {name: value.reshape((1,) * (ndim - value.ndim) + value.shape)
+                       for name, value in arrays.items()}
+
+    @classmethod
+    def grid(cls, curve_cls, t_range=(0, 2*np.pi), num_points=1000,
+             memory_budget=64 * 2**20, **params):
+        """Family over every combination of the given parameter values.
+
+        Each parameter gets its own axis, in keyword order, so
+        ``CurveFamily.grid(LissajousCurve, a=a, b=b, delta=delta)`` has
+        shape ``(len(a), len(b), len(delta))``.
+        """
+        axes = [np.asarray(value).reshape(-1) for value in params.values()]
+        grids = np.ix_(*axes) if axes else ()
+        return cls(curve_cls, t_range, num_points, memory_budget, **dict(zip(params, grids)))
+
+    def __len__(self):
+        return int(np.prod(self.shape, dtype=np.int64))
+
+    @property
+    def t(self):
+        """Parameter samples shared by all variants."""
+        return np.linspace(self.t_range[0], self.t_range[1], self.num_points)
+
+    def chunk_size(self):
+        """Variants per ``evaluate`` call within ``memory_budget``.
+
+        Counts about eight float64 temporaries of ``num_points`` per variant.
+        """
+        return int(max(1, min(len(self), self.memory_budget // (8 * 8 * self.num_points))))
+
+    def variant(self, index):
+        """The curve instance of variant ``index`` (in flattened order)."""
+        position = np.unravel_index(index, self.shape)
+        params = {name: np.broadcast_to(value, self.shape)[position].item()
+                  for name, value in self.params.items()}
+        return self.cls(t_range=self.t_range, num_points=self.num_points, **self.fixed, **params)
+
+    def _blocks(self, chunk_size):
+        """Evaluate blocks of the first axis; yields ``(start, shape, x, y)``.
+
+        ``x`` and ``y`` broadcast to ``shape + (num_points,)`` but may be
+        smaller where they do not depend on every parameter.
+        """
+        chunk_size = chunk_size or self.chunk_size()
+        inner = len(self) // self.shape[0]
+        rows = max(1, chunk_size // inner)
+        t = self.t.reshape((1,) * len(self.shape) + (-1,))
+        for r0 in range(0, self.shape[0], rows):
+            r1 = min(r0 + rows, self.shape[0])
+            params = {name: (value if value.shape[0] == 1 else value[r0:r1])[..., np.newaxis]
+                      for name, value in self.params.items()}
+            curve = self.cls(t_range=self.t_range, num_points=self.num_points, **self.fixed,
+                             **params)
+            shape = (r1 - r0,) + self.shape[1:]
+            x, y = curve.evaluate(t)
+            try:
+                np.broadcast_shapes(np.shape(x), np.shape(y), shape + (self.num_points,))
+            except ValueError:
+                raise ValueError(f"{self.cls.__name__}.evaluate does not broadcast over "
+                                 "parameter arrays") from None
+            yield r0 * inner, shape, x, y
+
+    def chunks(self, chunk_size=None):
+        """Yield ``(start, x, y)`` blocks of about ``chunk_size`` variants.
+
+        ``x`` and ``y`` have shape ``(variants, num_points)``. Blocks split
+        the first axis of ``shape``, so each holds at least one row of it.
+        Only one block is in memory at a time, so arbitrarily large
+        families can be streamed (to disk, a renderer or a search).
+        """
+        for start, shape, x, y in self._blocks(chunk_size):
+            full = shape + (self.num_points,)
+            yield (start, np.broadcast_to(x, full).reshape(-1, self.num_points),
+                   np.broadcast_to(y, full).reshape(-1, self.num_points))
+
+    def evaluate(self, chunk_size=None, out=None):
+        """Points of every variant as two ``(len(self), num_points)`` arrays.
+
+        ``out`` may be a pair of preallocated arrays (for example memmaps)
+        to fill instead of allocating new ones. Variant ``k`` corresponds
+        to ``np.unravel_index(k, self.shape)``.
+        """
+        size = (len(self), self.num_points)
+        if out is None:
+            out = (np.empty(size), np.empty(size))
+        elif any(array.shape != size for array in out):
+            raise ValueError(f"out must be two arrays of shape {size}")
+        for start, shape, x, y in self._blocks(chunk_size):
+            count = int(np.prod(shape))
+            full = shape + (self.num_points,)
+            np.copyto(out[0][start:start + count].reshape(full), x)
+            np.copyto(out[1][start:start + count].reshape(full), y)
+        return out
@@ -1,68 +1,271 @@
 import numpy as np
+from abc import abstractmethod
 from .base import MathEquation
+from .bands import escape_bands, render_bands
+from .batch import julia_batch, julia_batches
+from .escape_time import escape_state, fractal_spec
+from .instrumentation import phase
+from .lsystem import koch_subdivide, sierpinski_mesh
+from .outofcore import render_to_file
+from .parallel import render_spec
+from .progressive import progressive_region
+from .subdivision import subdivide_region
 
-class MandelbrotSet(MathEquation):
-    """Implementation of the Mandelbrot set."""
-    def __init__(self, width=800, height=800, max_iter=100, **kwargs):
+class EscapeTimeFractal(MathEquation):
+    """Common rendering logic of the escape-time fractals.
+    
+    Subclasses describe a render with ``_spec`` (see ``fractal_spec``); this
+    class takes care of running it densely, by rectangle subdivision, on a
+    worker pool, from a ``TileCache``, in row bands or progressively, and of
+    resuming it with a larger iteration budget. After rendering,
+    ``computed_pixels`` holds the number of pixels iterated.
+    """
+    # Renders report computed_pixels and have their own TileCache
+    cache_points = False
+    
+    def __init__(self, width, height, max_iter, interior, periodicity_tol,
+                 workers, backend, mode='dense', min_block=16, tile_cache=None,
+                 dtype='complex128', memory_budget=None, **kwargs):
         super().__init__(**kwargs)
         self.width = width
         self.height = height
         self.max_iter = max_iter
+        self.interior = interior
+        self.periodicity_tol = periodicity_tol
+        self.workers = workers
+        self.backend = backend
+        if mode not in ('dense', 'subdivide'):
+            raise ValueError(f"Unknown render mode: {mode!r}")
+        self.mode = mode
+        self.min_block = min_block
+        self.tile_cache = tile_cache
+        self.dtype = dtype
+        self.memory_budget = memory_budget
+        self.computed_pixels = None
+        self._state = None
+        self._state_key = None
+    
+    @abstractmethod
+    def _spec(self):
+        """Return the ``fractal_spec`` for the current parameters."""
     
     def evaluate(self, t):
-        # Create complex plane
-        x = np.linspace(-2, 1, self.width)
-        y = np.linspace(-1.5, 1.5, self.height)
-        X, Y = np.meshgrid(x, y)
-        c = X + 1j * Y
+        with phase('render', fractal=type(self).__name__):
+            return self._render()
+    
+    def _render(self):
+        if self.tile_cache is not None:
+            divtime, self.computed_pixels = self.tile_cache.render(self._spec())
+            return divtime
         
-        # Initialize z and divergence time
-        z = np.zeros_like(c)
-        divtime = self.max_iter + np.zeros(z.shape, dtype=int)
+        if self.memory_budget is not None:
+            self.computed_pixels = self.width * self.height
+            return render_bands(self._spec(), memory_budget=self.memory_budget)
         
-        # Iterate
-        for i in range(self.max_iter):
-            z = z**2 + c
-            diverge = z*np.conj(z) > 2**2
-            div_now = diverge & (divtime == self.max_iter)
-            divtime[div_now] = i
-            z[diverge] = 2
+        if self.mode == 'subdivide':
+            divtime, self.computed_pixels = subdivide_region(self._spec(), self.min_block)
+            return divtime
         
-        return divtime
-
-class JuliaSet(MathEquation):
-    """Implementation of the Julia set."""
-    def __init__(self, width=800, height=800, c=-0.7 + 0.27j, max_iter=100, **kwargs):
-        super().__init__(**kwargs)
-        self.width = width
-        self.height = height
-        self.c = c
+        # Iterate only the points that have not escaped yet
+        self.computed_pixels = self.width * self.height
+        return render_spec(self._spec(), self.workers)
+    
+    def deepen(self, max_iter):
+        """Render with a larger ``max_iter``, continuing from the last call.
+        
+        The first call renders from scratch and keeps the iteration state
+        (see ``EscapeTimeState``); later calls with the same viewport and
+        parameters only run the additional iterations. Returns the same
+        array as ``evaluate`` with ``max_iter`` set to the new value.
+        """
+        spec = dict(self._spec(), max_iter=max_iter)
+        key = dict(spec, max_iter=None, backend=None)
+        if (self._state is None or key != self._state_key
+                or max_iter < self._state.max_iter):
+            self._state = escape_state(spec)
+            self._state_key = key
+        else:
+            self._state.deepen(max_iter)
+        with phase('iterate'):
+            self._state.advance()
         self.max_iter = max_iter
+        return self._state.divtime.copy()
     
-    def evaluate(self, t):
-        # Create complex plane
-        x = np.linspace(-2, 2, self.width)
-        y = np.linspace(-2, 2, self.height)
-        X, Y = np.meshgrid(x, y)
-        z = X + 1j * Y
+    def bands(self, rows_per_band=None):
+        """Yield ``(first_row, divtime)`` row bands of the render.
+        
+        Bands hold ``rows_per_band`` rows, or as many as ``memory_budget``
+        allows; see ``escape_bands``.
+        """
+        return escape_bands(self._spec(), rows_per_band, self.memory_budget)
+    
+    def render_to_file(self, path, tile_size=512):
+        """Render into a ``.npy`` file tile by tile, resuming if interrupted.
         
-        # Initialize divergence time
-        divtime = self.max_iter + np.zeros(z.shape, dtype=int)
+        Returns the finished file as a read-only memmap; see
+        ``outofcore.render_to_file``.
+        """
+        return render_to_file(self._spec(), path, tile_size)
+    
+    def progressive(self, factors=(8, 4, 2, 1), time_budget=None):
+        """Yield ``(factor, image)`` renders at increasing resolution.
         
-        # Iterate
-        for i in range(self.max_iter):
-            z = z**2 + self.c
-            diverge = z*np.conj(z) > 2**2
-            div_now = diverge & (divtime == self.max_iter)
-            divtime[div_now] = i
-            z[diverge] = 2
+        Every level reuses the samples of the coarser ones and is returned at
+        full size; with ``time_budget`` (seconds) the generator stops at the
+        deadline. Rendering happens in the current process regardless of
+        ``workers`` and ``mode`` (see ``progressive_region``).
+        """
+        for factor, divtime, self.computed_pixels in progressive_region(
+                self._spec(), factors, time_budget):
+            yield factor, divtime
+    
+    def preview(self, time_budget, factors=(8, 4, 2, 1)):
+        """Best image finished within ``time_budget`` seconds.
         
-        return divtime 
+        Returns ``(factor, image)`` for the finest level of ``progressive``
+        completed before the deadline; the coarsest level is always returned,
+        even when it takes longer than the budget.
+        """
+        best = None
+        for best in self.progressive(factors, time_budget):
+            pass
+        return best
+
+class MandelbrotSet(EscapeTimeFractal):
+    """Implementation of the Mandelbrot set.
+    
+    Parameters
+    ----------
+    width, height : int
+        Size of the rendered grid in pixels (default: 800 x 800)
+    max_iter : int
+        Maximum number of iterations (default: 100)
+    interior : bool
+        Skip the main cardioid and period-2 bulb analytically and stop
+        iterating orbits detected as periodic (default: False)
+    periodicity_tol : float
+        Distance under which an orbit counts as periodic when ``interior``
+        is enabled (default: 1e-10)
+    workers : int, optional
+        Render tiles on this many worker processes (default: None, render in
+        the current process)
+    backend : str, optional
+        Escape-time kernel to use, e.g. ``'numba'`` for the faster but not
+        bit-identical Numba kernel (default: 'numpy')
+    mode : str
+        ``'dense'`` computes every pixel; ``'subdivide'`` uses Mariani-Silver
+        rectangle subdivision and fills rectangles with uniform borders,
+        in the current process (default: ``'dense'``)
+    min_block : int
+        Rectangle size below which ``'subdivide'`` computes densely
+        (default: 16)
+    tile_cache : TileCache, optional
+        Build renders from the tiles of this cache, computing and storing
+        the missing samples; the viewport is snapped to the tile lattice
+        (see ``snap_viewport``), a fraction of a pixel away. Takes
+        precedence over ``memory_budget``, ``mode`` and ``workers``
+        (default: None)
+    dtype : str
+        Iteration precision, ``'complex128'`` or ``'complex64'`` (default:
+        ``'complex128'``)
+    memory_budget : int, optional
+        Render in row bands sized to stay within this many bytes and return
+        escape times as uint16/uint32 (see ``divtime_dtype``); takes
+        precedence over ``mode`` and ``workers`` (default: None)
+    **kwargs : dict
+        Additional parameters passed to MathEquation
+    """
+    def __init__(self, width=800, height=800, max_iter=100, interior=False,
+                 periodicity_tol=1e-10, workers=None, backend=None, mode='dense',
+                 min_block=16, tile_cache=None, dtype='complex128', memory_budget=None,
+                 **kwargs):
+        super().__init__(width, height, max_iter, interior, periodicity_tol,
+                         workers, backend, mode, min_block, tile_cache, dtype,
+                         memory_budget, **kwargs)
+    
+    def _spec(self):
+        return fractal_spec('mandelbrot', (-2, 1), (-1.5, 1.5), self.width, self.height,
+                            self.max_iter, interior=self.interior,
+                            periodicity_tol=self.periodicity_tol, backend=self.backend,
+                            dtype=self.dtype)
+
+class JuliaSet(EscapeTimeFractal):
+    """Implementation of the Julia set.
+    
+    Parameters
+    ----------
+    width, height : int
+        Size of the rendered grid in pixels (default: 800 x 800)
+    c : complex
+        Julia set parameter (default: -0.7 + 0.27j)
+    max_iter : int
+        Maximum number of iterations (default: 100)
+    interior : bool
+        Stop iterating orbits detected as periodic (default: False)
+    periodicity_tol : float
+        Distance under which an orbit counts as periodic when ``interior``
+        is enabled (default: 1e-10)
+    workers : int, optional
+        Render tiles on this many worker processes (default: None, render in
+        the current process)
+    backend : str, optional
+        Escape-time kernel to use, e.g. ``'numba'`` for the faster but not
+        bit-identical Numba kernel (default: 'numpy')
+    mode : str
+        ``'dense'`` computes every pixel; ``'subdivide'`` uses Mariani-Silver
+        rectangle subdivision and fills rectangles with uniform borders,
+        in the current process (default: ``'dense'``)
+    min_block : int
+        Rectangle size below which ``'subdivide'`` computes densely
+        (default: 16)
+    tile_cache : TileCache, optional
+        Build renders from the tiles of this cache, computing and storing
+        the missing samples; the viewport is snapped to the tile lattice
+        (see ``snap_viewport``), a fraction of a pixel away. Takes
+        precedence over ``memory_budget``, ``mode`` and ``workers``
+        (default: None)
+    dtype : str
+        Iteration precision, ``'complex128'`` or ``'complex64'`` (default:
+        ``'complex128'``)
+    memory_budget : int, optional
+        Render in row bands sized to stay within this many bytes and return
+        escape times as uint16/uint32 (see ``divtime_dtype``); takes
+        precedence over ``mode`` and ``workers`` (default: None)
+    **kwargs : dict
+        Additional parameters passed to MathEquation
+    """
+    def __init__(self, width=800, height=800, c=-0.7 + 0.27j, max_iter=100,
+                 interior=False, periodicity_tol=1e-10, workers=None, backend=None,
+                 mode='dense', min_block=16, tile_cache=None, dtype='complex128',
+                 memory_budget=None, **kwargs):
+        super().__init__(width, height, max_iter, interior, periodicity_tol,
+                         workers, backend, mode, min_block, tile_cache, dtype,
+                         memory_budget, **kwargs)
+        self.c = c
+    
+    def evaluate_batch(self, c_values, chunk_size=None):
+        """Render the Julia sets of many ``c`` values on this viewport.
+        
+        Returns a ``(len(c_values), height, width)`` array, or with
+        ``chunk_size`` a generator of ``(first_index, images)`` chunks; see
+        ``julia_batch``. ``self.c`` is not used.
+        """
+        if chunk_size is not None:
+            return julia_batches(self._spec(), c_values, chunk_size)
+        return julia_batch(self._spec(), c_values)
+    
+    def _spec(self):
+        return fractal_spec('julia', (-2, 2), (-2, 2), self.width, self.height,
+                            self.max_iter, c=self.c, interior=self.interior,
+                            periodicity_tol=self.periodicity_tol, backend=self.backend,
+                            dtype=self.dtype)
 
 class KochSnowflake(MathEquation):
     """Koch snowflake fractal.
     
-    A fractal curve that resembles a snowflake.
+    A fractal curve that resembles a snowflake. Each iteration replaces
+    every edge with four shorter ones, all edges at once (see
+    ``koch_subdivide``), so deep iterations stay cheap.
     
     Parameters
     ----------
@@ -79,45 +282,22 @@ class KochSnowflake(MathEquation):
         self.iterations = iterations
         self.size = size
     
-    def _koch_curve(self, p1, p2, iterations):
-        if iterations == 0:
-            return [p1, p2]
-        
-        # Calculate the three points of the equilateral triangle
-        p1 = np.array(p1)
-        p2 = np.array(p2)
-        v = p2 - p1
-        p3 = p1 + v/3
-        p5 = p1 + 2*v/3
-        p4 = p3 + np.array([
-            v[0]*np.cos(np.pi/3) - v[1]*np.sin(np.pi/3),
-            v[0]*np.sin(np.pi/3) + v[1]*np.cos(np.pi/3)
-        ]) / 3
-        
-        return (self._koch_curve(p1, p3, iterations-1) +
-                self._koch_curve(p3, p4, iterations-1) +
-                self._koch_curve(p4, p5, iterations-1) +
-                self._koch_curve(p5, p2, iterations-1))
+    def vertices(self):
+        """The ``3 * 4**iterations`` corners of the snowflake, each stored once."""
+        triangle = [[0, 0], [self.size, 0], [self.size/2, self.size * np.sqrt(3)/2]]
+        return koch_subdivide(triangle, self.iterations)
     
     def evaluate(self, t):
-        # Create initial triangle
-        p1 = np.array([0, 0])
-        p2 = np.array([self.size, 0])
-        p3 = np.array([self.size/2, self.size * np.sqrt(3)/2])
-        
-        # Generate points for each side
-        points = (self._koch_curve(p1, p2, self.iterations) +
-                 self._koch_curve(p2, p3, self.iterations) +
-                 self._koch_curve(p3, p1, self.iterations))
-        
-        # Convert to numpy array and separate x, y coordinates
-        points = np.array(points)
-        return points[:, 0], points[:, 1]
+        # Closed outline: the vertex ring followed by its first corner
+        vertices = self.vertices()
+        outline = np.concatenate([vertices, vertices[:1]])
+        return outline[:, 0], outline[:, 1]
 
 class SierpinskiTriangle(MathEquation):
     """Sierpinski triangle fractal.
     
-    A fractal pattern of self-similar triangles.
+    A fractal pattern of self-similar triangles, subdivided one level of
+    triangles at a time (see ``sierpinski_mesh``).
     
     Parameters
     ----------
@@ -134,32 +314,13 @@ class SierpinskiTriangle(MathEquation):
         self.iterations = iterations
         self.size = size
     
-    def _sierpinski(self, p1, p2, p3, iterations):
-        if iterations == 0:
-            return [p1, p2, p3, p1]
-        
-        # Calculate midpoints
-        p1 = np.array(p1)
-        p2 = np.array(p2)
-        p3 = np.array(p3)
-        
-        m1 = (p1 + p2) / 2
-        m2 = (p2 + p3) / 2
-        m3 = (p3 + p1) / 2
-        
-        return (self._sierpinski(p1, m1, m3, iterations-1) +
-                self._sierpinski(m1, p2, m2, iterations-1) +
-                self._sierpinski(m3, m2, p3, iterations-1))
+    def mesh(self):
+        """Unique vertices and the ``(3**iterations, 3)`` triangle index buffer."""
+        return sierpinski_mesh([0, 0], [self.size, 0],
+                               [self.size/2, self.size * np.sqrt(3)/2], self.iterations)
     
     def evaluate(self, t):
-        # Create initial triangle
-        p1 = np.array([0, 0])
-        p2 = np.array([self.size, 0])
-        p3 = np.array([self.size/2, self.size * np.sqrt(3)/2])
-        
-        # Generate points
-        points = self._sierpinski(p1, p2, p3, self.iterations)
-        
-        # Convert to numpy array and separate x, y coordinates
-        points = np.array(points)
-        return points[:, 0], points[:, 1] 
\ No newline at end of file
+        # Outline of every triangle, closed by repeating its first corner
+        vertices, triangles = self.mesh()
+        outlines = vertices[triangles[:, [0, 1, 2, 0]]].reshape(-1, 2)
+        return outlines[:, 0], outlines[:, 1]
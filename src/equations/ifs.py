@@ -0,0 +1,320 @@
+import math
+from concurrent.futures import as_completed
+
+import numpy as np
+
+from .base import MathEquation
+from .instrumentation import phase
+
+
+def _check_maps(maps, probabilities=None):
+    """Validate affine maps and return them with normalized probabilities.
+
+    Without ``probabilities`` each map is weighted by the area it maps to,
+    ``|det A|``, floored so that degenerate maps (a fern's stem) are still
+    chosen now and then.
+    """
+    maps = np.asarray(maps, dtype=float)
+    if maps.ndim != 3 or maps.shape[1:] != (2, 3):
+        raise ValueError("maps must have shape (k, 2, 3): rows [a, b, e] and [c, d, f]")
+    if probabilities is None:
+        probabilities = np.maximum(np.abs(np.linalg.det(maps[:, :, :2])), 1e-2)
+    probabilities = np.asarray(probabilities, dtype=float)
+    if probabilities.shape != (maps.shape[0],) or np.any(probabilities < 0):
+        raise ValueError("probabilities must give one non-negative weight per map")
+    return maps, probabilities / probabilities.sum()
+
+
+def _choose(rng, cumulative, size):
+    """Map indices drawn with the given cumulative probabilities."""
+    choice = np.searchsorted(cumulative, rng.random(size), side='right')
+    return np.minimum(choice, cumulative.size - 1, out=choice)
+
+
+def chaos_game(maps, probabilities, n_points, walkers=4096, batch_size=2**20, burn_in=64,
+               seed=None):
+    """Yield the points of the chaos game in ``(x, y)`` batches.
+
+    ``walkers`` independent points are moved at once: every step picks one
+    map per walker and applies all of them with a few array operations.
+    Each walker first takes ``burn_in`` unrecorded steps to settle onto the
+    attractor. Batches hold at most ``batch_size`` points, which bounds
+    memory however many points are requested.
+
+    Parameters
+    ----------
+    maps : array_like
+        ``(k, 2, 3)`` affine maps; map ``i`` sends ``(x, y)`` to
+        ``maps[i] @ (x, y, 1)``.
+    probabilities : array_like or None
+        Probability of choosing each map (normalized here; None weighs the
+        maps by ``|det A|``).
+    n_points : int
+        Number of points to yield in total.
+    seed : int or numpy.random.SeedSequence, optional
+        Seed of the random generator.
+
+    Yields
+    ------
+    tuple
+        ``(x, y)`` arrays of up to ``batch_size`` points.
+    """
+    maps, probabilities = _check_maps(maps, probabilities)
+    rng = np.random.default_rng(seed)
+    walkers = max(1, min(walkers, n_points))
+    cumulative = np.cumsum(probabilities)
+    # Rows a, b, e, c, d, f with one column per map, gathered per walker
+    coefficients = maps.reshape(-1, 6).T.copy()
+
+    def step(x, y, choice, x_out, y_out):
+        a, b, e, c, d, f = np.take(coefficients, choice, axis=1)
+        np.multiply(a, x, out=x_out)
+        x_out += b*y
+        x_out += e
+        np.multiply(c, x, out=y_out)
+        y_out += d*y
+        y_out += f
+
+    xs, ys = rng.random((2, walkers)), rng.random((2, walkers))
+    for s in range(burn_in):
+        step(xs[s % 2], ys[s % 2], _choose(rng, cumulative, walkers),
+             xs[1 - s % 2], ys[1 - s % 2])
+    x, y = xs[burn_in % 2], ys[burn_in % 2]
+
+    steps_per_batch = max(1, batch_size // walkers)
+    remaining = n_points
+    while remaining > 0:
+        steps = min(steps_per_batch, math.ceil(remaining / walkers))
+        xs, ys = np.empty((steps, walkers)), np.empty((steps, walkers))
+        choices = _choose(rng, cumulative, (steps, walkers))
+        for s in range(steps):
+            step(x, y, choices[s], xs[s], ys[s])
+            x, y = xs[s], ys[s]
+        count = min(remaining, xs.size)
+        remaining -= count
+        yield xs.reshape(-1)[:count], ys.reshape(-1)[:count]
+
+
+def ifs_bounds(maps, probabilities=None, n_samples=2**16, margin=0.02, seed=0):
+    """Bounding box of an IFS attractor, estimated from a short chaos game.
+
+    Returns
+    -------
+    tuple
+        ``(x_range, y_range)``, widened by ``margin`` times the extent on
+        every side (and never empty).
+    """
+    x, y = next(chaos_game(maps, probabilities, n_samples, batch_size=n_samples, seed=seed))
+    ranges = []
+    for values in (x, y):
+        low, high = values.min(), values.max()
+        pad = margin * (high - low) or 0.5
+        ranges.append((float(low - pad), float(high + pad)))
+    return tuple(ranges)
+
+
+class DensityHistogram:
+    """Point counts on a ``height x width`` grid over a rectangle.
+
+    Histograms of the same grid can be added together, so partial results
+    from separate runs or processes merge exactly. Row 0 is the top edge
+    (``y_range[1]``), as in an image.
+
+    Parameters
+    ----------
+    x_range, y_range : tuple
+        Extent of the grid; points outside it are not counted.
+    width, height : int
+        Number of bins along x and y.
+    """
+
+    def __init__(self, x_range, y_range, width, height):
+        self.x_range = tuple(float(v) for v in x_range)
+        self.y_range = tuple(float(v) for v in y_range)
+        self.width = width
+        self.height = height
+        self.counts = np.zeros((height, width), dtype=np.int64)
+
+    def _check_grid(self, other):
+        if ((self.x_range, self.y_range, self.width, self.height) !=
+                (other.x_range, other.y_range, other.width, other.height)):
+            raise ValueError("Histograms cover different grids")
+
+    def add(self, x, y):
+        """Count the points ``(x, y)`` that fall inside the grid."""
+        (x0, x1), (y0, y1) = self.x_range, self.y_range
+        col = (np.asarray(x) - x0) * (self.width / (x1 - x0))
+        row = (y1 - np.asarray(y)) * (self.height / (y1 - y0))
+        inside = (col >= 0) & (col < self.width) & (row >= 0) & (row < self.height)
+        if not inside.all():
+            col, row = col[inside], row[inside]
+        index = row.astype(np.intp)
+        index *= self.width
+        index += col.astype(np.intp)
+        self.counts += np.bincount(index, minlength=self.counts.size).reshape(self.counts.shape)
+        return self
+
+    def merge(self, other):
+        """Add the counts of a histogram on the same grid; returns self."""
+        self._check_grid(other)
+        self.counts += other.counts
+        return self
+
+    def __iadd__(self, other):
+        return self.merge(other)
+
+    @property
+    def total(self):
+        """Number of points counted."""
+        return int(self.counts.sum())
+
+    def image(self, log=True):
+        """Counts scaled to ``[0, 1]`` (through ``log1p`` by default) for ``save_image``."""
+        values = np.log1p(self.counts) if log else self.counts.astype(float)
+        peak = values.max()
+        return values / peak if peak > 0 else values
+
+
+def _density_task(maps, probabilities, n_points, grid, walkers, batch_size, burn_in, seed):
+    """Worker entry point: one independently seeded chaos game into a histogram."""
+    histogram = DensityHistogram(*grid)
+    for x, y in chaos_game(maps, probabilities, n_points, walkers, batch_size, burn_in, seed):
+        histogram.add(x, y)
+    return histogram
+
+
+def density_histogram(maps, probabilities, n_points, width=512, height=512, bounds=None,
+                      walkers=4096, batch_size=2**20, burn_in=64, seed=None, workers=None,
+                      points_per_task=2**24, executor=None):
+    """Chaos-game density of an IFS attractor as a ``DensityHistogram``.
+
+    The points are split into tasks of ``points_per_task``, each with its
+    own stream from ``numpy.random.SeedSequence(seed).spawn``, so the result
+    for a given seed does not depend on ``workers``. With ``workers > 1``
+    the tasks run on a process pool (see ``make_executor``) and their
+    histograms are merged as they finish. Memory stays at one point batch
+    and one histogram per running task.
+
+    Parameters
+    ----------
+    bounds : tuple, optional
+        ``(x_range, y_range)`` of the histogram (default: ``ifs_bounds``).
+    workers : int, optional
+        Number of worker processes (default: run in this process).
+    executor : concurrent.futures.ProcessPoolExecutor, optional
+        Reuse an existing pool instead of starting one.
+    """
+    maps, probabilities = _check_maps(maps, probabilities)
+    x_range, y_range = ifs_bounds(maps, probabilities) if bounds is None else bounds
+    grid = (x_range, y_range, width, height)
+    n_tasks = max(1, math.ceil(n_points / points_per_task))
+    sizes = [n_points // n_tasks + (k < n_points % n_tasks) for k in range(n_tasks)]
+    tasks = [(maps, probabilities, size, grid, walkers, batch_size, burn_in, task_seed)
+             for size, task_seed in zip(sizes, np.random.SeedSequence(seed).spawn(n_tasks))]
+
+    histogram = DensityHistogram(*grid)
+    with phase('chaos_game', points=n_points):
+        if executor is None and (workers is None or workers <= 1 or n_tasks == 1):
+            for task in tasks:
+                histogram.merge(_density_task(*task))
+            return histogram
+
+        from .parallel import make_executor
+        own_executor = executor is None
+        if own_executor:
+            executor = make_executor(min(workers, n_tasks))
+        try:
+            futures = [executor.submit(_density_task, *task) for task in tasks]
+            for future in as_completed(futures):
+                histogram.merge(future.result())
+        finally:
+            if own_executor:
+                executor.shutdown()
+    return histogram
+
+
+class IteratedFunctionSystem(MathEquation):
+    """Attractor of an iterated function system, drawn by the chaos game.
+
+    ``generate_points`` returns ``num_points`` points of the attractor
+    (default: 100000); ``density`` renders far more of them into a
+    histogram without keeping the points.
+
+    Parameters
+    ----------
+    maps : array_like
+        ``(k, 2, 3)`` affine maps, rows ``[a, b, e]`` and ``[c, d, f]`` for
+        ``x' = a*x + b*y + e`` and ``y' = c*x + d*y + f``.
+    probabilities : array_like, optional
+        Probability of each map (default: proportional to ``|ad - bc|``)
+    walkers : int
+        Number of points moved in parallel (default: 4096)
+    burn_in : int
+        Unrecorded steps per walker (default: 64)
+    seed : int, optional
+        Seed for reproducible point sets (default: None)
+    **kwargs : dict
+        Additional parameters passed to MathEquation
+    """
+
+    def __init__(self, maps, probabilities=None, walkers=4096, burn_in=64, seed=None,
+                 **kwargs):
+        kwargs.setdefault('num_points', 100_000)
+        super().__init__(**kwargs)
+        self.maps, self.probabilities = _check_maps(maps, probabilities)
+        self.walkers = walkers
+        self.burn_in = burn_in
+        self.seed = seed
+
+    @property
+    def cache_points(self):
+        """Only seeded point sets are reproducible, so only they are memoized."""
+        return self.seed is not None
+
+    def evaluate(self, t):
+        n = len(t)
+        x, y = np.empty(n), np.empty(n)
+        start = 0
+        for xb, yb in chaos_game(self.maps, self.probabilities, n, self.walkers,
+                                 burn_in=self.burn_in, seed=self.seed):
+            x[start:start + xb.size], y[start:start + yb.size] = xb, yb
+            start += xb.size
+        return x, y
+
+    def bounds(self, margin=0.02):
+        """``(x_range, y_range)`` enclosing the attractor (see ``ifs_bounds``)."""
+        return ifs_bounds(self.maps, self.probabilities, margin=margin)
+
+    def density(self, width=512, height=512, n_points=10**7, bounds=None, workers=None,
+                **kwargs):
+        """Render ``n_points`` chaos-game points into a ``DensityHistogram``.
+
+        ``kwargs`` go to ``density_histogram``.
+        """
+        return density_histogram(self.maps, self.probabilities, n_points, width, height,
+                                 bounds, self.walkers, burn_in=self.burn_in, seed=self.seed,
+                                 workers=workers, **kwargs)
+
+
+class BarnsleyFern(IteratedFunctionSystem):
+    """Barnsley's fern with its classic four maps and probabilities."""
+
+    def __init__(self, **kwargs):
+        maps = [[[0.00, 0.00, 0.00], [0.00, 0.16, 0.00]],
+                [[0.85, 0.04, 0.00], [-0.04, 0.85, 1.60]],
+                [[0.20, -0.26, 0.00], [0.23, 0.22, 1.60]],
+                [[-0.15, 0.28, 0.00], [0.26, 0.24, 0.44]]]
+        super().__init__(maps, [0.01, 0.85, 0.07, 0.07], **kwargs)
+
+
+class SierpinskiIFS(IteratedFunctionSystem):
+    """Sierpinski triangle as the attractor of three half-size maps.
+
+    Covers the same triangle as ``SierpinskiTriangle(size=size)``.
+    """
+
+    def __init__(self, size=1.0, **kwargs):
+        corners = [(0, 0), (size, 0), (size/2, size * np.sqrt(3)/2)]
+        maps = [[[0.5, 0.0, cx/2], [0.0, 0.5, cy/2]] for cx, cy in corners]
+        super().__init__(maps, [1/3, 1/3, 1/3], **kwargs)
+        self.size = size
@@ -0,0 +1,116 @@
+import os
+from functools import lru_cache
+
+import numpy as np
+from PIL import Image
+
+from .instrumentation import phase
+
+# Colour stops, evenly spaced from the lowest to the highest value. 'custom'
+# is the palette of ``create_custom_colormap``; 'magma', 'plasma' and
+# 'viridis' are sampled from the matplotlib maps of the same name and 'hot'
+# approximates its piecewise-linear definition.
+PALETTES = {
+    'custom': ('#000000', '#1a1a2e', '#16213e', '#0f3460', '#533483', '#e94560'),
+    'hot': ('#000000', '#550000', '#aa0000', '#ff0000', '#ff5500', '#ffaa00',
+            '#ffff00', '#ffff80', '#ffffff'),
+    'magma': ('#000004', '#0a0822', '#1d1147', '#36106b', '#51127c', '#6a1c81',
+              '#832681', '#9c2e7f', '#b73779', '#d0416f', '#e75263', '#f56b5c',
+              '#fc8961', '#fea772', '#fec488', '#fde2a3', '#fcfdbf'),
+    'plasma': ('#0d0887', '#310597', '#4c02a1', '#6600a7', '#7e03a8', '#9511a1',
+               '#aa2395', '#bc3587', '#cc4778', '#da5a6a', '#e66c5c', '#f0804e',
+               '#f89540', '#fdac33', '#fdc527', '#f8df25', '#f0f921'),
+    'viridis': ('#440154', '#48186a', '#472d7b', '#424086', '#3b528b', '#33638d',
+                '#2c728e', '#26828e', '#21918c', '#1fa088', '#28ae80', '#3fbc73',
+                '#5ec962', '#84d44b', '#addc30', '#d8e219', '#fde725'),
+}
+
+
+@lru_cache(maxsize=32)
+def _lut(colors, n):
+    stops = np.array([[int(color[i:i + 2], 16) for i in (1, 3, 5)] for color in colors],
+                     dtype=float)
+    x = np.linspace(0, 1, len(colors))
+    t = np.linspace(0, 1, n)
+    lut = np.stack([np.interp(t, x, stops[:, k]) for k in range(3)], axis=1)
+    lut = np.rint(lut).astype(np.uint8)
+    lut.setflags(write=False)
+    return lut
+
+
+def colormap_lut(colormap='custom', n=256):
+    """Lookup table of ``n`` RGB colours, shape ``(n, 3)`` and dtype uint8.
+
+    ``colormap`` is a name from ``PALETTES`` or a sequence of ``'#rrggbb'``
+    colours, interpolated linearly like ``LinearSegmentedColormap.from_list``.
+    Tables are computed once and shared, so they are read-only.
+    """
+    if isinstance(colormap, str):
+        if colormap not in PALETTES:
+            raise ValueError(f"Unknown colormap: {colormap!r}")
+        colormap = PALETTES[colormap]
+    return _lut(tuple(colormap), n)
+
+
+def _bins(values, vmin, vmax, n):
+    if vmax <= vmin:
+        return np.zeros(np.shape(values), dtype=np.intp)
+    scaled = (np.clip(values, vmin, vmax) - vmin) * (n / (vmax - vmin))
+    return np.minimum(scaled.astype(np.intp), n - 1)
+
+
+def colorize(values, colormap='custom', vmin=None, vmax=None, n=256):
+    """Map an array (e.g. ``divtime``) to a uint8 RGB image.
+
+    Values are scaled linearly from ``vmin`` to ``vmax`` (default: the
+    array's minimum and maximum) onto the ``n`` colours of the map, as
+    ``imshow`` does. For integer arrays the colour of every possible value
+    is looked up once and the image is built with a single gather.
+
+    Returns
+    -------
+    numpy.ndarray
+        Array of shape ``values.shape + (3,)`` and dtype uint8.
+    """
+    with phase('colorize'):
+        values = np.asarray(values)
+        lut = colormap_lut(colormap, n)
+        vmin = values.min() if vmin is None else vmin
+        vmax = values.max() if vmax is None else vmax
+        if np.issubdtype(values.dtype, np.integer) and vmax - vmin <= 1 << 20:
+            vmin, vmax = int(vmin), int(vmax)
+            table = lut[_bins(np.arange(vmin, vmax + 1), vmin, vmax, n)]
+            if values.min() < vmin or values.max() > vmax:
+                values = np.clip(values, vmin, vmax)
+            return table[values - vmin]
+        return lut[_bins(values, vmin, vmax, n)]
+
+
+def save_image(values, path, colormap='custom', vmin=None, vmax=None, **save_kwargs):
+    """Write an array as an image file at its native resolution.
+
+    ``values`` is either an RGB uint8 array or an array to ``colorize``
+    with ``colormap``, ``vmin`` and ``vmax``. The format follows the file
+    extension; ``save_kwargs`` go to ``PIL.Image.save`` (for example
+    ``compress_level`` for PNG). Row 0 is the top of the image, as in
+    ``imshow``. Returns ``path``.
+    """
+    values = np.asarray(values)
+    if values.ndim != 3:
+        values = colorize(values, colormap, vmin, vmax)
+    with phase('encode', encoder='pillow'):
+        image = Image.fromarray(np.ascontiguousarray(values, dtype=np.uint8), 'RGB')
+        image.save(path, **save_kwargs)
+    return path
+
+
+def export_images(images, directory='.', colormap='custom', extension='png', **save_kwargs):
+    """Save many arrays at once with ``save_image``.
+
+    ``images`` maps file names (without extension) to arrays; all of them
+    use the same ``colormap`` and options. Returns the written paths.
+    """
+    os.makedirs(directory, exist_ok=True)
+    return [save_image(values, os.path.join(directory, f'{name}.{extension}'),
+                       colormap, **save_kwargs)
+            for name, values in images.items()]
@@ -0,0 +1,145 @@
+import contextlib
+import json
+import time
+import tracemalloc
+
+_recorder = None
+_NULL_PHASE = contextlib.nullcontext()
+
+
+def active_recorder():
+    """The ``Recorder`` installed by ``instrument``, or None."""
+    return _recorder
+
+
+def phase(name, **labels):
+    """Time a block as phase ``name`` if instrumentation is enabled.
+
+    Without an active recorder this returns a shared no-op context manager,
+    so instrumented code costs a global lookup and a call per phase.
+    """
+    if _recorder is None:
+        return _NULL_PHASE
+    return _recorder.phase(name, **labels)
+
+
+def _label_text(labels):
+    return ','.join(f'{key}="{value}"' for key, value in sorted(labels.items()))
+
+
+class Recorder:
+    """Collects phase timings and escape-time iteration counts.
+
+    Create one with ``instrument`` rather than directly. Every finished
+    phase and every escape-time iteration is also passed, as a dict, to the
+    callbacks, which can forward them to a custom sink.
+
+    Attributes
+    ----------
+    events : list of dict
+        Finished phases with ``name``, ``labels``, ``start`` and
+        ``duration`` (seconds, relative to the recorder's creation).
+    iterations : list of tuple
+        ``(time, iteration, active_pixels)`` for every iteration of the NumPy
+        escape-time kernel; compiled backends do not report iterations.
+    peak_memory : int or None
+        Peak bytes traced by ``tracemalloc`` when ``trace_memory`` was set.
+    """
+
+    def __init__(self, trace_memory=False, callback=None):
+        self.trace_memory = trace_memory
+        self.callbacks = [] if callback is None else [callback]
+        self.events = []
+        self.iterations = []
+        self.peak_memory = None
+        self._origin = time.perf_counter()
+
+    def _emit(self, event):
+        for callback in self.callbacks:
+            callback(event)
+
+    @contextlib.contextmanager
+    def phase(self, name, **labels):
+        """Context manager timing one occurrence of phase ``name``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            event = {'type': 'phase', 'name': name, 'labels': labels,
+                     'start': start - self._origin, 'duration': time.perf_counter() - start}
+            self.events.append(event)
+            self._emit(event)
+
+    def iteration(self, iteration, active):
+        """Record the number of pixels still active after an iteration."""
+        now = time.perf_counter() - self._origin
+        self.iterations.append((now, iteration, active))
+        if self.callbacks:
+            self._emit({'type': 'iteration', 'time': now, 'iteration': iteration,
+                        'active': active})
+
+    def phase_totals(self):
+        """Total seconds and call count per ``(name, labels)`` phase."""
+        totals = {}
+        for event in self.events:
+            key = (event['name'], _label_text(event['labels']))
+            seconds, calls = totals.get(key, (0.0, 0))
+            totals[key] = (seconds + event['duration'], calls + 1)
+        return totals
+
+    def write_prometheus(self, path, prefix='math_art'):
+        """Write the totals in the Prometheus text exposition format."""
+        lines = [f'# TYPE {prefix}_phase_seconds_total counter',
+                 f'# TYPE {prefix}_phase_calls_total counter']
+        for (name, labels), (seconds, calls) in sorted(self.phase_totals().items()):
+            labels = f'phase="{name}"' + (f',{labels}' if labels else '')
+            lines.append(f'{prefix}_phase_seconds_total{{{labels}}} {seconds:.9f}')
+            lines.append(f'{prefix}_phase_calls_total{{{labels}}} {calls}')
+        lines.append(f'# TYPE {prefix}_pixel_iterations_total counter')
+        lines.append(f'{prefix}_pixel_iterations_total '
+                     f'{sum(active for _, _, active in self.iterations)}')
+        if self.peak_memory is not None:
+            lines.append(f'# TYPE {prefix}_peak_memory_bytes gauge')
+            lines.append(f'{prefix}_peak_memory_bytes {self.peak_memory}')
+        with open(path, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+
+    def write_trace(self, path):
+        """Write phases and active-pixel counts as a Chrome/Perfetto JSON trace."""
+        events = [{'name': event['name'], 'ph': 'X', 'pid': 0, 'tid': 0,
+                   'ts': 1e6 * event['start'], 'dur': 1e6 * event['duration'],
+                   'args': event['labels']}
+                  for event in self.events]
+        events.extend({'name': 'active_pixels', 'ph': 'C', 'pid': 0, 'tid': 0,
+                       'ts': 1e6 * now, 'args': {'active': active}}
+                      for now, _, active in self.iterations)
+        trace = {'traceEvents': events, 'otherData': {'peak_memory': self.peak_memory}}
+        with open(path, 'w') as f:
+            json.dump(trace, f)
+
+
+@contextlib.contextmanager
+def instrument(trace_memory=False, callback=None):
+    """Enable instrumentation for the duration of a ``with`` block.
+
+    Yields the ``Recorder`` collecting the phases of everything rendered
+    inside the block. With ``trace_memory`` the peak traced allocation is
+    measured with ``tracemalloc``, which slows allocation-heavy code down
+    noticeably. ``callback`` receives every event as it happens.
+    """
+    global _recorder
+    recorder = Recorder(trace_memory, callback)
+    previous, _recorder = _recorder, recorder
+    started = trace_memory and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    elif trace_memory:
+        tracemalloc.reset_peak()
+    try:
+        yield recorder
+    finally:
+        if trace_memory:
+            recorder.peak_memory = tracemalloc.get_traced_memory()[1]
+            if started:
+                tracemalloc.stop()
+        _recorder = previous
@@ -0,0 +1,228 @@
+import numpy as np
+
+from .base import MathEquation
+
+
+def koch_subdivide(vertices, iterations):
+    """Apply ``iterations`` Koch steps to the closed polygon ``vertices``.
+
+    Every edge ``p -> q`` is replaced by four edges whose middle two form an
+    equilateral bump on the left of the direction of travel, i.e. inwards
+    for a counter-clockwise polygon and outwards for a clockwise one. All
+    edges of a level are expanded in one vectorized step.
+
+    Parameters
+    ----------
+    vertices : array_like
+        ``(n, 2)`` polygon corners, without repeating the first one.
+    iterations : int
+        Number of subdivision steps.
+
+    Returns
+    -------
+    numpy.ndarray
+        ``(n * 4**iterations, 2)`` corners of the subdivided polygon, each
+        stored once.
+    """
+    if iterations < 0:
+        raise ValueError("iterations must be non-negative")
+    ring = np.asarray(vertices, dtype=float)
+    cos, sin = np.cos(np.pi/3), np.sin(np.pi/3)
+    for _ in range(iterations):
+        v = np.roll(ring, -1, axis=0) - ring
+        p3 = ring + v/3
+        p5 = ring + 2*v/3
+        bump = np.empty_like(v)
+        bump[:, 0] = v[:, 0]*cos - v[:, 1]*sin
+        bump[:, 1] = v[:, 0]*sin + v[:, 1]*cos
+        p4 = p3 + bump/3
+        ring = np.stack([ring, p3, p4, p5], axis=1).reshape(-1, 2)
+    return ring
+
+
+def sierpinski_mesh(p1, p2, p3, iterations):
+    """Vertex and index buffers of a Sierpinski triangle.
+
+    Each level splits every triangle at its edge midpoints into three
+    corner triangles, all triangles of a level at once. Corners are shared
+    between neighbouring triangles; they are deduplicated on the integer
+    lattice of the final level, so no floating-point comparisons are needed.
+
+    Returns
+    -------
+    tuple
+        ``(vertices, triangles)``: ``(m, 2)`` unique vertices and a
+        ``(3**iterations, 3)`` integer array of vertex indices per triangle,
+        in the order of the recursive construction.
+    """
+    if iterations < 0:
+        raise ValueError("iterations must be non-negative")
+    corners = np.array([[p1, p2, p3]], dtype=float)
+    lattice = np.array([[[0, 0], [1, 0], [0, 1]]], dtype=np.int64)
+    for _ in range(iterations):
+        c1, c2, c3 = corners[:, 0], corners[:, 1], corners[:, 2]
+        m1, m2, m3 = (c1 + c2)/2, (c2 + c3)/2, (c3 + c1)/2
+        corners = np.stack([np.stack([c1, m1, m3], axis=1),
+                            np.stack([m1, c2, m2], axis=1),
+                            np.stack([m3, m2, c3], axis=1)], axis=1).reshape(-1, 3, 2)
+        l1, l2, l3 = 2*lattice[:, 0], 2*lattice[:, 1], 2*lattice[:, 2]
+        n1, n2, n3 = (l1 + l2)//2, (l2 + l3)//2, (l3 + l1)//2
+        lattice = np.stack([np.stack([l1, n1, n3], axis=1),
+                            np.stack([n1, l2, n2], axis=1),
+                            np.stack([n3, n2, l3], axis=1)], axis=1).reshape(-1, 3, 2)
+    keys = lattice[..., 0] * (2**iterations + 1) + lattice[..., 1]
+    _, first, inverse = np.unique(keys.reshape(-1), return_index=True, return_inverse=True)
+    vertices = corners.reshape(-1, 2)[first]
+    return vertices, inverse.reshape(-1, 3)
+
+
+def expand_lsystem(axiom, rules, iterations):
+    """Rewrite ``axiom`` with ``rules`` ``iterations`` times.
+
+    The string is held as an array of character codes. Each level looks up
+    the length and offset of every symbol's replacement and gathers the
+    next level with a single ``np.repeat``; symbols without a rule are
+    copied unchanged.
+
+    Returns
+    -------
+    numpy.ndarray
+        ``uint8`` character codes of the final string.
+    """
+    if iterations < 0:
+        raise ValueError("iterations must be non-negative")
+    text = axiom + ''.join(rules) + ''.join(rules.values())
+    if not text.isascii():
+        raise ValueError("L-system symbols must be ASCII characters")
+    lengths = np.ones(256, dtype=np.int64)
+    offsets = np.arange(256, dtype=np.int64)
+    table = [bytes(range(256))]
+    position = 256
+    for symbol, replacement in rules.items():
+        if len(symbol) != 1:
+            raise ValueError(f"Rule keys must be single symbols, got {symbol!r}")
+        code = ord(symbol)
+        lengths[code], offsets[code] = len(replacement), position
+        table.append(replacement.encode('ascii'))
+        position += len(replacement)
+    table = np.frombuffer(b''.join(table), dtype=np.uint8)
+
+    codes = np.frombuffer(axiom.encode('ascii'), dtype=np.uint8)
+    for _ in range(iterations):
+        counts = lengths[codes]
+        starts = np.cumsum(counts) - counts
+        index = np.repeat(offsets[codes] - starts, counts)
+        index += np.arange(index.size)
+        codes = table[index]
+    return codes
+
+
+def turtle_path(codes, angle, draw='F', step=1.0, start_angle=0.0):
+    """Trace L-system symbols with a turtle, vectorized.
+
+    Symbols in ``draw`` move one ``step`` forward, ``'+'`` and ``'-'`` turn
+    left and right by ``angle`` degrees and every other symbol is ignored.
+    Headings are the cumulative sum of the turns, and positions the
+    cumulative sum of the steps taken along them.
+
+    Returns
+    -------
+    tuple
+        ``(x, y)`` arrays with the start point followed by one point per step.
+    """
+    codes = np.asarray(codes, dtype=np.uint8)
+    if np.any((codes == ord('[')) | (codes == ord(']'))):
+        raise ValueError("Branching L-systems ('[' and ']') are not supported")
+    turns = np.zeros(256, dtype=np.int8)
+    turns[ord('+')], turns[ord('-')] = 1, -1
+    moves = np.zeros(256, dtype=bool)
+    moves[np.frombuffer(draw.encode('ascii'), dtype=np.uint8)] = True
+
+    heading_dtype = np.int32 if codes.size < 2**31 else np.int64
+    heading = np.cumsum(np.take(turns, codes), dtype=heading_dtype)[np.take(moves, codes)]
+    turns_per_circle = 360 / angle
+    if turns_per_circle.is_integer():
+        # Look the few possible directions up instead of evaluating exp()
+        # per step; snapping exact zeros keeps right-angle curves on a grid
+        k = np.arange(int(turns_per_circle))
+        directions = np.exp(1j*np.radians(start_angle + k*angle))
+        directions.real[np.isclose(directions.real, 0, atol=1e-12)] = 0
+        directions.imag[np.isclose(directions.imag, 0, atol=1e-12)] = 0
+        steps = np.take(directions, heading % k.size)
+    else:
+        steps = np.exp(1j*np.radians(start_angle + heading*angle))
+
+    points = np.zeros(steps.size + 1, dtype=complex)
+    np.cumsum(step*steps, out=points[1:])
+    return points.real, points.imag
+
+
+class LSystem(MathEquation):
+    """Curve drawn by a Lindenmayer system.
+
+    The axiom is rewritten ``iterations`` times and the result traced by a
+    turtle (see ``expand_lsystem`` and ``turtle_path``). Branching symbols
+    are not supported.
+
+    Parameters
+    ----------
+    axiom : str
+        Initial string.
+    rules : dict
+        Replacement string for each rewritten symbol.
+    angle : float
+        Turn angle of ``'+'`` and ``'-'`` in degrees.
+    iterations : int
+        Number of rewriting steps (default: 4)
+    draw : str
+        Symbols that move the turtle forward (default: 'F')
+    step : float
+        Length of one step (default: 1.0)
+    start_angle : float
+        Initial heading in degrees (default: 0.0)
+    **kwargs : dict
+        Additional parameters passed to MathEquation
+    """
+
+    def __init__(self, axiom, rules, angle, iterations=4, draw='F', step=1.0,
+                 start_angle=0.0, **kwargs):
+        super().__init__(**kwargs)
+        self.axiom = axiom
+        self.rules = rules
+        self.angle = angle
+        self.iterations = iterations
+        self.draw = draw
+        self.step = step
+        self.start_angle = start_angle
+
+    def symbols(self):
+        """The rewritten string as a ``str``."""
+        return expand_lsystem(self.axiom, self.rules, self.iterations).tobytes().decode('ascii')
+
+    def evaluate(self, t):
+        codes = expand_lsystem(self.axiom, self.rules, self.iterations)
+        return turtle_path(codes, self.angle, self.draw, self.step, self.start_angle)
+
+
+class DragonCurve(LSystem):
+    """Heighway dragon curve, ``2**iterations`` steps long."""
+
+    def __init__(self, iterations=10, step=1.0, **kwargs):
+        super().__init__('FX', {'X': 'X+YF+', 'Y': '-FX-Y'}, 90, iterations,
+                         step=step, **kwargs)
+
+
+class HilbertCurve(LSystem):
+    """Hilbert space-filling curve through ``4**iterations`` grid cells."""
+
+    def __init__(self, iterations=5, step=1.0, **kwargs):
+        super().__init__('A', {'A': '+BF-AFA-FB+', 'B': '-AF+BFB+FA-'}, 90, iterations,
+                         step=step, **kwargs)
+
+
+class GosperCurve(LSystem):
+    """Gosper (flowsnake) curve, ``7**iterations`` steps long."""
+
+    def __init__(self, iterations=4, step=1.0, **kwargs):
+        super().__init__('A', {'A': 'A-B--B+A++AA+B-', 'B': '+A-AA--B-A+B+B'}, 60,
+                         iterations, draw='AB', step=step, **kwargs)
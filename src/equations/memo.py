@@ -0,0 +1,114 @@
+from collections import OrderedDict
+
+import numpy as np
+
+
+def freeze(value):
+    """Hashable snapshot of an equation parameter.
+
+    Numbers, strings, None, NumPy scalars and arrays and (nested) tuples,
+    lists and dicts of them are supported; arrays are keyed by dtype, shape
+    and contents. Anything else raises ``TypeError``.
+    """
+    if value is None or isinstance(value, (bool, int, float, complex, str, bytes)):
+        return value
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return ('ndarray', value.dtype.str, value.shape, value.tobytes())
+    if isinstance(value, (tuple, list)):
+        return (type(value).__name__,) + tuple(freeze(item) for item in value)
+    if isinstance(value, dict):
+        return ('dict',) + tuple(sorted((key, freeze(item)) for key, item in value.items()))
+    raise TypeError(f"Cannot key a parameter of type {type(value).__name__}")
+
+
+def _cacheable(value):
+    """Whether ``value`` is an array or a (nested) tuple of arrays."""
+    if isinstance(value, np.ndarray):
+        return True
+    return isinstance(value, tuple) and all(_cacheable(item) for item in value)
+
+
+def _readonly(value):
+    if isinstance(value, np.ndarray):
+        value.setflags(write=False)
+        return value
+    return tuple(_readonly(item) for item in value)
+
+
+def _nbytes(value):
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    return sum(_nbytes(item) for item in value)
+
+
+class PointCache:
+    """Memory LRU of ``MathEquation.generate_points`` results.
+
+    Results are stored read-only and shared with every caller that asks
+    for the same key, so they must never be modified in place.
+
+    Parameters
+    ----------
+    max_memory : int
+        Size limit in bytes; least recently used results are dropped beyond
+        it and larger results are not stored (default: 64 MiB)
+
+    Attributes
+    ----------
+    stats : dict
+        Counts of ``hits`` and ``misses``.
+    """
+
+    def __init__(self, max_memory=64 * 2**20):
+        self.max_memory = max_memory
+        self.stats = {'hits': 0, 'misses': 0}
+        self._entries = OrderedDict()
+        self._bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def nbytes(self):
+        """Bytes held by the cached arrays."""
+        return self._bytes
+
+    def get(self, key):
+        """Cached result for ``key``, or None."""
+        value = self._entries.get(key)
+        if value is None:
+            self.stats['misses'] += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats['hits'] += 1
+        return value
+
+    def put(self, key, value):
+        """Store an array or tuple of arrays; returns it, made read-only.
+
+        Other results (such as lists from a custom ``evaluate``) are
+        returned unchanged without being stored.
+        """
+        if not _cacheable(value):
+            return value
+        value = _readonly(value)
+        size = _nbytes(value)
+        if key in self._entries:
+            self._bytes -= _nbytes(self._entries.pop(key))
+        if size > self.max_memory:
+            return value
+        self._entries[key] = value
+        self._bytes += size
+        while self._bytes > self.max_memory:
+            self._bytes -= _nbytes(self._entries.popitem(last=False)[1])
+        return value
+
+    def clear(self):
+        """Drop every cached result."""
+        self._entries.clear()
+        self._bytes = 0
+
+
+POINT_CACHE = PointCache()
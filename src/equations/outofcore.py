@@ -0,0 +1,101 @@
+import json
+import os
+
+import numpy as np
+
+from .bands import divtime_dtype
+from .escape_time import escape_region
+from .parallel import split_tiles
+
+
+def _manifest_spec(spec):
+    """JSON-compatible form of a spec, without the (interchangeable) backend."""
+    spec = dict(spec, c=[complex(spec['c']).real, complex(spec['c']).imag])
+    spec['x_range'], spec['y_range'] = list(spec['x_range']), list(spec['y_range'])
+    del spec['backend']
+    return spec
+
+
+def _write_manifest(path, manifest):
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(manifest, f)
+    os.replace(tmp, path)
+
+
+def render_to_file(spec, path, tile_size=512):
+    """Render a ``fractal_spec`` into a ``.npy`` file, one tile at a time.
+
+    Escape times are written through a ``numpy.memmap`` in
+    ``divtime_dtype``, so the frame never has to fit in memory. Every
+    finished tile is flushed and recorded in the sidecar manifest
+    ``path + '.json'``; calling this again after an interruption skips the
+    recorded tiles and finishes the rest. Resuming with a different spec or
+    tile size raises ``ValueError``.
+
+    Returns
+    -------
+    numpy.memmap
+        The finished file, opened read-only.
+    """
+    manifest_path = path + '.json'
+    tiles = split_tiles(spec['width'], spec['height'], tile_size)
+    shape = (spec['height'], spec['width'])
+    manifest = {'spec': _manifest_spec(spec), 'tile_size': tile_size, 'done': []}
+
+    if os.path.exists(manifest_path) and os.path.exists(path):
+        with open(manifest_path) as f:
+            previous = json.load(f)
+        if previous['spec'] != manifest['spec'] or previous['tile_size'] != tile_size:
+            raise ValueError(f"{path} was started with different parameters")
+        manifest = previous
+        out = np.lib.format.open_memmap(path, mode='r+')
+    else:
+        out = np.lib.format.open_memmap(path, mode='w+', shape=shape,
+                                        dtype=divtime_dtype(spec['max_iter']))
+        _write_manifest(manifest_path, manifest)
+
+    done = set(manifest['done'])
+    for k, (r0, r1, c0, c1) in enumerate(tiles):
+        if k in done:
+            continue
+        out[r0:r1, c0:c1] = escape_region(spec, slice(r0, r1), slice(c0, c1))
+        out.flush()
+        manifest['done'].append(k)
+        _write_manifest(manifest_path, manifest)
+    del out
+    return np.load(path, mmap_mode='r')
+
+
+def build_pyramid(path, factor=2, min_size=256, rows_per_chunk=1024):
+    """Write downsampled overviews of a ``.npy`` image next to it.
+
+    Level ``k`` (``path`` with ``.k.npy`` replacing ``.npy``) averages
+    ``factor x factor`` blocks of level ``k - 1``, starting from the file
+    itself, until the shorter side drops below ``min_size``. Each level is
+    read through a memmap ``rows_per_chunk`` output rows at a time, so only
+    a band of the source is ever in memory.
+
+    Returns
+    -------
+    list of str
+        Paths of the overview levels, from finest to coarsest.
+    """
+    base = path[:-len('.npy')] if path.endswith('.npy') else path
+    levels = []
+    source = np.load(path, mmap_mode='r')
+    while min(source.shape) // factor >= min_size:
+        height, width = source.shape[0] // factor, source.shape[1] // factor
+        level_path = f'{base}.{len(levels) + 1}.npy'
+        out = np.lib.format.open_memmap(level_path, mode='w+', shape=(height, width),
+                                        dtype=source.dtype)
+        for r0 in range(0, height, rows_per_chunk):
+            r1 = min(r0 + rows_per_chunk, height)
+            block = np.asarray(source[r0 * factor:r1 * factor, :width * factor], dtype=float)
+            block = block.reshape(r1 - r0, factor, width, factor).mean(axis=(1, 3))
+            out[r0:r1] = np.rint(block)
+        out.flush()
+        del out
+        levels.append(level_path)
+        source = np.load(level_path, mmap_mode='r')
+    return levels
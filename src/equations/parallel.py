@@ -0,0 +1,166 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .escape_time import escape_region, fractal_spec
+
+_RESULT_DTYPE = np.dtype(int)
+
+
+def split_tiles(width, height, tile_size):
+    """Split a ``height x width`` frame into ``(row0, row1, col0, col1)`` tiles."""
+    return [(r0, min(r0 + tile_size, height), c0, min(c0 + tile_size, width))
+            for r0 in range(0, height, tile_size)
+            for c0 in range(0, width, tile_size)]
+
+
+def estimate_tile_costs(spec, tiles, stride):
+    """Estimate the work in each tile from a sparse probe of the whole frame.
+
+    The frame is sampled every ``stride`` pixels and each tile is charged the
+    iterations its probe samples needed. Tiles that the probe grid misses get
+    the mean cost, so they still end up somewhere sensible in the queue.
+    """
+    rows = np.arange(0, spec['height'], stride)
+    cols = np.arange(0, spec['width'], stride)
+    probe = escape_region(spec, rows, cols) + 1
+
+    costs = np.empty(len(tiles))
+    for k, (r0, r1, c0, c1) in enumerate(tiles):
+        block = probe[np.searchsorted(rows, r0):np.searchsorted(rows, r1),
+                      np.searchsorted(cols, c0):np.searchsorted(cols, c1)]
+        costs[k] = block.sum() if block.size else np.nan
+    costs[np.isnan(costs)] = np.nanmean(costs) if not np.isnan(costs).all() else 1.0
+    return costs
+
+
+def _attach_shared_memory(name):
+    """Attach to the result buffer; the creating process owns its cleanup."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13: pool workers share the parent's resource tracker, so
+        # the extra registration is a no-op and the parent's unlink clears it
+        return shared_memory.SharedMemory(name=name)
+
+
+def _init_worker():
+    """Keep each worker single-threaded; the pool provides the parallelism."""
+    try:
+        import numba
+    except ImportError:
+        return
+    numba.set_num_threads(1)
+
+
+def make_executor(workers=None):
+    """Start a process pool suitable for ``render_parallel``.
+
+    Workers come from a fork server (or are spawned where that is missing)
+    rather than forked from the caller: forking a process whose compiled
+    kernels have already started their thread pool can deadlock the child.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+    return ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1,
+                               mp_context=context, initializer=_init_worker)
+
+
+def _render_tile(shm_name, shape, spec, tile):
+    """Worker entry point: render one tile straight into the shared buffer."""
+    r0, r1, c0, c1 = tile
+    block = escape_region(spec, slice(r0, r1), slice(c0, c1))
+    shm = _attach_shared_memory(shm_name)
+    try:
+        out = np.ndarray(shape, dtype=_RESULT_DTYPE, buffer=shm.buf)
+        out[r0:r1, c0:c1] = block
+        del out
+    finally:
+        shm.close()
+
+
+def render_parallel(spec, workers=None, tile_size=None, executor=None):
+    """Render a ``fractal_spec`` on a process pool, one tile per task.
+
+    Workers write their tiles directly into a ``multiprocessing.shared_memory``
+    buffer, so only the small spec and tile bounds are pickled. Tiles are
+    submitted most expensive first (costs come from ``estimate_tile_costs``)
+    and handed out dynamically by the pool, which keeps all workers busy even
+    when interior-heavy tiles cost far more than exterior ones.
+
+    Parameters
+    ----------
+    spec : dict
+        Render description from ``fractal_spec``.
+    workers : int, optional
+        Number of worker processes (default: ``os.cpu_count()``).
+    tile_size : int, optional
+        Tile edge in pixels. By default it is chosen to give each worker
+        around 16 tiles.
+    executor : concurrent.futures.ProcessPoolExecutor, optional
+        Reuse an existing pool (see ``make_executor``) instead of starting
+        one for this render.
+
+    Returns
+    -------
+    numpy.ndarray
+        The same array ``escape_region(spec)`` returns.
+    """
+    width, height = spec['width'], spec['height']
+    if workers is None:
+        workers = getattr(executor, '_max_workers', None) or os.cpu_count() or 1
+    if tile_size is None:
+        tile_size = int(np.sqrt(width * height / (16 * workers)))
+        tile_size = min(max(tile_size, 32), 256)
+
+    tiles = split_tiles(width, height, tile_size)
+    costs = estimate_tile_costs(spec, tiles, max(1, tile_size // 4))
+    order = np.argsort(-costs, kind='stable')
+
+    shape = (height, width)
+    shm = shared_memory.SharedMemory(create=True,
+                                     size=max(1, height * width * _RESULT_DTYPE.itemsize))
+    try:
+        own_executor = executor is None
+        if own_executor:
+            executor = make_executor(workers)
+        try:
+            futures = [executor.submit(_render_tile, shm.name, shape, spec, tiles[k])
+                       for k in order]
+            for future in futures:
+                future.result()
+        finally:
+            if own_executor:
+                executor.shutdown()
+
+        view = np.ndarray(shape, dtype=_RESULT_DTYPE, buffer=shm.buf)
+        result = view.copy()
+        del view
+    finally:
+        shm.close()
+        shm.unlink()
+    return result
+
+
+def render_spec(spec, workers=None):
+    """Render a ``fractal_spec`` in this process or, with ``workers > 1``, on a pool.
+
+    This is the entry point the fractal classes and the scripts share, so
+    kernel and scheduling improvements reach all of them.
+    """
+    if workers is not None and workers > 1:
+        return render_parallel(spec, workers=workers)
+    return escape_region(spec)
+
+
+def render_viewport(kind, x_range, y_range, width, height, max_iter=100, workers=None,
+                    **options):
+    """Escape times of a viewport; ``options`` go to ``fractal_spec``.
+
+    For example ``render_viewport('julia', (-2, 2), (-2, 2), 800, 800, c=0.285j)``.
+    """
+    spec = fractal_spec(kind, x_range, y_range, width, height, max_iter, **options)
+    return render_spec(spec, workers)
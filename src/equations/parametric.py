@@ -75,8 +75,9 @@ class ButterflyCurve(MathEquation):
         self.amplitude = amplitude
     
     def evaluate(self, t):
-        x = self.amplitude * np.sin(t) * (np.exp(np.cos(t)) - 2 * np.cos(4*t) - np.sin(t/12)**5)
-        y = self.amplitude * np.cos(t) * (np.exp(np.cos(t)) - 2 * np.cos(4*t) - np.sin(t/12)**5)
+        r = np.exp(np.cos(t)) - 2 * np.cos(4*t) - np.sin(t/12)**5
+        x = self.amplitude * np.sin(t) * r
+        y = self.amplitude * np.cos(t) * r
         return x, y
 
 class TrefoilKnot(MathEquation):
@@ -0,0 +1,51 @@
+import time
+
+import numpy as np
+
+from .escape_time import escape_points
+
+
+def progressive_region(spec, factors=(8, 4, 2, 1), time_budget=None, chunk_size=65536):
+    """Render a ``fractal_spec`` coarse to fine, yielding every finished level.
+
+    Level ``f`` samples every ``f``-th row and column of the full grid, so
+    its samples are pixels of the final image and a finer level only
+    computes the pixels the coarser ones have not. Each level is returned at
+    full size, with every sample repeated over its ``f x f`` block.
+
+    With a ``time_budget`` (in seconds) the render stops at the deadline and
+    the level being computed is dropped, so the last yielded image is the
+    best one finished in time. The deadline is checked between chunks of
+    ``chunk_size`` pixels; the first level is always finished.
+
+    Yields
+    ------
+    tuple
+        ``(factor, divtime, computed_pixels)``: the level, its escape times
+        shaped ``(height, width)`` and the number of pixels iterated so far.
+    """
+    if any(f < 1 for f in factors) or list(factors) != sorted(factors, reverse=True):
+        raise ValueError("factors must be positive and decreasing")
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+    height, width = spec['height'], spec['width']
+    divtime = np.zeros((height, width), dtype=int)
+    known = np.zeros((height, width), dtype=bool)
+    computed = 0
+
+    for level, factor in enumerate(factors):
+        rows, cols = np.meshgrid(np.arange(0, height, factor), np.arange(0, width, factor),
+                                 indexing='ij')
+        missing = ~known[rows, cols]
+        rows, cols = rows[missing], cols[missing]
+        for start in range(0, rows.size, chunk_size):
+            if level and deadline is not None and time.perf_counter() > deadline:
+                return
+            r, c = rows[start:start + chunk_size], cols[start:start + chunk_size]
+            divtime[r, c] = escape_points(spec, r, c)
+            known[r, c] = True
+        computed += rows.size
+
+        coarse = divtime[::factor, ::factor]
+        yield factor, coarse.repeat(factor, 0).repeat(factor, 1)[:height, :width], computed
+        if deadline is not None and time.perf_counter() > deadline:
+            return
@@ -0,0 +1,348 @@
+import numpy as np
+
+from .adaptive import _ramp
+from .imaging import colormap_lut, save_image
+from .instrumentation import phase
+
+# Candidate pixels per block of stroke pieces, bounding temporary memory
+_BLOCK = 2**21
+# Coverage levels of 'over' strokes, finer than any 8-bit output
+_LEVELS = 4096
+# Polylines are thinned to about one vertex per this many pixels of length
+_SPACING = 0.5
+
+
+def _rgb(color):
+    """``'#rrggbb'`` or an RGB triple in ``[0, 1]`` as a float array."""
+    if isinstance(color, str):
+        if len(color) != 7 or color[0] != '#':
+            raise ValueError(f"Colours must be '#rrggbb' strings, got {color!r}")
+        return np.array([int(color[i:i + 2], 16) for i in (1, 3, 5)]) / 255
+    color = np.asarray(color, dtype=float)
+    if color.shape != (3,):
+        raise ValueError("Colours must be '#rrggbb' strings or RGB triples")
+    return color
+
+
+class Canvas:
+    """Float RGB accumulation buffers that curves are drawn into.
+
+    Coordinates are mapped linearly from ``x_range``/``y_range`` onto a
+    ``height x width`` pixel grid; row 0 is the top edge (``y_range[1]``),
+    as in ``DensityHistogram`` and ``save_image``. Everything is drawn with
+    array operations over whole polylines:
+
+    - ``stroke`` draws anti-aliased polylines, either composited like
+      paint (``mode='over'``) or added up as light (``mode='add'``), with
+      one colour or a colour per vertex from a value such as ``t``;
+    - ``fill`` paints polygons with the even-odd rule and anti-aliased
+      edges.
+
+    ``rgb`` holds the composited colour and ``density`` the ink added in
+    ``'add'`` mode (stroke area per pixel), both as float32. ``image``
+    converts ``rgb`` to uint8 for ``save_image``.
+
+    Parameters
+    ----------
+    x_range, y_range : tuple
+        Extent of the canvas in curve coordinates.
+    width, height : int
+        Size in pixels.
+    background : str or tuple
+        Background colour (default: '#000000')
+    """
+
+    def __init__(self, x_range, y_range, width, height, background='#000000'):
+        self.x_range = tuple(float(v) for v in x_range)
+        self.y_range = tuple(float(v) for v in y_range)
+        self.width = width
+        self.height = height
+        self.rgb = np.empty((height, width, 3), dtype=np.float32)
+        self.rgb[:] = _rgb(background)
+        self.density = np.zeros((height, width), dtype=np.float32)
+
+    @classmethod
+    def fit(cls, x, y, width, height, margin=0.05, background='#000000'):
+        """Canvas showing the points ``(x, y)`` at equal aspect ratio, centred.
+
+        ``margin`` is the fraction of the larger extent left free on every side.
+        """
+        x, y = np.asarray(x), np.asarray(y)
+        center = np.array([x.min() + x.max(), y.min() + y.max()]) / 2
+        scale = max(np.ptp(x) / width, np.ptp(y) / height) * (1 + 2*margin) or 1.0
+        half = np.array([width, height]) * scale / 2
+        return cls((center[0] - half[0], center[0] + half[0]),
+                   (center[1] - half[1], center[1] + half[1]), width, height, background)
+
+    def to_pixels(self, x, y):
+        """Pixel coordinates of points; pixel ``(i, j)`` spans ``[i, i + 1)``."""
+        (x0, x1), (y0, y1) = self.x_range, self.y_range
+        return ((np.asarray(x, dtype=float) - x0) * (self.width / (x1 - x0)),
+                (y1 - np.asarray(y, dtype=float)) * (self.height / (y1 - y0)))
+
+    def _colors(self, n, color, values, colormap, vmin, vmax):
+        """Per-vertex RGB for ``n`` vertices, or one colour if ``values`` is None."""
+        if values is None:
+            return _rgb(color)
+        values = np.asarray(values, dtype=float)
+        if values.shape != (n,):
+            raise ValueError("values must have one entry per vertex")
+        lut = colormap_lut(colormap) / 255
+        vmin = values.min() if vmin is None else vmin
+        vmax = values.max() if vmax is None else vmax
+        scale = (len(lut) - 1) / (vmax - vmin) if vmax > vmin else 0.0
+        return lut[np.rint((np.clip(values, vmin, vmax) - vmin) * scale).astype(np.intp)]
+
+    def _thin(self, px, py, colors):
+        """Drop vertices closer than ``_SPACING`` pixels along the line.
+
+        Finer detail cannot be resolved, and every segment costs a piece,
+        so dense samplings (millions of points) would otherwise be drawn
+        from mostly invisible segments. The first vertex of each
+        ``_SPACING`` of arc length and the last vertex are kept.
+        """
+        arc = np.concatenate([[0], np.cumsum(np.hypot(np.diff(px), np.diff(py)))])
+        step = np.floor(arc / _SPACING)
+        keep = np.empty(px.size, dtype=bool)
+        keep[0], keep[-1] = True, True
+        np.not_equal(step[1:-1], step[:-2], out=keep[1:-1])
+        if keep.all():
+            return px, py, colors
+        return px[keep], py[keep], colors[keep] if colors.ndim == 2 else colors
+
+    def _pieces(self, px, py, colors, max_length):
+        """Split segments into pieces at most ``max_length`` pixels long.
+
+        Returns the piece end points and, for per-vertex colours, the
+        colour at each piece's midpoint.
+        """
+        length = np.hypot(np.diff(px), np.diff(py))
+        count = np.maximum(np.ceil(length / max_length), 1).astype(np.intp)
+        segment = np.repeat(np.arange(length.size), count)
+        step = 1 / count[segment]
+        s0 = _ramp(count) * step
+        s1 = s0 + step
+        ax = px[segment] + (px[segment + 1] - px[segment]) * s0
+        ay = py[segment] + (py[segment + 1] - py[segment]) * s0
+        bx = px[segment] + (px[segment + 1] - px[segment]) * s1
+        by = py[segment] + (py[segment + 1] - py[segment]) * s1
+        if colors.ndim == 2:
+            s = ((s0 + s1) / 2)[:, np.newaxis]
+            colors = colors[segment] * (1 - s) + colors[segment + 1] * s
+        return ax, ay, bx, by, colors
+
+    def _coverage(self, ax, ay, bx, by, radius, max_length):
+        """Anti-aliased coverage of capsules of ``radius`` around pieces.
+
+        Yields ``(piece, index, coverage)`` blocks: the flat pixel index of
+        every pixel in a square around each piece and the fraction of it
+        covered, ``clip(radius + 0.5 - distance, 0, 1)`` of its centre
+        from the piece, in float32. ``index`` is -1 for pixels outside the
+        canvas, which are kept so that callers can normalise over the
+        whole footprint.
+        """
+        size = int(np.ceil(max_length + 2*radius)) + 1
+        dj, di = np.divmod(np.arange(size * size), size)
+        offset = dj * self.width + di
+        di, dj = di.astype(np.float32), dj.astype(np.float32)
+        per_block = max(1, _BLOCK // offset.size)
+        for p0 in range(0, ax.size, per_block):
+            piece = slice(p0, p0 + per_block)
+            pax, pay, pbx, pby = ax[piece], ay[piece], bx[piece], by[piece]
+            left = np.floor(np.minimum(pax, pbx) - radius)
+            top = np.floor(np.minimum(pay, pby) - radius)
+            vx = (pbx - pax).astype(np.float32)[:, np.newaxis]
+            vy = (pby - pay).astype(np.float32)[:, np.newaxis]
+            length2 = vx*vx + vy*vy
+            inverse = np.divide(1, length2, out=np.zeros_like(length2), where=length2 > 0)
+            # Offsets of the pixel centres from the start of each piece
+            wx = (left + 0.5 - pax).astype(np.float32)[:, np.newaxis] + di
+            wy = (top + 0.5 - pay).astype(np.float32)[:, np.newaxis] + dj
+            s = wx * vx
+            s += wy * vy
+            s *= inverse
+            np.clip(s, 0, 1, out=s)
+            wx -= s * vx
+            wy -= s * vy
+            coverage = np.hypot(wx, wy, out=wx)
+            np.subtract(np.float32(radius + 0.5), coverage, out=coverage)
+            np.clip(coverage, 0, 1, out=coverage)
+
+            left, top = left.astype(np.intp), top.astype(np.intp)
+            index = (top * self.width + left)[:, np.newaxis] + offset
+            edge = np.flatnonzero((left < 0) | (left + size > self.width)
+                                  | (top < 0) | (top + size > self.height))
+            if edge.size:
+                column = left[edge, np.newaxis] + di.astype(np.intp)
+                row = top[edge, np.newaxis] + dj.astype(np.intp)
+                outside = (column < 0) | (column >= self.width) | (row < 0) | (row >= self.height)
+                index[edge] = np.where(outside, -1, index[edge])
+            yield np.arange(p0, p0 + vx.shape[0]), index, coverage
+
+    def stroke(self, x, y, width=1.0, color='#ffffff', values=None, colormap='viridis',
+               vmin=None, vmax=None, opacity=1.0, mode='over', closed=False):
+        """Draw the polyline through ``(x, y)``; returns self.
+
+        Parameters
+        ----------
+        x, y : array_like
+            Vertices in curve coordinates.
+        width : float
+            Line width in pixels (default: 1.0)
+        color : str or tuple
+            Colour of the whole line when ``values`` is None (default: '#ffffff')
+        values : array_like, optional
+            One value per vertex (for example ``t``) coloured through
+            ``colormap`` between ``vmin`` and ``vmax`` (default: the
+            values' range) and interpolated along the segments.
+        colormap : str or sequence
+            Name from ``PALETTES`` or list of ``'#rrggbb'`` colours (default: 'viridis')
+        opacity : float
+            Opacity in ``'over'`` mode, brightness in ``'add'`` mode (default: 1.0)
+        mode : str
+            ``'over'`` paints the line like an opaque stroke with round
+            joins; ``'add'`` adds every piece's area, so overlapping and
+            dense parts glow brighter and ``density`` records the ink
+            (default: 'over')
+        closed : bool
+            Also connect the last vertex to the first (default: False)
+        """
+        if mode not in ('over', 'add'):
+            raise ValueError(f"Unknown stroke mode: {mode!r}")
+        px, py = self.to_pixels(x, y)
+        if px.ndim != 1 or px.shape != py.shape or px.size < 2:
+            raise ValueError("x and y must be 1-D arrays of at least two vertices")
+        colors = self._colors(px.size, color, values, colormap, vmin, vmax)
+        if closed:
+            px, py = np.append(px, px[0]), np.append(py, py[0])
+            if colors.ndim == 2:
+                colors = np.concatenate([colors, colors[:1]])
+        radius = width / 2
+        # Each piece is tested against a square of pixels around it; pieces
+        # as long as the line is wide keep that square mostly inside the
+        # stroke. Added strokes spread each piece's area over its capsule,
+        # so they use short pieces to keep the profile across the line even
+        max_length = max(1.0, width) if mode == 'over' else 1.0
+        with phase('rasterize', mode=mode):
+            px, py, colors = self._thin(px, py, colors)
+            ax, ay, bx, by, colors = self._pieces(px, py, colors, max_length)
+            flat_rgb = self.rgb.reshape(-1, 3)
+            if mode == 'add':
+                length = np.hypot(bx - ax, by - ay)
+                flat_density = self.density.reshape(-1)
+                for piece, index, coverage in self._coverage(ax, ay, bx, by, radius, max_length):
+                    # Each piece deposits its area (length x width) spread
+                    # over its footprint, so overlaps add up exactly
+                    total = np.maximum(coverage.sum(axis=1, keepdims=True), 1e-12)
+                    weight = coverage * (length[piece, None] * width / total)
+                    inside = (index >= 0) & (coverage > 0)
+                    index, weight = index[inside], weight[inside]
+                    flat_density += np.bincount(index, weight, minlength=flat_density.size)
+                    tint = colors
+                    if colors.ndim == 2:
+                        tint = colors[np.broadcast_to(piece[:, None], inside.shape)[inside]]
+                    for c in range(3):
+                        flat_rgb[:, c] += np.bincount(index, weight * (opacity * tint[..., c]),
+                                                      minlength=flat_density.size)
+                return self
+
+            # Each pixel keeps its strongest coverage and the piece giving it,
+            # packed as coverage level above piece number so that one
+            # maximum finds both; among equal coverage the later piece wins,
+            # as if the pieces were painted in order
+            keys = np.zeros(self.width * self.height, dtype=np.int64)
+            length = np.hypot(bx - ax, by - ay)
+            # Short pieces (the most, on densely sampled curves) are tested
+            # against a smaller square
+            for group, group_length in ((np.flatnonzero(length <= 1), 1.0),
+                                        (np.flatnonzero(length > 1), max_length)):
+                blocks = self._coverage(ax[group], ay[group], bx[group], by[group], radius,
+                                        group_length)
+                for piece, index, coverage in blocks:
+                    inside = (index >= 0) & (coverage > 0)
+                    level = np.rint(coverage[inside] * _LEVELS).astype(np.int64)
+                    level <<= 32
+                    level |= np.broadcast_to(group[piece, np.newaxis], inside.shape)[inside]
+                    np.maximum.at(keys, index[inside], level)
+            covered = np.flatnonzero(keys >> 32)
+            keys = keys[covered]
+            a = ((keys >> 32) * (opacity / _LEVELS))[:, np.newaxis]
+            paint = colors[keys & 0xffffffff] if colors.ndim == 2 else colors
+            flat_rgb[covered] = flat_rgb[covered] * (1 - a) + paint * a
+        return self
+
+    def fill(self, x, y, color='#ffffff', opacity=1.0, samples=4):
+        """Fill the polygon through ``(x, y)`` with the even-odd rule; returns self.
+
+        The polygon is closed automatically. Each pixel row is sampled at
+        ``samples`` sub-scanlines and the spans between crossings cover
+        pixels by their exact fractional overlap, so edges are
+        anti-aliased in both directions. Self-intersecting outlines leave
+        the regions they wind around an even number of times empty, as
+        ``plt.fill`` does.
+        """
+        px, py = self.to_pixels(x, y)
+        if px.ndim != 1 or px.shape != py.shape or px.size < 3:
+            raise ValueError("x and y must be 1-D arrays of at least three vertices")
+        with phase('rasterize', mode='fill'):
+            x0, y0, x1, y1 = px, py, np.roll(px, -1), np.roll(py, -1)
+            # Sub-scanline m lies at y = (m + 0.5) / samples; an edge crosses
+            # those with low <= y < high, so shared vertices count once
+            low = np.ceil(np.minimum(y0, y1) * samples - 0.5).astype(np.intp)
+            high = np.ceil(np.maximum(y0, y1) * samples - 0.5).astype(np.intp)
+            low = np.clip(low, 0, self.height * samples)
+            high = np.clip(high, 0, self.height * samples)
+            count = np.maximum(high - low, 0)
+            edge = np.repeat(np.arange(count.size), count)
+            line = np.repeat(low, count) + _ramp(count)
+            ys = (line + 0.5) / samples
+            xs = x0[edge] + (x1[edge] - x0[edge]) * (ys - y0[edge]) / (y1[edge] - y0[edge])
+
+            # Sorted along each sub-scanline, crossings alternate between
+            # entering (+1) and leaving (-1) the polygon
+            order = np.lexsort((xs, line))
+            line, xs = line[order], np.clip(xs[order], 0, self.width)
+            starts = np.flatnonzero(np.r_[True, line[1:] != line[:-1]])
+            rank = np.arange(line.size) - np.repeat(starts, np.diff(np.r_[starts, line.size]))
+            sign = np.where(rank % 2 == 0, 1.0, -1.0)
+
+            if line.size == 0:
+                return self
+            # A span edge at x adds (floor(x) + 1 - x) to its pixel and the
+            # rest to the next, so the running sum along the row is each
+            # pixel's covered fraction. Spans of a sub-scanline are disjoint
+            # and the sum is linear, so the sub-scanlines of a pixel row
+            # are added up before it is taken, over the rows reached only
+            first, last = line[0] // samples, line[-1] // samples + 1
+            column = np.floor(xs).astype(np.intp)
+            stride = self.width + 2
+            rows = (line // samples - first) * stride
+            weight = sign / samples
+            steps = np.bincount(rows + column, weight * (column + 1 - xs),
+                                minlength=(last - first) * stride)
+            steps += np.bincount(rows + column + 1, weight * (xs - column), minlength=steps.size)
+            alpha = np.cumsum(steps.reshape(-1, stride), axis=1, dtype=np.float32)[:, :self.width]
+            np.clip(alpha, 0, 1, out=alpha)
+            alpha *= opacity
+            band = self.rgb[first:last]
+            band += (_rgb(color).astype(np.float32) - band) * alpha[..., np.newaxis]
+        return self
+
+    def image(self, exposure=None):
+        """``rgb`` as a uint8 array of shape ``(height, width, 3)``.
+
+        Values are clipped to ``[0, 1]``. With ``exposure``, the colour is
+        tone-mapped through ``1 - exp(-exposure * rgb)`` instead, which
+        keeps the gradations of bright, dense ``'add'`` strokes.
+        """
+        if exposure is None:
+            rgb = np.clip(self.rgb, 0, 1)
+        else:
+            rgb = np.expm1(-exposure * np.maximum(self.rgb, 0))
+            rgb *= -1
+        rgb *= 255
+        return np.rint(rgb, out=rgb).astype(np.uint8)
+
+    def save(self, path, exposure=None, **save_kwargs):
+        """Write ``image(exposure)`` with ``save_image``; returns ``path``."""
+        return save_image(self.image(exposure), path, **save_kwargs)
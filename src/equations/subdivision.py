@@ -0,0 +1,90 @@
+import numpy as np
+
+from .escape_time import escape_points
+
+
+def _border(r0, r1, c0, c1):
+    """Rows and columns of the border pixels of an inclusive rectangle."""
+    cols = np.arange(c0, c1 + 1)
+    rows = np.arange(r0 + 1, r1)
+    return (np.concatenate([np.full(cols.size, r0), np.full(cols.size, r1), rows, rows]),
+            np.concatenate([cols, cols, np.full(rows.size, c0), np.full(rows.size, c1)]))
+
+
+def subdivide_region(spec, min_block=16):
+    """Render a ``fractal_spec`` with Mariani-Silver rectangle subdivision.
+
+    Only the border of a rectangle is computed. If every border pixel has
+    the same escape time, the interior is filled with it; otherwise the
+    rectangle is split into four and the new dividing lines become the
+    borders of the children. Rectangles no larger than ``min_block`` pixels
+    on a side are computed densely. All rectangles of one level are
+    evaluated together, so the kernel is called once per level.
+
+    Filling relies on the set being connected: the points escaping no
+    earlier than a given iteration then form one connected region that
+    contains the whole set, so a rectangle whose border has a single escape
+    time cannot enclose a different value unless it contains the set
+    entirely. Rectangles containing the origin (a point of the Mandelbrot
+    set and of every connected Julia set) are therefore always split.
+    Disconnected Julia sets and filaments thinner than the sampling can
+    still be missed.
+
+    Returns
+    -------
+    tuple
+        ``(divtime, computed_pixels)``: the escape times and the number of
+        pixels that were actually iterated.
+    """
+    height, width = spec['height'], spec['width']
+    x = np.linspace(spec['x_range'][0], spec['x_range'][1], width)
+    y = np.linspace(spec['y_range'][0], spec['y_range'][1], height)
+    divtime = np.zeros((height, width), dtype=int)
+    known = np.zeros((height, width), dtype=bool)
+    computed = 0
+
+    def compute(rows, cols):
+        nonlocal computed
+        wanted = np.zeros((height, width), dtype=bool)
+        wanted[rows, cols] = True
+        wanted &= ~known
+        rows, cols = np.nonzero(wanted)
+        if rows.size:
+            divtime[rows, cols] = escape_points(spec, rows, cols)
+            known[rows, cols] = True
+            computed += rows.size
+
+    level = [(0, height - 1, 0, width - 1)]
+    compute(*_border(*level[0]))
+    dense = []
+    while level:
+        children = []
+        for r0, r1, c0, c1 in level:
+            if r1 - r0 < 2 or c1 - c0 < 2:
+                continue
+            border = divtime[r0, c0:c1 + 1], divtime[r1, c0:c1 + 1], \
+                divtime[r0:r1 + 1, c0], divtime[r0:r1 + 1, c1]
+            value = border[0][0]
+            contains_origin = (min(x[c0], x[c1]) <= 0 <= max(x[c0], x[c1])
+                               and min(y[r0], y[r1]) <= 0 <= max(y[r0], y[r1]))
+            if not contains_origin and all((side == value).all() for side in border):
+                divtime[r0 + 1:r1, c0 + 1:c1] = value
+                known[r0 + 1:r1, c0 + 1:c1] = True
+            elif r1 - r0 <= min_block or c1 - c0 <= min_block:
+                dense.append((r0, r1, c0, c1))
+            else:
+                rm, cm = (r0 + r1) // 2, (c0 + c1) // 2
+                children += [(r0, rm, c0, cm), (r0, rm, cm, c1),
+                             (rm, r1, c0, cm), (rm, r1, cm, c1)]
+        if children:
+            borders = [_border(*rect) for rect in children]
+            compute(np.concatenate([b[0] for b in borders]),
+                    np.concatenate([b[1] for b in borders]))
+        level = children
+
+    if dense:
+        blocks = [np.meshgrid(np.arange(r0 + 1, r1), np.arange(c0 + 1, c1), indexing='ij')
+                  for r0, r1, c0, c1 in dense]
+        compute(np.concatenate([rows.reshape(-1) for rows, _ in blocks]),
+                np.concatenate([cols.reshape(-1) for _, cols in blocks]))
+    return divtime, computed
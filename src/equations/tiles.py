@@ -0,0 +1,240 @@
+import hashlib
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+from .escape_time import _run_kernel
+
+
+# Significant bits of the lattice spacing and sub-pixel bits of its offset:
+# away from deep zooms, snapping changes a viewport's scale by up to 2**-20
+# and moves it by up to 2**-11 of a pixel
+_STEP_BITS = 20
+_OFFSET_BITS = 10
+
+
+def _lattice_axis(low, high, count):
+    """``(step, offset, first)`` of one axis; see ``tile_lattice``."""
+    spacing = (high - low) / max(count - 1, 1)
+    if spacing == 0:
+        raise ValueError("Cannot tile a viewport of zero extent")
+    # Samples are integers times 2**exponent, exact while below 2**53 of them;
+    # far from the origin fewer bits are kept, the offset's first
+    reach = max(abs(low), abs(high)) / abs(spacing) + count
+    bits = max(0, min(_STEP_BITS, 51 - int(np.ceil(np.log2(reach)))))
+    offset_bits = max(0, min(_OFFSET_BITS, 51 - int(np.ceil(np.log2(reach))) - bits))
+    exponent = int(np.floor(np.log2(abs(spacing)))) - bits
+    step = round(spacing * 2.0**-exponent) * 2.0**exponent
+    unit = step / 2**offset_bits
+    start = round(low / unit)
+    phase = start % 2**offset_bits
+    return step, phase * unit, (start - phase) // 2**offset_bits
+
+
+def tile_lattice(spec):
+    """Lattice of a ``fractal_spec``, per axis ``(step, offset, first)``.
+
+    Sample ``n`` of an axis is ``n * step + offset``, computed exactly, so
+    it has the same value in every viewport with the same ``step`` and
+    ``offset``. The step is the pixel spacing rounded to 20 significant
+    bits and the offset a multiple of ``step / 1024`` below ``step`` (fewer
+    bits far from the origin, where the samples would otherwise be
+    inexact). ``first`` is the lattice index of the viewport's first pixel.
+    """
+    return (_lattice_axis(*spec['x_range'], spec['width']),
+            _lattice_axis(*spec['y_range'], spec['height']))
+
+
+def snap_viewport(spec):
+    """The ``fractal_spec`` moved onto its tile lattice (see ``tile_lattice``).
+
+    The viewport moves by a small fraction of a pixel and its scale changes
+    by a relative ``2**-20`` or less. A direct render of the snapped spec
+    samples exactly the lattice points, so it equals a ``TileCache`` render.
+    """
+    (x_step, x_offset, x_first), (y_step, y_offset, y_first) = tile_lattice(spec)
+    return dict(spec,
+                x_range=(x_first * x_step + x_offset,
+                         (x_first + spec['width'] - 1) * x_step + x_offset),
+                y_range=(y_first * y_step + y_offset,
+                         (y_first + spec['height'] - 1) * y_step + y_offset))
+
+
+def tile_key(spec, lattice, tx, ty, tile_size):
+    """Cache key of tile ``(tx, ty)`` of a lattice for a ``fractal_spec``.
+
+    ``lattice`` is ``(x_step, x_offset, y_step, y_offset)``. Everything that
+    changes the escape times is part of the key, including the backend,
+    since the optional kernels may differ from the NumPy reference in a few
+    boundary pixels.
+    """
+    return (spec['kind'], complex(spec['c']) if spec['kind'] == 'julia' else None,
+            lattice, tx, ty, tile_size, spec['max_iter'], spec['interior'],
+            spec['periodicity_tol'] if spec['interior'] else None,
+            spec['dtype'], spec.get('backend'))
+
+
+class TileCache:
+    """Escape-time tiles kept in a memory LRU and, optionally, on disk.
+
+    Renders are of the viewport snapped to its lattice (see
+    ``snap_viewport``), whose pixels are exactly the lattice samples, and
+    are assembled from square tiles of ``tile_size`` samples. Adjacent
+    tiles share the lattice, so they join seamlessly, and overlapping
+    viewports with the same spacing reuse the same tiles. Only the samples
+    a render needs are computed: tiles at the edges of a viewport are
+    stored partially filled and completed by later renders that need more
+    of them.
+
+    Parameters
+    ----------
+    max_memory : int
+        Size limit of the in-memory tier in bytes; least recently used tiles
+        are dropped beyond it (default: 256 MiB)
+    directory : str, optional
+        Directory of the on-disk tier (default: None, memory only)
+    max_disk : int
+        Size limit of the on-disk tier in bytes; files that were least
+        recently used are deleted beyond it (default: 1 GiB)
+    tile_size : int
+        Tile side in samples (default: 128)
+
+    Attributes
+    ----------
+    stats : dict
+        Counts of ``memory_hits``, ``disk_hits`` and ``misses``.
+    """
+
+    def __init__(self, max_memory=256 * 2**20, directory=None, max_disk=2**30,
+                 tile_size=128):
+        self.max_memory = max_memory
+        self.directory = directory
+        self.max_disk = max_disk
+        self.tile_size = tile_size
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            self._disk_bytes = sum(size for _, _, size in self._disk_files())
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha1(repr(key).encode()).hexdigest() + '.npy')
+
+    def _disk_files(self):
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.npy'):
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.path, stat.st_size))
+        return files
+
+    def _remember(self, key, tile):
+        if key in self._memory:
+            self._memory_bytes -= self._memory.pop(key).nbytes
+        self._memory[key] = tile
+        self._memory_bytes += tile.nbytes
+        while self._memory_bytes > self.max_memory and self._memory:
+            self._memory_bytes -= self._memory.popitem(last=False)[1].nbytes
+
+    def get(self, key):
+        """Cached tile for ``key`` (read-only), or None."""
+        tile = self._memory.get(key)
+        if tile is not None:
+            self._memory.move_to_end(key)
+            self.stats['memory_hits'] += 1
+            return tile
+        if self.directory is not None:
+            path = self._path(key)
+            try:
+                tile = np.load(path)
+                os.utime(path)
+            except (OSError, ValueError):
+                tile = None
+            if tile is not None:
+                tile.setflags(write=False)
+                self._remember(key, tile)
+                self.stats['disk_hits'] += 1
+                return tile
+        self.stats['misses'] += 1
+        return None
+
+    def put(self, key, tile):
+        """Store a tile in both tiers, evicting old tiles beyond the limits."""
+        tile = np.array(tile)
+        tile.setflags(write=False)
+        self._remember(key, tile)
+        if self.directory is None:
+            return
+        path = self._path(key)
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'wb') as f:
+            np.save(f, tile)
+        if os.path.exists(path):
+            self._disk_bytes -= os.path.getsize(path)
+        os.replace(tmp, path)
+        self._disk_bytes += os.path.getsize(path)
+        if self._disk_bytes > self.max_disk:
+            files = sorted(self._disk_files())
+            self._disk_bytes = sum(size for _, _, size in files)
+            for _, old, size in files:
+                if self._disk_bytes <= self.max_disk:
+                    break
+                os.remove(old)
+                self._disk_bytes -= size
+
+    def clear(self):
+        """Drop every tile from memory and from disk."""
+        self._memory.clear()
+        self._memory_bytes = 0
+        if self.directory is not None:
+            for _, path, _ in self._disk_files():
+                os.remove(path)
+            self._disk_bytes = 0
+
+    def render(self, spec):
+        """Render a ``fractal_spec`` from cached tiles, computing missing samples.
+
+        The result equals a direct render of ``snap_viewport(spec)``. All
+        missing samples are computed in a single kernel call and stored.
+
+        Returns
+        -------
+        tuple
+            ``(divtime, computed_pixels)``: the escape times and the number
+            of samples that had to be iterated.
+        """
+        size = self.tile_size
+        (x_step, x_offset, x_first), (y_step, y_offset, y_first) = tile_lattice(spec)
+        lattice = (x_step, x_offset, y_step, y_offset)
+        txs = np.arange(x_first // size, (x_first + spec['width'] - 1) // size + 1)
+        tys = np.arange(y_first // size, (y_first + spec['height'] - 1) // size + 1)
+
+        keys, blocks = {}, []
+        for ty in tys:
+            row = []
+            for tx in txs:
+                keys[ty, tx] = tile_key(spec, lattice, int(tx), int(ty), size)
+                tile = self.get(keys[ty, tx])
+                # -1 marks samples no render has needed yet
+                row.append(np.full((size, size), -1, dtype=np.int64) if tile is None else tile)
+            blocks.append(row)
+        mosaic = np.block(blocks)
+        x0, y0 = x_first - txs[0] * size, y_first - tys[0] * size
+        view = mosaic[y0:y0 + spec['height'], x0:x0 + spec['width']]
+
+        rows, cols = np.nonzero(view < 0)
+        if len(rows):
+            x = (x_first + cols) * x_step + x_offset
+            y = (y_first + rows) * y_step + y_offset
+            view[rows, cols] = _run_kernel(spec, (x + 1j * y).astype(spec['dtype'], copy=False))
+            changed = np.zeros(mosaic.shape, dtype=bool)
+            changed[rows + y0, cols + x0] = True
+            for i, ty in enumerate(tys):
+                for j, tx in enumerate(txs):
+                    block = np.s_[i * size:(i + 1) * size, j * size:(j + 1) * size]
+                    if changed[block].any():
+                        self.put(keys[ty, tx], mosaic[block])
+        return view.copy(), len(rows)
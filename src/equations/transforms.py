@@ -0,0 +1,73 @@
+import numpy as np
+
+
+def affine_matrices(scale=1.0, rotation=0.0, translation=(0, 0)):
+    """Stack of 3x3 matrices that rotate, then scale, then translate.
+
+    The arguments broadcast against each other: ``scale`` and ``rotation``
+    (radians) may be scalars or arrays of shape ``(K,)``, ``translation``
+    a pair or an array of shape ``(K, 2)``. Sines and cosines are
+    evaluated once for the whole stack.
+
+    Returns
+    -------
+    numpy.ndarray
+        Homogeneous matrices of shape ``(K, 3, 3)``.
+    """
+    scale = np.asarray(scale, dtype=float)
+    rotation = np.asarray(rotation, dtype=float)
+    translation = np.asarray(translation, dtype=float)
+    if translation.shape[-1:] != (2,):
+        raise ValueError("translation must end in a dimension of size 2")
+    k = np.broadcast_shapes(scale.shape, rotation.shape, translation.shape[:-1], (1,))
+    if len(k) != 1:
+        raise ValueError("scale, rotation and translation must be scalars or 1-D stacks")
+    cos, sin = scale * np.cos(rotation), scale * np.sin(rotation)
+    matrices = np.zeros(k + (3, 3))
+    matrices[:, 0, 0], matrices[:, 0, 1] = cos, -sin
+    matrices[:, 1, 0], matrices[:, 1, 1] = sin, cos
+    matrices[:, :2, 2] = translation
+    matrices[:, 2, 2] = 1
+    return matrices
+
+
+def apply_transforms(matrices, x, y, out=None):
+    """Apply a stack of affine or projective matrices to one set of points.
+
+    The points are written once in homogeneous form and all matrices are
+    applied by a single ``np.matmul``. Matrices whose last row is not
+    ``(0, 0, 1)`` are projective, and their results are divided by ``w``.
+
+    Parameters
+    ----------
+    matrices : array_like
+        ``(K, 3, 3)`` homogeneous or ``(K, 2, 3)`` affine matrices; a single
+        matrix counts as ``K = 1``.
+    x, y : array_like
+        Coordinates of the ``N`` points.
+    out : numpy.ndarray, optional
+        Float64 buffer of shape ``(K, N, 2)`` to write the result into.
+
+    Returns
+    -------
+    numpy.ndarray
+        Transformed points of shape ``(K, N, 2)`` (``out`` if given).
+    """
+    matrices = np.asarray(matrices, dtype=float)
+    if matrices.ndim == 2:
+        matrices = matrices[np.newaxis]
+    if matrices.ndim != 3 or matrices.shape[1:] not in ((2, 3), (3, 3)):
+        raise ValueError("matrices must have shape (K, 3, 3) or (K, 2, 3)")
+    x, y = np.asarray(x, dtype=float).reshape(-1), np.asarray(y, dtype=float).reshape(-1)
+    shape = (matrices.shape[0], x.size, 2)
+    if out is None:
+        out = np.empty(shape)
+    elif out.shape != shape or out.dtype != np.float64:
+        raise ValueError(f"out must be a float64 array of shape {shape}")
+
+    points = np.empty((x.size, 3))
+    points[:, 0], points[:, 1], points[:, 2] = x, y, 1
+    np.matmul(points, matrices[:, :2].transpose(0, 2, 1), out=out)
+    if matrices.shape[1] == 3 and np.any(matrices[:, 2] != (0, 0, 1)):
+        out /= (points @ matrices[:, 2].T).T[..., np.newaxis]
+    return out
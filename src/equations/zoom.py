@@ -0,0 +1,182 @@
+import numpy as np
+
+from .backends import get_backend
+from .escape_time import mandelbrot_interior
+
+
+def interpolate_viewports(keyframes, frames_per_segment=60):
+    """Exponentially interpolated viewports between zoom keyframes.
+
+    Each keyframe is a dict with ``x_min``, ``x_max``, ``y_min`` and
+    ``y_max`` (the format of ``zoom_path`` in ``mandelbrot_zoom.py``). Within
+    a segment the view size changes by a constant factor per frame, and the
+    centre moves so that the zoom stays anchored on the fixed point of the
+    similarity between the two keyframes, which is what makes a zoom look
+    smooth. The last keyframe is included as the final viewport.
+
+    Returns
+    -------
+    list of tuple
+        ``(x_min, x_max, y_min, y_max)`` for every frame.
+    """
+    viewports = []
+    for start, end in zip(keyframes[:-1], keyframes[1:]):
+        s = np.arange(frames_per_segment) / frames_per_segment
+        axes = []
+        for lo, hi in (('x_min', 'x_max'), ('y_min', 'y_max')):
+            size0, size1 = start[hi] - start[lo], end[hi] - end[lo]
+            mid0, mid1 = (start[hi] + start[lo]) / 2, (end[hi] + end[lo]) / 2
+            ratio = size1 / size0
+            size = size0 * ratio**s
+            if np.isclose(ratio, 1.0):
+                mid = mid0 + (mid1 - mid0) * s
+            else:
+                mid = mid0 + (mid1 - mid0) * (1 - ratio**s) / (1 - ratio)
+            axes.append((mid - size / 2, mid + size / 2))
+        (x_lo, x_hi), (y_lo, y_hi) = axes
+        viewports.extend(zip(x_lo, x_hi, y_lo, y_hi))
+    last = keyframes[-1]
+    viewports.append((last['x_min'], last['x_max'], last['y_min'], last['y_max']))
+    return [tuple(float(v) for v in viewport) for viewport in viewports]
+
+
+def _match_samples(previous, target, spacing, tolerance):
+    """Assign previous samples to target pixels without reusing any twice.
+
+    Returns, for every target pixel, the index of a previous sample closer
+    than ``tolerance * spacing`` to it, or -1. Samples are taken in order and
+    given the first free pixel in their window, which is an optimal matching
+    for equal-sized windows and keeps the result sorted.
+    """
+    match = np.full(len(target), -1)
+    if len(target) < 2:
+        return match
+    u = (np.asarray(previous) - target[0]) / spacing
+    first = np.floor(u - tolerance).astype(int) + 1
+    next_free = 0
+    for j in range(len(u)):
+        k = max(next_free, first[j])
+        if k >= len(target):
+            break
+        if k - u[j] < tolerance:
+            match[k] = j
+            next_free = k + 1
+    return match
+
+
+class ZoomSequenceRenderer:
+    """Render zoom frames, reusing samples shared with the previous frame.
+
+    Every pixel records the exact point it was computed at. When the next
+    frame is rendered, a pixel keeps the previous frame's sample if that
+    sample lies within ``tolerance`` pixels of the new pixel centre along both
+    axes, so only the remaining pixels are iterated. Because reused values
+    always belong to their true coordinates, the error never accumulates
+    across frames: every pixel shows the exact escape time of a point at most
+    ``tolerance`` pixels from its centre.
+
+    The sample coordinates are tracked per column and per row, which keeps
+    the matching separable and the bookkeeping to two 1-D arrays: a column
+    that keeps an old sample position keeps it for every row, and pixels in
+    rows or columns without a match are iterated at those coordinates.
+
+    Parameters
+    ----------
+    width, height : int
+        Frame size in pixels
+    max_iter : int
+        Maximum number of iterations (default: 100)
+    tolerance : float
+        Largest allowed offset of a reused sample, in pixels of the new
+        frame, between 0 (no reuse) and 1. Sub-pixel values keep the image
+        sharp; 0.75 reuses around 90% of the pixels of a steady zoom
+        (default: 0.75)
+    kind : str
+        ``'mandelbrot'`` or ``'julia'`` (default: ``'mandelbrot'``)
+    c : complex
+        Julia set parameter (ignored for the Mandelbrot set)
+    interior : bool
+        Enable cardioid/bulb rejection and cycle detection
+    periodicity_tol : float
+        Cycle detection tolerance when ``interior`` is enabled
+    backend : str, optional
+        Escape-time kernel to use (default: 'numpy')
+
+    Attributes
+    ----------
+    computed_pixels, total_pixels : int
+        Pixels actually iterated and pixels rendered since creation.
+    """
+
+    def __init__(self, width, height, max_iter=100, tolerance=0.75, kind='mandelbrot',
+                 c=0j, interior=False, periodicity_tol=1e-10, backend=None):
+        if not 0 <= tolerance <= 1:
+            raise ValueError("tolerance must be between 0 and 1 pixel")
+        self.width = width
+        self.height = height
+        self.max_iter = max_iter
+        self.tolerance = tolerance
+        self.kind = kind
+        self.c = c
+        self.interior = interior
+        self.periodicity_tol = periodicity_tol
+        self.backend = backend
+        self.computed_pixels = 0
+        self.total_pixels = 0
+        self._xs = None
+        self._ys = None
+        self._divtime = None
+
+    def _compute(self, xs, ys):
+        grid = xs + 1j * ys
+        kernel = get_backend(self.backend)
+        periodicity_tol = self.periodicity_tol if self.interior else None
+        self.computed_pixels += grid.size
+        if self.kind == 'mandelbrot':
+            interior = mandelbrot_interior(grid) if self.interior else None
+            return kernel(np.zeros_like(grid), grid, self.max_iter,
+                          interior=interior, periodicity_tol=periodicity_tol)
+        return kernel(grid, self.c, self.max_iter, periodicity_tol=periodicity_tol)
+
+    def reset(self):
+        """Forget the previous frame so the next one is computed in full."""
+        self._xs = self._ys = self._divtime = None
+
+    def render(self, viewport):
+        """Render ``(x_min, x_max, y_min, y_max)``, reusing the last frame."""
+        x_min, x_max, y_min, y_max = viewport
+        x = np.linspace(x_min, x_max, self.width)
+        y = np.linspace(y_min, y_max, self.height)
+        self.total_pixels += self.width * self.height
+
+        if self._divtime is None:
+            self._xs, self._ys = x, y
+            self._divtime = self._compute(x[np.newaxis, :], y[:, np.newaxis])
+            return self._divtime.copy()
+
+        dx = (x_max - x_min) / max(self.width - 1, 1)
+        dy = (y_max - y_min) / max(self.height - 1, 1)
+        col_map = _match_samples(self._xs, x, dx, self.tolerance)
+        row_map = _match_samples(self._ys, y, dy, self.tolerance)
+        cols_ok, rows_ok = col_map >= 0, row_map >= 0
+
+        # Reused samples keep their exact coordinates
+        xs = np.where(cols_ok, self._xs[col_map], x)
+        ys = np.where(rows_ok, self._ys[row_map], y)
+
+        divtime = np.empty((self.height, self.width), dtype=self._divtime.dtype)
+        if rows_ok.any() and cols_ok.any():
+            divtime[np.ix_(rows_ok, cols_ok)] = \
+                self._divtime[np.ix_(row_map[rows_ok], col_map[cols_ok])]
+        missing = ~(rows_ok[:, np.newaxis] & cols_ok[np.newaxis, :])
+        if missing.any():
+            rows, cols = np.nonzero(missing)
+            divtime[rows, cols] = self._compute(xs[cols], ys[rows])
+
+        self._xs, self._ys, self._divtime = xs, ys, divtime
+        return divtime.copy()
+
+    def frames(self, keyframes, frames_per_segment=60):
+        """Yield ``(viewport, divtime)`` for an interpolated zoom sequence."""
+        for viewport in interpolate_viewports(keyframes, frames_per_segment):
+            yield viewport, self.render(viewport)
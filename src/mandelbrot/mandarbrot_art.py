@@ -1,7 +1,22 @@
+import os
+import sys
+
 import numpy as np
 import matplotlib.pyplot as plt
 
+if __name__ == "__main__":
+    # Run as a script: make the repository root importable
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.equations.parallel import render_viewport
+
 def mandelbrot(c, max_iter):
+    """Iteration count of a single point, in pure Python.
+
+    Kept as the scalar reference for tests; ``mandelbrot_set`` uses the
+    shared escape-time kernel. Escaping points return the kernel's escape
+    time plus one, the others ``max_iter``.
+    """
     z = 0
     n = 0
     while abs(z) <= 2 and n < max_iter:
@@ -12,7 +27,9 @@ def mandelbrot(c, max_iter):
 def mandelbrot_set(xmin, xmax, ymin, ymax, width, height, max_iter):
     r1 = np.linspace(xmin, xmax, width)
     r2 = np.linspace(ymin, ymax, height)
-    return (r1, r2, np.array([[mandelbrot(complex(r, i), max_iter) for r in r1] for i in r2]))
+    divtime = render_viewport('mandelbrot', (xmin, xmax), (ymin, ymax), width, height, max_iter)
+    # Count the escaping iteration itself, as ``mandelbrot`` does
+    return (r1, r2, np.where(divtime < max_iter, divtime + 1, max_iter))
 
 def display_mandelbrot(xmin, xmax, ymin, ymax, width, height, max_iter):
     r1, r2, mandelbrot_image = mandelbrot_set(xmin, xmax, ymin, ymax, width, height, max_iter)
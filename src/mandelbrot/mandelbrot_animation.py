@@ -1,30 +1,41 @@
+import os
+import sys
+
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
 from matplotlib.colors import LinearSegmentedColormap
 
+if __name__ == "__main__":
+    # Run as a script: make the repository root importable
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.equations.escape_time import escape_state, fractal_spec
+from src.equations.imaging import PALETTES
+
 def create_custom_colormap():
     """Create a custom colormap for the visualization."""
-    colors = ['#000000', '#1a1a2e', '#16213e', '#0f3460', '#533483', '#e94560']
-    return LinearSegmentedColormap.from_list('custom', colors)
+    return LinearSegmentedColormap.from_list('custom', PALETTES['custom'])
 
-def generate_mandelbrot_frame(width, height, max_iter, current_iter):
-    """Generate a single frame of the Mandelbrot set animation."""
-    x = np.linspace(-2, 1, width)
-    y = np.linspace(-1.5, 1.5, height)
-    X, Y = np.meshgrid(x, y)
-    c = X + 1j * Y
-    z = np.zeros_like(c)
-    divtime = max_iter + np.zeros(z.shape, dtype=int)
+def create_render_state(width, height, max_iter):
+    """Create the resumable iteration state the animation advances."""
+    return escape_state(fractal_spec('mandelbrot', (-2, 1), (-1.5, 1.5),
+                                     width, height, max_iter))
 
-    for i in range(current_iter):
-        z = z**2 + c
-        diverge = z*np.conj(z) > 2**2
-        div_now = diverge & (divtime == max_iter)
-        divtime[div_now] = i
-        z[diverge] = 2
+def generate_mandelbrot_frame(width, height, max_iter, current_iter, state=None):
+    """Generate a single frame of the Mandelbrot set animation.
 
-    return divtime
+    Pass the ``state`` from ``create_render_state`` to continue from the
+    previous frame instead of iterating from scratch. States only move
+    forward: when ``current_iter`` is behind ``state``, the frame is
+    rendered from a fresh state and ``state`` is left as it was, so the
+    caller should replace it with a new ``create_render_state`` (as
+    ``main`` does) to keep frames incremental.
+    """
+    if state is None or state.iteration > current_iter:
+        state = create_render_state(width, height, max_iter)
+    state.advance(current_iter - state.iteration)
+    return state.divtime.copy()
 
 def main():
     # Set up the figure
@@ -51,10 +62,17 @@ def main():
     # Add iteration counter
     iter_text = ax.text(0.02, 0.95, '', transform=ax.transAxes, color='white')
     
+    # Each frame advances the previous one by a single iteration
+    state = create_render_state(width, height, max_iter)
+    
     def update(frame):
         """Update function for the animation."""
+        nonlocal state
+        if state.iteration > frame:
+            state = create_render_state(width, height, max_iter)
+        
         # Generate frame
-        divtime = generate_mandelbrot_frame(width, height, max_iter, frame)
+        divtime = generate_mandelbrot_frame(width, height, max_iter, frame, state)
         
         # Update image
         img.set_array(divtime)
@@ -1,30 +1,30 @@
-import numpy as np
+import os
+import sys
+
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
 from matplotlib.colors import LinearSegmentedColormap
 
+if __name__ == "__main__":
+    # Run as a script: make the repository root importable
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.equations.imaging import PALETTES
+from src.equations.parallel import render_viewport
+from src.equations.zoom import ZoomSequenceRenderer
+
 def create_custom_colormap():
     """Create a custom colormap for the visualization."""
-    colors = ['#000000', '#1a1a2e', '#16213e', '#0f3460', '#533483', '#e94560']
-    return LinearSegmentedColormap.from_list('custom', colors)
+    return LinearSegmentedColormap.from_list('custom', PALETTES['custom'])
 
-def generate_mandelbrot(width, height, x_min, x_max, y_min, y_max, max_iter=100):
-    """Generate a Mandelbrot set for given coordinates."""
-    x = np.linspace(x_min, x_max, width)
-    y = np.linspace(y_min, y_max, height)
-    X, Y = np.meshgrid(x, y)
-    c = X + 1j * Y
-    z = np.zeros_like(c)
-    divtime = max_iter + np.zeros(z.shape, dtype=int)
+def generate_mandelbrot(width, height, x_min, x_max, y_min, y_max, max_iter=100,
+                        workers=None):
+    """Generate a Mandelbrot set for given coordinates.
 
-    for i in range(max_iter):
-        z = z**2 + c
-        diverge = z*np.conj(z) > 2**2
-        div_now = diverge & (divtime == max_iter)
-        divtime[div_now] = i
-        z[diverge] = 2
-
-    return divtime
+    Pass ``workers`` to render tiles on that many processes.
+    """
+    return render_viewport('mandelbrot', (x_min, x_max), (y_min, y_max), width, height,
+                           max_iter, workers)
 
 def main():
     # Set up the figure
@@ -68,29 +68,30 @@ def main():
     # Add zoom level counter
     zoom_text = ax.text(0.02, 0.95, '', transform=ax.transAxes, color='white')
     
-    def update(frame):
+    # Smoothly interpolated frames, each reusing most of the previous one
+    frames_per_segment = 30
+    renderer = ZoomSequenceRenderer(width, height, max_iter)
+    sequence = renderer.frames(zoom_path, frames_per_segment)
+    initial_width = zoom_path[0]['x_max'] - zoom_path[0]['x_min']
+    
+    def update(item):
         """Update function for the animation."""
-        # Get current zoom parameters
-        current = zoom_path[frame]
-        
-        # Generate frame
-        divtime = generate_mandelbrot(width, height,
-                                    current['x_min'], current['x_max'],
-                                    current['y_min'], current['y_max'])
+        # Get current zoom parameters and the rendered frame
+        (x_min, x_max, y_min, y_max), divtime = item
         
         # Update image
         img.set_array(divtime)
-        img.set_extent([current['x_min'], current['x_max'],
-                       current['y_min'], current['y_max']])
+        img.set_extent([x_min, x_max, y_min, y_max])
         
         # Update zoom level counter
-        zoom_text.set_text(f'Zoom Level: {current["zoom"]}x')
+        zoom_text.set_text(f'Zoom: {initial_width / (x_max - x_min):.0f}x')
         
         return [img, zoom_text]
     
     # Create animation
-    anim = FuncAnimation(fig, update, frames=len(zoom_path),
-                        interval=2000, blit=True)  # 2 seconds per frame
+    anim = FuncAnimation(fig, update, frames=sequence,
+                        save_count=frames_per_segment * (len(zoom_path) - 1) + 1,
+                        interval=50, blit=True)
     
     plt.tight_layout()
     plt.show()
@@ -9,24 +9,16 @@ from ..equations import (
     Spiral,
     LissajousCurve
 )
+from ..equations.imaging import PALETTES
+from ..equations.parallel import render_viewport
 
-def generate_mandelbrot(width, height, max_iter=100):
-    """Generate a Mandelbrot set fractal."""
-    x = np.linspace(-2, 1, width)
-    y = np.linspace(-1.5, 1.5, height)
-    X, Y = np.meshgrid(x, y)
-    c = X + 1j * Y
-    z = np.zeros_like(c)
-    divtime = max_iter + np.zeros(z.shape, dtype=int)
+def generate_mandelbrot(width, height, max_iter=100, workers=None):
+    """Generate a Mandelbrot set fractal.
 
-    for i in range(max_iter):
-        z = z**2 + c
-        diverge = z*np.conj(z) > 2**2
-        div_now = diverge & (divtime == max_iter)
-        divtime[div_now] = i
-        z[diverge] = 2
-
-    return divtime
+    Pass ``workers`` to render tiles on that many processes.
+    """
+    return render_viewport('mandelbrot', (-2, 1), (-1.5, 1.5), width, height, max_iter,
+                           workers)
 
 def generate_parametric_flower():
     """Generate a parametric flower pattern."""
@@ -45,25 +37,15 @@ def generate_lissajous_curve(a=3, b=2, delta=np.pi/2):
 
 def create_custom_colormap():
     """Create a custom colormap for the visualizations."""
-    colors = ['#000000', '#1a1a2e', '#16213e', '#0f3460', '#533483', '#e94560']
-    return LinearSegmentedColormap.from_list('custom', colors)
-
-def generate_julia_set(width, height, c=-0.7 + 0.27j, max_iter=100):
-    """Generate a Julia set fractal."""
-    x = np.linspace(-2, 2, width)
-    y = np.linspace(-2, 2, height)
-    X, Y = np.meshgrid(x, y)
-    z = X + 1j * Y
-    divtime = max_iter + np.zeros(z.shape, dtype=int)
+    return LinearSegmentedColormap.from_list('custom', PALETTES['custom'])
 
-    for i in range(max_iter):
-        z = z**2 + c
-        diverge = z*np.conj(z) > 2**2
-        div_now = diverge & (divtime == max_iter)
-        divtime[div_now] = i
-        z[diverge] = 2
+def generate_julia_set(width, height, c=-0.7 + 0.27j, max_iter=100, workers=None):
+    """Generate a Julia set fractal.
 
-    return divtime
+    Pass ``workers`` to render tiles on that many processes.
+    """
+    return render_viewport('julia', (-2, 2), (-2, 2), width, height, max_iter, workers,
+                           c=c)
 
 def generate_heart_curve():
     """Generate a heart-shaped curve."""
@@ -0,0 +1,47 @@
+import pytest
+
+from benchmarks import run_suite
+
+
+def _results(**best):
+    return {'results': {name: {'best': value} for name, value in best.items()}}
+
+
+def test_compare_flags_regressions():
+    """Only benchmarks slower than the threshold and in the baseline regress."""
+    baseline = _results(steady=1.0, slower=1.0, removed=1.0)
+    current = _results(steady=1.2, slower=2.0, added=5.0)
+    assert run_suite.compare(current, baseline, 1.5) == ['slower']
+    assert run_suite.compare(current, baseline, 2.5) == []
+    assert run_suite.compare(_results(added=5.0), baseline, 1.5) == []
+
+
+def test_compare_without_baseline_fails_early(tmp_path, monkeypatch, capsys):
+    """A missing baseline is reported before any benchmark runs."""
+    def run(*args, **kwargs):
+        raise AssertionError("benchmarks ran without a baseline")
+
+    monkeypatch.setattr(run_suite, 'run', run)
+    missing = tmp_path / 'baseline.json'
+    with pytest.raises(SystemExit) as exit_info:
+        run_suite.main(['--compare', '--baseline', str(missing)])
+    assert exit_info.value.code == 2
+    assert f"no baseline at {missing}" in capsys.readouterr().err
+
+
+def test_compare_reruns_suspects(tmp_path, monkeypatch):
+    """Regressions are measured again and only fail the run if they persist."""
+    baseline = tmp_path / 'baseline.json'
+    baseline.write_text('{"results": {"case": {"best": 1.0}, "other": {"best": 1.0}}}')
+    for rerun_time, status in ((1.1, 0), (3.0, 1)):
+        calls = []
+
+        def run(pattern=None, names=None):
+            calls.append(names)
+            if names is None:
+                return _results(case=3.0, other=1.0)
+            return _results(**{name: rerun_time for name in names})
+
+        monkeypatch.setattr(run_suite, 'run', run)
+        assert run_suite.main(['--compare', '--baseline', str(baseline)]) == status
+        assert calls == [None, ['case']], "Suspects were not re-run on their own"
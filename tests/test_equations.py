@@ -1,11 +1,22 @@
 import numpy as np
 import matplotlib.pyplot as plt
+import pytest
 from src.equations import (
+    POINT_CACHE,
+    PointCache,
+    CURVE_EXPRESSIONS,
+    CurveFamily,
+    ExpressionCurve,
+    ExpressionPlan,
+    adaptive_sample,
+    affine_matrices,
     Circle,
     Spiral,
     RoseCurve,
     HeartCurve,
     LissajousCurve,
+    ButterflyCurve,
+    Canvas,
     MandelbrotSet,
     JuliaSet
 )
@@ -70,6 +81,193 @@ def test_transformations():
     
     print("All transformations test passed!")
 
+def test_memoized_points():
+    """Points are built lazily, memoized per parameters and read-only."""
+    circle = Circle(radius=3.0, num_points=500)
+    assert '_t' not in vars(circle), "t was built eagerly"
+    x, y = circle.generate_points()
+    assert circle.generate_points()[0] is x, "Second call was not memoized"
+    assert Circle(radius=3.0, num_points=500).generate_points()[0] is x
+    with pytest.raises(ValueError):
+        x *= 2
+    x_t, _ = circle.transform(scale=2.0, translation=(1, 0))
+    assert np.array_equal(x_t, 2 * x + 1) and np.max(x) == 3.0
+
+    circle.radius = 1.0
+    assert np.max(circle.generate_points()[0]) == 1.0, "Attribute change was not seen"
+    circle.num_points = 10
+    assert len(circle.t) == 10 and len(circle.generate_points()[0]) == 10
+    assert MandelbrotSet(width=20, height=20).cache_points is False
+
+    cache = PointCache(max_memory=3 * 800)
+    for k in range(4):
+        cache.put(k, (np.zeros(50), np.zeros(50)))
+    assert cache.get(0) is None and cache.get(3) is not None
+    assert len(cache) == 3 and cache.nbytes == 3 * 800
+    assert POINT_CACHE.stats['hits'] > 0
+
+    class ListCircle(Circle):
+        def evaluate(self, t):
+            return list(np.cos(t)), list(np.sin(t))
+
+    x, y = ListCircle(num_points=20).generate_points()
+    assert len(x) == 20 and np.allclose(np.hypot(x, y), 1.0), \
+        "List results were not passed through"
+
+def test_batched_transforms():
+    """A stack of matrices matches one transform call per matrix."""
+    rose = RoseCurve(n=5, d=8, num_points=300)
+    angles = np.linspace(0, 2*np.pi, 12, endpoint=False)
+    offsets = np.stack([np.cos(angles), np.sin(angles)], axis=1)
+    matrices = affine_matrices(0.5, angles, offsets)
+    out = np.empty((12, 300, 2))
+    assert rose.transform_batch(matrices, out=out) is out
+    for k in range(12):
+        x, y = rose.transform(scale=0.5, rotation=angles[k], translation=offsets[k])
+        assert np.allclose(out[k, :, 0], x) and np.allclose(out[k, :, 1], y)
+
+    assert np.array_equal(rose.transform_batch(matrices[:, :2]), out)
+    projective = np.eye(3)
+    projective[2] = (0, 0, 2)
+    assert np.allclose(rose.transform_batch(projective)[0], np.stack(rose.generate_points(), 1) / 2)
+    with pytest.raises(ValueError):
+        rose.transform_batch(matrices, out=np.empty((12, 299, 2)))
+
+def _chord_error(curve, t, samples=8):
+    """Largest distance of curve points inside each interval from its chord."""
+    x, y = curve.evaluate(t)
+    f = np.linspace(0, 1, samples + 2)[1:-1]
+    cx, cy = curve.evaluate(t[:-1, np.newaxis] + np.diff(t)[:, np.newaxis] * f)
+    dx, dy = np.diff(x)[:, np.newaxis], np.diff(y)[:, np.newaxis]
+    wx, wy = cx - x[:-1, np.newaxis], cy - y[:-1, np.newaxis]
+    s = np.clip((wx*dx + wy*dy) / (dx**2 + dy**2), 0, 1)
+    return np.hypot(wx - s*dx, wy - s*dy).max()
+
+def test_adaptive_sampling():
+    """Adaptive samples meet the chordal tolerance with fewer points than uniform ones."""
+    butterfly = ButterflyCurve(amplitude=2.0, t_range=(0, 12*np.pi))
+    t, x, y = adaptive_sample(butterfly.evaluate, butterfly.t_range, 1e-3)
+    assert np.all(np.diff(t) > 0) and len(t) < 5000
+    assert _chord_error(butterfly, t) < 1.1e-3
+
+    spiral = Spiral(growth_rate=1.5, t_range=(0, 8*np.pi))
+    t, _, _ = adaptive_sample(spiral.evaluate, spiral.t_range, 1e-3)
+    assert _chord_error(spiral, t) < 1.1e-3
+    assert _chord_error(spiral, np.linspace(*spiral.t_range, len(t))) > 1.5e-3
+
+    x, y = Circle(radius=100.0).adaptive_points(tolerance=0.5, pixels=(200, 200))
+    # Half a pixel allows chords of about 0.2 rad on a 100 pixel radius
+    assert 32 <= len(x) < 48
+    with pytest.raises(ValueError):
+        adaptive_sample(lambda t: (np.zeros(3), np.zeros(3)), (0, 1), 0.1)
+
+def test_curve_families():
+    """Broadcast families match the individual curves, in any chunking."""
+    a, b, delta = np.arange(1, 5), np.arange(1, 4), np.linspace(0, np.pi, 5)
+    family = CurveFamily.grid(LissajousCurve, num_points=200, a=a, b=b, delta=delta)
+    assert family.shape == (4, 3, 5) and len(family) == 60
+    x, y = family.evaluate()
+    assert x.shape == (60, 200)
+    for k in (0, 17, 59):
+        i, j, m = np.unravel_index(k, family.shape)
+        curve = LissajousCurve(a=a[i], b=b[j], delta=delta[m], num_points=200)
+        assert np.allclose(x[k], curve.generate_points()[0])
+        assert np.allclose(y[k], curve.generate_points()[1])
+
+    chunks = list(family.chunks(chunk_size=20))
+    assert [start for start, _, _ in chunks] == [0, 15, 30, 45]
+    assert np.array_equal(np.concatenate([cx for _, cx, _ in chunks]), x)
+    out = (np.empty((60, 200)), np.empty((60, 200)))
+    assert family.evaluate(chunk_size=7, out=out) is out and np.array_equal(out[1], y)
+
+    spirals = CurveFamily(Spiral, growth_rate=np.linspace(0.5, 2, 10), num_points=50)
+    assert np.allclose(spirals.evaluate()[0][3], spirals.variant(3).generate_points()[0])
+    with pytest.raises(ValueError):
+        family.evaluate(out=(np.empty((60, 199)), np.empty((60, 199))))
+
+def test_expression_curves():
+    """Expression curves reproduce the built-ins and reject unsafe input."""
+    import src.equations as equations
+    for name, (x, y, params) in CURVE_EXPRESSIONS.items():
+        builtin = getattr(equations, name)(num_points=300, **params)
+        curve = ExpressionCurve(x, y, num_points=300, **params)
+        assert np.allclose(curve.generate_points(), builtin.generate_points(), atol=1e-12)
+
+    # sin(t)**3, sin(t)**5 and the shared factor of the butterfly are computed once
+    assert len(ExpressionCurve(*CURVE_EXPRESSIONS['ButterflyCurve'][:2], amplitude=1)
+               .plan()) < 20
+    plan = ExpressionPlan(['a*sin(t)**2 + cos(t)', 'cos(t) - 2**3'], inputs=('t', 'a'))
+    t = np.linspace(0, 1, 7)
+    for _ in range(2):
+        x, y = plan(t, np.array([[1.0], [2.0]]))
+        assert x.shape == y.shape == (2, 7)
+        assert np.allclose(x[1], 2*np.sin(t)**2 + np.cos(t)) and np.allclose(y[0], np.cos(t) - 8)
+
+    # Curves sharing a plan can be evaluated from several threads at once
+    from concurrent.futures import ThreadPoolExecutor
+    x_expr, y_expr, _ = CURVE_EXPRESSIONS['ButterflyCurve']
+    curves = [ExpressionCurve(x_expr, y_expr, amplitude=a) for a in (1.0, 3.0)]
+    t = np.linspace(0, 12*np.pi, 100_000)
+    expected = [curve.evaluate(t) for curve in curves]
+    with ThreadPoolExecutor(4) as pool:
+        results = list(pool.map(lambda k: curves[k % 2].evaluate(t), range(40)))
+    assert all(np.array_equal(result[0], expected[k % 2][0])
+               and np.array_equal(result[1], expected[k % 2][1])
+               for k, result in enumerate(results))
+
+    Rose = ExpressionCurve.define('Rose', 'cos(n/d*t)*cos(t)', 'cos(n/d*t)*sin(t)', n=5, d=8)
+    rose = Rose(n=7, num_points=100)
+    assert np.allclose(rose.generate_points(), RoseCurve(n=7, num_points=100).generate_points())
+    roses = CurveFamily(Rose, n=np.arange(1, 4), num_points=100)
+    assert np.allclose(roses.evaluate()[0][2], RoseCurve(n=3, num_points=100).generate_points()[0])
+    with pytest.raises(TypeError):
+        Rose(k=2)
+
+    for bad in ["__import__('os')", "t.real", "foo(t)", "sin(t, t)", "t[0]", "lambda: t",
+                "a + t", "1 +", "'t'"]:
+        with pytest.raises(ValueError):
+            ExpressionPlan([bad])
+    with pytest.raises(ValueError):
+        ExpressionCurve('t', 't', evaluate=1)
+
+def test_canvas_rasterizer():
+    """Strokes and fills cover the right pixels with anti-aliased edges."""
+    canvas = Canvas((0, 100), (0, 100), 100, 100)
+    canvas.stroke([10, 90], [50.5, 50.5], width=3)
+    assert np.allclose(canvas.rgb[48:51, 20], 1) and np.all(canvas.rgb[[47, 51], 20] == 0)
+    canvas = Canvas((0, 100), (0, 100), 100, 100).stroke([10, 90], [50.25, 50.25], width=2)
+    assert 0 < canvas.rgb[48, 50, 0] < 1 and canvas.rgb[49, 50, 0] == 1
+
+    # Added strokes deposit their area and brighten where they overlap
+    glow = Canvas((0, 100), (0, 100), 100, 100)
+    glow.stroke([10, 90], [50, 50], width=2, mode='add').stroke([50, 50], [10, 90], mode='add')
+    assert np.isclose(glow.density.sum(), 80*2 + 80*1, rtol=1e-4)
+    assert glow.rgb[50, 50, 0] > glow.rgb[50, 30, 0]
+
+    # Per-vertex colours follow the values along the line
+    ramp = Canvas((0, 100), (0, 100), 100, 100)
+    ramp.stroke([10, 90], [50, 50], width=4, values=[0, 1], colormap=['#ff0000', '#0000ff'])
+    assert ramp.rgb[50, 12, 0] > 0.9 and ramp.rgb[50, 88, 2] > 0.9
+    assert ramp.image().dtype == np.uint8 and ramp.image().shape == (100, 100, 3)
+
+    # Even-odd fill: exact area, empty centre of a pentagram
+    square = Canvas((0, 100), (0, 100), 100, 100).fill([20.3, 80.3, 80.3, 20.3],
+                                                        [20.6, 20.6, 80.6, 80.6])
+    assert np.isclose(square.rgb[..., 0].sum(), 3600, rtol=1e-5)
+    angle = np.pi/2 + np.arange(5) * 4*np.pi/5
+    star = Canvas((-1, 1), (-1, 1), 200, 200).fill(np.cos(angle), np.sin(angle))
+    assert star.rgb[100, 100, 0] == 0 and star.rgb[30, 100, 0] == 1
+
+    # Dense samplings draw the same curve as coarse ones
+    dense, coarse = Circle(num_points=200_000), Circle(num_points=400)
+    images = [Canvas((-1.2, 1.2), (-1.2, 1.2), 120, 120).stroke(*c.generate_points(), width=2)
+              .image().astype(int) for c in (dense, coarse)]
+    assert np.abs(images[0] - images[1]).max() <= 8
+    with pytest.raises(ValueError):
+        canvas.stroke([0, 1], [0, 1], mode='multiply')
+    with pytest.raises(ValueError):
+        canvas.fill([0, 1, 1], [0, 0, 1], color='red')
+
 def visualize_results():
     """Visualize the results of all equations."""
     # Set up the figure
@@ -0,0 +1,524 @@
+import numpy as np
+import pytest
+from src.equations import (
+    BarnsleyFern,
+    DensityHistogram,
+    DeepZoomMandelbrot,
+    DragonCurve,
+    EscapeTimeState,
+    GosperCurve,
+    HilbertCurve,
+    KochSnowflake,
+    LSystem,
+    SierpinskiIFS,
+    SierpinskiTriangle,
+    ZoomSequenceRenderer,
+    available_backends,
+    get_backend,
+    MandelbrotSet,
+    JuliaSet,
+    TileCache,
+    active_recorder,
+    instrument,
+    julia_batch,
+    build_pyramid,
+    band_height,
+    divtime_dtype,
+    colorize,
+    export_images,
+    complex_grid,
+    escape_region,
+    escape_time,
+    fractal_spec,
+    interpolate_viewports,
+    mandelbrot_interior,
+    perturbation_escape_time,
+    reference_orbit,
+    render_parallel
+)
+from src.math_art.math_art import generate_julia_set, generate_mandelbrot
+from src.mandelbrot.mandarbrot_art import mandelbrot, mandelbrot_set
+from src.mandelbrot.mandelbrot_zoom import generate_mandelbrot as generate_zoom_frame
+from src.mandelbrot.mandelbrot_animation import create_render_state, generate_mandelbrot_frame
+from src.equations import backends, snap_viewport
+
+
+def reference_escape_time(z, c, max_iter):
+    """Full-frame escape-time loop the optimized kernels must reproduce."""
+    z = np.array(z, dtype=complex)
+    divtime = max_iter + np.zeros(z.shape, dtype=int)
+    for i in range(max_iter):
+        z = z**2 + c
+        diverge = z*np.conj(z) > 2**2
+        div_now = diverge & (divtime == max_iter)
+        divtime[div_now] = i
+        z[diverge] = 2
+    return divtime
+
+
+def test_escape_time_matches_reference():
+    """The compacted kernel must be bit-identical to the full-frame loop."""
+    c = complex_grid((-2, 1), (-1.5, 1.5), 160, 120)
+    expected = reference_escape_time(np.zeros_like(c), c, 80)
+    result = escape_time(np.zeros_like(c), c, 80)
+    assert result.dtype == expected.dtype, "Escape-time dtype changed"
+    assert np.array_equal(result, expected), "Mandelbrot escape times differ"
+
+    z = complex_grid((-2, 2), (-2, 2), 150, 130)
+    expected = reference_escape_time(z, -0.7 + 0.27j, 80)
+    assert np.array_equal(escape_time(z, -0.7 + 0.27j, 80), expected), \
+        "Julia escape times differ"
+
+
+def test_fractal_classes_use_kernel():
+    """Fractal classes and generate_mandelbrot return the reference output."""
+    c = complex_grid((-2, 1), (-1.5, 1.5), 90, 70)
+    expected = reference_escape_time(np.zeros_like(c), c, 50)
+    assert np.array_equal(MandelbrotSet(width=90, height=70, max_iter=50).evaluate(None), expected)
+    assert np.array_equal(generate_mandelbrot(90, 70, max_iter=50), expected)
+
+    z = complex_grid((-2, 2), (-2, 2), 90, 70)
+    expected = reference_escape_time(z, -0.8 + 0.156j, 50)
+    julia = JuliaSet(width=90, height=70, c=-0.8 + 0.156j, max_iter=50)
+    assert np.array_equal(julia.evaluate(None), expected)
+
+
+def test_interior_shortcuts():
+    """Cardioid/bulb rejection and cycle detection keep the same image."""
+    inside = mandelbrot_interior(np.array([0, -1, -0.1 + 0.1j, 0.3, -1.3, 1j]))
+    assert inside.tolist() == [True, True, True, False, False, False], "Interior test failed"
+
+    plain = MandelbrotSet(width=120, height=100, max_iter=400).evaluate(None)
+    fast = MandelbrotSet(width=120, height=100, max_iter=400, interior=True).evaluate(None)
+    assert np.array_equal(plain, fast), "Interior acceleration changed the Mandelbrot set"
+
+    plain = JuliaSet(width=100, height=100, c=-0.12 + 0.75j, max_iter=300).evaluate(None)
+    fast = JuliaSet(width=100, height=100, c=-0.12 + 0.75j, max_iter=300, interior=True).evaluate(None)
+    assert np.array_equal(plain, fast), "Cycle detection changed the Julia set"
+
+
+def test_parallel_render_matches_serial():
+    """Tiled multi-process renders are identical to single-process ones."""
+    spec = fractal_spec('mandelbrot', (-2, 1), (-1.5, 1.5), 130, 90, 60, interior=True)
+    expected = MandelbrotSet(width=130, height=90, max_iter=60, interior=True).evaluate(None)
+    assert np.array_equal(render_parallel(spec, workers=2, tile_size=32), expected)
+
+    julia = JuliaSet(width=100, height=80, max_iter=60)
+    parallel = JuliaSet(width=100, height=80, max_iter=60, workers=2)
+    assert np.array_equal(parallel.evaluate(None), julia.evaluate(None))
+
+    zoom = generate_zoom_frame(64, 48, -0.8, -0.4, 0.1, 0.5, max_iter=80)
+    assert np.array_equal(generate_zoom_frame(64, 48, -0.8, -0.4, 0.1, 0.5, max_iter=80,
+                                              workers=2), zoom)
+    assert np.array_equal(generate_mandelbrot(64, 48, max_iter=40, workers=2),
+                          generate_mandelbrot(64, 48, max_iter=40))
+
+
+def test_backends_conform_to_reference():
+    """Every available backend reproduces the NumPy reference kernel."""
+    assert 'numpy' in available_backends(), "Reference backend missing"
+    c = complex_grid((-2, 1), (-1.5, 1.5), 150, 110)
+    z = complex_grid((-2, 2), (-2, 2), 120, 120)
+    cases = [
+        (np.zeros_like(c), c, {}),
+        (np.zeros_like(c), c, {'interior': mandelbrot_interior(c), 'periodicity_tol': 1e-10}),
+        (z, -0.7 + 0.27j, {}),
+    ]
+    for name in available_backends():
+        kernel = get_backend(name)
+        for z0, c0, kwargs in cases:
+            expected = escape_time(z0, c0, 120, **kwargs)
+            result = kernel(z0, c0, 120, **kwargs)
+            assert result.shape == expected.shape and result.dtype == expected.dtype, name
+            # Compiled kernels may fuse multiply-adds, which can move a
+            # handful of pixels right on the boundary
+            mismatch = np.count_nonzero(result != expected) / expected.size
+            assert mismatch <= 1e-3, f"Backend {name!r} disagrees on {mismatch:.2%} of pixels"
+
+
+def test_missing_backend_falls_back(monkeypatch):
+    """Unavailable optional backends fall back to the preferred one."""
+    monkeypatch.setitem(backends._BACKENDS, 'missing',
+                        {'kernel': None, 'priority': 100, 'available': False})
+    with pytest.warns(RuntimeWarning):
+        kernel = get_backend('missing')
+    assert kernel is get_backend(available_backends()[0])
+    # Only the reference kernel is bit-identical, so it stays the default
+    assert get_backend() is escape_time
+    with pytest.raises(ValueError):
+        get_backend('no-such-backend')
+
+    fractal = MandelbrotSet(width=40, height=30, max_iter=30, backend='numpy')
+    assert np.array_equal(fractal.evaluate(None), generate_mandelbrot(40, 30, max_iter=30))
+
+
+def test_resumable_escape_state():
+    """Advancing in steps and deepening match fresh renders."""
+    c = complex_grid((-2, 1), (-1.5, 1.5), 80, 60)
+    state = EscapeTimeState(np.zeros_like(c), c, 60)
+    for _ in range(6):
+        state.advance(10)
+    assert state.done and state.iteration == 60
+    assert np.array_equal(state.divtime, escape_time(np.zeros_like(c), c, 60))
+    assert state.active.sum() == np.count_nonzero(state.divtime == 60)
+
+    state.deepen(150).advance()
+    assert np.array_equal(state.divtime, escape_time(np.zeros_like(c), c, 150)), \
+        "Deepened render differs from a fresh one"
+
+    fractal = MandelbrotSet(width=80, height=60, max_iter=40, interior=True)
+    fractal.deepen(40)
+    deeper = fractal.deepen(200)
+    assert fractal.max_iter == 200
+    assert np.array_equal(deeper, MandelbrotSet(width=80, height=60, max_iter=200).evaluate(None))
+
+
+def test_animation_frames_advance_incrementally():
+    """Animation frames built from one state match from-scratch frames."""
+    c = complex_grid((-2, 1), (-1.5, 1.5), 60, 50)
+    state = create_render_state(60, 50, 30)
+    frames = {}
+    for frame in (1, 2, 3, 10, 30):
+        frames[frame] = divtime = generate_mandelbrot_frame(60, 50, 30, frame, state)
+        expected = escape_time(np.zeros_like(c), c, frame)
+        expected[expected == frame] = 30
+        assert np.array_equal(divtime, expected), f"Frame {frame} differs"
+    assert not np.array_equal(frames[10], frames[30]), "Frames share the state's buffer"
+    assert np.array_equal(generate_mandelbrot_frame(60, 50, 30, 5, state),
+                          generate_mandelbrot_frame(60, 50, 30, 5))
+
+
+def test_zoom_sequence_reuses_exact_samples():
+    """Zoom frames reuse samples within tolerance and stay exact."""
+    keyframes = [
+        {'x_min': -2.0, 'x_max': 1.0, 'y_min': -1.5, 'y_max': 1.5},
+        {'x_min': -0.8, 'x_max': -0.4, 'y_min': 0.1, 'y_max': 0.5},
+    ]
+    viewports = interpolate_viewports(keyframes, frames_per_segment=20)
+    assert len(viewports) == 21
+    assert viewports[0] == (-2.0, 1.0, -1.5, 1.5) and viewports[-1] == (-0.8, -0.4, 0.1, 0.5)
+    widths = [x_max - x_min for x_min, x_max, _, _ in viewports]
+    assert np.allclose(np.diff(np.log(widths)), np.log(widths[1] / widths[0])), \
+        "Zoom is not exponential"
+
+    renderer = ZoomSequenceRenderer(70, 50, max_iter=60, backend='numpy')
+    frames = list(renderer.frames(keyframes, frames_per_segment=20))
+    assert np.array_equal(frames[0][1], generate_zoom_frame(70, 50, -2.0, 1.0, -1.5, 1.5, 60))
+    assert renderer.computed_pixels < renderer.total_pixels / 3, "Too little reuse"
+
+    (x_min, x_max, y_min, y_max), divtime = frames[-1]
+    x, y = np.linspace(x_min, x_max, 70), np.linspace(y_min, y_max, 50)
+    assert np.all(np.abs(renderer._xs - x) < 0.75 * (x[1] - x[0]))
+    assert np.all(np.abs(renderer._ys - y) < 0.75 * (y[1] - y[0]))
+    c = renderer._xs[np.newaxis, :] + 1j * renderer._ys[:, np.newaxis]
+    assert np.array_equal(divtime, escape_time(np.zeros_like(c), c, 60)), \
+        "Reused samples do not match their coordinates"
+
+
+def test_perturbation_matches_direct_render():
+    """Perturbation renders agree with float64 renders at shallow zoom."""
+    orbit = reference_orbit('-1', '0', 50, 30)
+    assert len(orbit) == 51 and np.allclose(orbit[1::2], -1) and np.allclose(orbit[2::2], 0)
+    assert len(reference_orbit('1', '0', 50, 30)) == 4, "Escaping orbit not truncated"
+
+    cx, cy, span, size = -0.7436438870371, 0.1318259042053, 1e-3, 120
+    spec = fractal_spec('mandelbrot', (cx - span / 2, cx + span / 2),
+                        (cy - span / 2, cy + span / 2), size, size, 300, backend='numpy')
+    expected = escape_region(spec)
+    divtime, stats = perturbation_escape_time((str(cx), str(cy)), span, size, size, 300)
+    assert stats['glitched_pixels'] == 0
+    # Only chaotic, high-iteration pixels may differ by rounding
+    assert np.mean(divtime != expected) < 0.005
+
+
+def test_deep_zoom_stays_sharp():
+    """Zooms far below float64 resolution still resolve every pixel."""
+    fractal = DeepZoomMandelbrot(center=('0', '1'), span='1e-40', width=64, height=48,
+                                 max_iter=2000)
+    divtime = fractal.evaluate(None)
+    assert divtime.shape == (48, 64)
+    assert fractal.stats['skipped_iterations'] > 0, "Series approximation unused"
+    assert fractal.stats['glitched_pixels'] == 0
+    # A float64 grid would collapse into identical blocks at this depth
+    assert len(np.unique(divtime)) > 10
+    assert not np.any(np.all(divtime[:, 1:] == divtime[:, :-1], axis=0))
+
+
+def test_subdivision_mode():
+    """Mariani-Silver subdivision fills uniform blocks without changing them."""
+    for fractal_class in (MandelbrotSet, JuliaSet):
+        dense = fractal_class(width=200, height=160, max_iter=200, backend='numpy')
+        fast = fractal_class(width=200, height=160, max_iter=200, backend='numpy',
+                             mode='subdivide', min_block=8)
+        expected = dense.evaluate(None)
+        result = fast.evaluate(None)
+        assert dense.computed_pixels == 200 * 160
+        assert fast.computed_pixels < 0.7 * dense.computed_pixels, "Nothing was filled"
+        assert np.mean(result != expected) < 1e-3, f"{fractal_class.__name__} differs"
+    with pytest.raises(ValueError):
+        MandelbrotSet(mode='sparse')
+
+
+def test_progressive_rendering():
+    """Coarse levels are subsamples of the final image and are reused."""
+    mandelbrot = MandelbrotSet(width=120, height=90, max_iter=80, backend='numpy')
+    expected = mandelbrot.evaluate(None)
+    levels = list(mandelbrot.progressive())
+    assert [factor for factor, _ in levels] == [8, 4, 2, 1]
+    for factor, image in levels:
+        assert image.shape == expected.shape
+        assert np.array_equal(image[::factor, ::factor], expected[::factor, ::factor])
+    assert np.array_equal(levels[-1][1], expected)
+    assert mandelbrot.computed_pixels == 120 * 90, "Samples were computed twice"
+
+    factor, image = mandelbrot.preview(0.0)
+    assert factor == 8, "The coarsest level should always be returned"
+    assert np.array_equal(image[::8, ::8], expected[::8, ::8])
+    with pytest.raises(ValueError):
+        list(mandelbrot.progressive(factors=(1, 2)))
+
+
+def test_tile_cache(tmp_path):
+    """Cached renders equal direct ones, are reused, and survive on disk."""
+    # A viewport already on its lattice, spanning several 32-sample tiles
+    step = 2.0**-6
+    spec = fractal_spec('julia', (-1, -1 + 99 * step), (-0.5, -0.5 + 69 * step),
+                        100, 70, 60, c=-0.7 + 0.27j, backend='numpy')
+    assert snap_viewport(spec) == spec
+    cache = TileCache(directory=tmp_path, tile_size=32)
+    divtime, computed = cache.render(spec)
+    assert np.array_equal(divtime, escape_region(spec)), "Tiles do not join seamlessly"
+    assert computed == 100 * 70, "Samples outside the viewport were computed"
+
+    shifted = dict(spec, x_range=(-1 + 40 * step, -1 + 139 * step))
+    divtime, computed = cache.render(shifted)
+    assert np.array_equal(divtime, escape_region(shifted))
+    assert computed == 40 * 70, "Overlapping samples were not reused"
+    assert cache.render(spec)[1] == 0
+
+    first = JuliaSet(width=100, height=70, max_iter=60, backend='numpy',
+                     tile_cache=TileCache(directory=tmp_path / 'julia'))
+    second = JuliaSet(width=100, height=70, max_iter=60, backend='numpy',
+                      tile_cache=TileCache(directory=tmp_path / 'julia'))
+    assert np.array_equal(first.evaluate(None), second.evaluate(None))
+    assert second.computed_pixels == 0, "The disk tier was not used"
+    assert second.tile_cache.stats['disk_hits'] == first.tile_cache.stats['misses']
+    other_c = dict(spec, c=0.3j)
+    assert cache.render(other_c)[1] == 100 * 70, "Julia c is not part of the key"
+
+    small = TileCache(max_memory=3 * 32 * 32 * 8, directory=tmp_path / 'small',
+                      max_disk=5 * 32 * 32 * 8 + 1000, tile_size=32)
+    small.render(spec)
+    assert len(small._memory) == 3
+    assert sum(f.stat().st_size for f in (tmp_path / 'small').iterdir()) <= small.max_disk
+
+    # Other viewports move by less than half a pixel onto their lattice
+    for width in (300, 400, 1000):
+        view = fractal_spec('mandelbrot', (-2, 1), (-1.5, 1.5), width, 50, 30)
+        snapped = snap_viewport(view)
+        pixel = 3 / (width - 1)
+        assert abs(snapped['x_range'][0] + 2) <= pixel / 2
+        assert abs(snapped['x_range'][1] - snapped['x_range'][0] - 3) <= pixel / 2
+        fractal = MandelbrotSet(width=width, height=50, max_iter=30, tile_cache=TileCache())
+        assert np.array_equal(fractal.evaluate(None), escape_region(snapped))
+        assert fractal.computed_pixels == width * 50
+
+
+def test_colorize_and_export(tmp_path):
+    """Lookup-table colouring matches matplotlib and is written unresampled."""
+    from matplotlib.colors import Normalize
+    from PIL import Image
+    from src.math_art.math_art import create_custom_colormap
+
+    divtime = MandelbrotSet(width=90, height=60, max_iter=50).evaluate(None)
+    rgb = colorize(divtime)
+    assert rgb.shape == (60, 90, 3) and rgb.dtype == np.uint8
+    expected = create_custom_colormap()(Normalize(divtime.min(), divtime.max())(divtime))
+    assert np.abs(rgb.astype(int) - np.round(expected[..., :3] * 255)).max() <= 1
+    assert np.array_equal(colorize(divtime.astype(float)), rgb)
+
+    paths = export_images({'a': divtime, 'b': rgb}, tmp_path)
+    for path in paths:
+        assert np.array_equal(np.asarray(Image.open(path).convert('RGB')), rgb)
+    with pytest.raises(ValueError):
+        colorize(divtime, colormap='nope')
+
+
+def test_memory_bounded_bands():
+    """Band rendering stays within its budget and matches the dense render."""
+    import tracemalloc
+
+    assert divtime_dtype(100) == np.uint16
+    assert divtime_dtype(70000) == np.uint32
+    expected = MandelbrotSet(width=300, height=200, max_iter=100, backend='numpy').evaluate(None)
+    budget = 2 * 2**20
+    mandelbrot = MandelbrotSet(width=300, height=200, max_iter=100, backend='numpy',
+                               interior=True, memory_budget=budget)
+    rows = band_height(mandelbrot._spec(), budget - 300 * 200 * 2)
+    assert 1 < rows < 200
+    starts = [start for start, _ in mandelbrot.bands(rows)]
+    assert starts == list(range(0, 200, rows))
+
+    tracemalloc.start()
+    result = mandelbrot.evaluate(None)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert result.dtype == np.uint16
+    assert np.mean(result != expected) < 1e-3
+    assert peak <= budget, f"Peak memory {peak} exceeds the budget"
+
+    single = MandelbrotSet(width=300, height=200, max_iter=100, backend='numpy',
+                           dtype='complex64').evaluate(None)
+    assert np.mean(single != expected) < 5e-3
+
+
+def test_render_to_file_resumes(tmp_path, monkeypatch):
+    """Interrupted file renders resume from the manifest and build overviews."""
+    from src.equations import outofcore
+
+    julia = JuliaSet(width=130, height=90, max_iter=50, backend='numpy')
+    expected = julia.evaluate(None)
+    path = str(tmp_path / 'poster.npy')
+
+    calls = []
+    crash_after = [3]
+    real_escape_region = outofcore.escape_region
+    def flaky_escape_region(spec, rows, cols):
+        if len(calls) == crash_after[0]:
+            raise KeyboardInterrupt
+        calls.append(rows)
+        return real_escape_region(spec, rows, cols)
+    monkeypatch.setattr(outofcore, 'escape_region', flaky_escape_region)
+    with pytest.raises(KeyboardInterrupt):
+        julia.render_to_file(path, tile_size=32)
+
+    crash_after[0] = None
+    result = julia.render_to_file(path, tile_size=32)
+    assert len(calls) == 5 * 3, "Finished tiles were rendered again"
+    assert np.array_equal(result, expected)
+    with pytest.raises(ValueError):
+        JuliaSet(width=130, height=90, max_iter=60).render_to_file(path, tile_size=32)
+
+    levels = build_pyramid(path, min_size=20)
+    overviews = [np.load(level) for level in levels]
+    assert [o.shape for o in overviews] == [(45, 65), (22, 32)]
+    assert overviews[0][3, 4] == np.rint(expected[6:8, 8:10].mean())
+
+
+def test_julia_batch_matches_single_renders():
+    """Batched Julia sets equal one JuliaSet render per c, in any chunking."""
+    c_values = [-0.7 + 0.27j, 0.285 + 0.01j, -0.8j, 0.3]
+    julia = JuliaSet(width=40, height=30, max_iter=60, backend='numpy')
+    expected = np.array([JuliaSet(width=40, height=30, c=c, max_iter=60,
+                                  backend='numpy').evaluate(None) for c in c_values])
+    assert np.array_equal(julia.evaluate_batch(c_values), expected)
+    chunks = list(julia.evaluate_batch(c_values, chunk_size=3))
+    assert [start for start, _ in chunks] == [0, 3]
+    assert np.array_equal(np.concatenate([images for _, images in chunks]), expected)
+    with pytest.raises(ValueError):
+        julia_batch(MandelbrotSet(width=40, height=30)._spec(), c_values)
+
+
+def test_scripts_share_the_kernel():
+    """Script entry points agree with the classes and the scalar reference."""
+    julia = JuliaSet(width=60, height=40, c=0.285 + 0.01j, max_iter=80).evaluate(None)
+    assert np.array_equal(generate_julia_set(60, 40, c=0.285 + 0.01j, max_iter=80), julia)
+
+    r1, r2, counts = mandelbrot_set(-2.0, 1.0, -1.5, 1.5, 45, 30, 60)
+    expected = np.array([[mandelbrot(complex(r, i), 60) for r in r1] for i in r2])
+    assert np.mean(counts != expected) < 1e-2, "Scalar reference disagrees"
+
+
+def test_instrumentation(tmp_path):
+    """Phases, active-pixel counts and exports are recorded only when enabled."""
+    import json
+
+    events = []
+    mandelbrot = MandelbrotSet(width=60, height=40, max_iter=30, backend='numpy')
+    with instrument(trace_memory=True, callback=events.append) as recorder:
+        divtime = mandelbrot.evaluate(None)
+        export_images({'frame': divtime}, tmp_path)
+    assert active_recorder() is None
+
+    names = {event['name'] for event in recorder.events}
+    assert {'render', 'grid', 'iterate', 'colorize', 'encode'} <= names
+    active = [count for _, _, count in recorder.iterations]
+    assert len(active) == 30 and active == sorted(active, reverse=True)
+    assert active[-1] == np.count_nonzero(divtime == 30)
+    assert recorder.peak_memory > 0
+    assert len(events) == len(recorder.events) + len(recorder.iterations)
+
+    recorder.write_prometheus(tmp_path / 'metrics.prom')
+    metrics = (tmp_path / 'metrics.prom').read_text()
+    assert 'math_art_phase_seconds_total{phase="render",fractal="MandelbrotSet"}' in metrics
+    assert f'math_art_pixel_iterations_total {sum(active)}' in metrics
+    recorder.write_trace(tmp_path / 'trace.json')
+    trace = json.loads((tmp_path / 'trace.json').read_text())
+    assert len(trace['traceEvents']) == len(recorder.events) + 30
+
+    mandelbrot.evaluate(None)
+    assert len(recorder.iterations) == 30, "Recording continued after the block"
+
+
+def _koch_reference(p1, p2, iterations):
+    """The original recursive Koch construction, one segment at a time."""
+    if iterations == 0:
+        return [p1]
+    v = p2 - p1
+    p3, p5 = p1 + v/3, p1 + 2*v/3
+    p4 = p3 + np.array([v[0]*np.cos(np.pi/3) - v[1]*np.sin(np.pi/3),
+                        v[0]*np.sin(np.pi/3) + v[1]*np.cos(np.pi/3)]) / 3
+    return sum((_koch_reference(a, b, iterations - 1)
+                for a, b in ((p1, p3), (p3, p4), (p4, p5), (p5, p2))), [])
+
+
+def test_vectorized_curves():
+    """Subdivision and L-system curves build compact buffers level by level."""
+    corners = [np.array([0.0, 0.0]), np.array([2.0, 0.0]), np.array([1.0, np.sqrt(3)])]
+    expected = sum((_koch_reference(corners[k], corners[(k + 1) % 3], 3) for k in range(3)), [])
+    snowflake = KochSnowflake(iterations=3, size=2.0)
+    assert np.array_equal(snowflake.vertices(), np.array(expected))
+    x, y = snowflake.generate_points()
+    assert len(x) == 3 * 4**3 + 1 and (x[0], y[0]) == (x[-1], y[-1])
+
+    vertices, triangles = SierpinskiTriangle(iterations=4).mesh()
+    assert triangles.shape == (3**4, 3) and len(vertices) == 3 * (3**4 + 1) // 2
+    assert len(np.unique(vertices, axis=0)) == len(vertices), "Duplicate vertices"
+    x, y = SierpinskiTriangle(iterations=4).generate_points()
+    assert len(x) == 4 * 3**4
+
+    x, y = DragonCurve(iterations=10).generate_points()
+    assert len(x) == 2**10 + 1
+    assert np.allclose(np.hypot(np.diff(x), np.diff(y)), 1)
+    x, y = HilbertCurve(iterations=4).generate_points()
+    cells = np.stack([x, y], axis=1)
+    assert len(np.unique(cells, axis=0)) == 4**4, "Hilbert curve must visit every cell once"
+    assert np.array_equal(np.sort(np.unique(x)), np.arange(2**4))
+    assert len(GosperCurve(iterations=3).generate_points()[0]) == 7**3 + 1
+    assert LSystem('F', {'F': 'F+F'}, 90, iterations=2).symbols() == 'F+F+F+F'
+    with pytest.raises(ValueError):
+        LSystem('F', {'F': 'F[+F]F'}, 30, iterations=2).generate_points()
+
+
+def test_chaos_game_density():
+    """The chaos game stays on the attractor and its histograms merge exactly."""
+    x, y = SierpinskiIFS(size=2.0, seed=0, num_points=5000).generate_points()
+    assert len(x) == 5000
+    h = np.sqrt(3) / 2
+    inside = (y > -1e-9) & (y < 2*h*x + 1e-9) & (y < 2*h*(2 - x) + 1e-9)
+    removed = (y < h - 1e-9) & (y > 2*h*np.abs(x - 1) + 1e-9)
+    assert inside.all() and not removed.any(), "Points left the attractor"
+
+    fern = BarnsleyFern(seed=3)
+    serial = fern.density(32, 48, n_points=200_000, points_per_task=50_000)
+    parallel = fern.density(32, 48, n_points=200_000, points_per_task=50_000, workers=2)
+    assert serial.total == 200_000, "Points fell outside the estimated bounds"
+    assert np.array_equal(serial.counts, parallel.counts)
+    image = serial.image()
+    assert image.shape == (48, 32) and image.max() == 1.0
+
+    merged = DensityHistogram((0, 1), (0, 1), 4, 4).add([0.1, 0.9], [0.9, 0.1])
+    merged += DensityHistogram((0, 1), (0, 1), 4, 4).add([0.1], [0.9])
+    assert merged.counts[0, 0] == 2 and merged.counts[3, 3] == 1 and merged.total == 3
+    with pytest.raises(ValueError):
+        merged.merge(DensityHistogram((0, 2), (0, 1), 4, 4))